@@ -0,0 +1,851 @@
+# micro benchmarks for the jingo pipeline
+# usage : python bench.py [benchmark ...]      ( no argument runs them all )
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import jingo
+from jingo import (
+    BinaryOpNode, CallNode, DIGITS, ExpectedCharError, IllegalCharError, InvalidSyntaxError,
+    KEYWORDS, KEYWORD_TYPES, LETTERS, LETTERS_DIGITS, ParseResult, Parser, Position, TT_AND,
+    TT_ARROW, TT_COMMA, TT_DIV, TT_EE, TT_EOF, TT_EQ, TT_FLOAT, TT_GT, TT_GTE, TT_IDENTIFIER,
+    TT_INT, TT_LET, TT_LPAREN, TT_LSQUARE, TT_LT, TT_LTE, TT_MINUS, TT_MUL, TT_NEQ, TT_NEWLINE,
+    TT_NOT, TT_OR, TT_PLUS, TT_POW, TT_RPAREN, TT_RSQUARE, TT_STRING, Token, UnaryOpNode,
+    VarAssignNode, source_files,
+)
+
+
+class CharLexer:
+    # the original per-character lexer , which the single pass jingo.Lexer replaced ,
+    # kept here to benchmark it against
+    def __init__(self, fn, text):
+        self.text = text
+        self.fn = fn
+        self.source_file = source_files.add(fn, text)
+        self.base = self.source_file.base
+        self.pos = Position(-1, 0, 0, fn, text)
+        self.current_char = None
+        self.advance()
+
+    def advance(self):
+        self.pos.advance(self.current_char)
+        self.current_char = self.text[self.pos.index] if self.pos.index < len(self.text) else None
+
+    def offset(self):
+        return self.base + self.pos.index
+
+    def make_tokens(self):
+        tokens = []
+
+        while (self.current_char != None):
+            if self.current_char in ' \t':
+                self.advance()
+
+            elif self.current_char in ';\n':
+                tokens.append(Token(TT_NEWLINE, pos_start=self.offset()))
+                self.advance()
+
+            elif self.current_char == "#":
+                self.skip_comment()
+
+
+            elif self.current_char == '+':
+                tokens.append(Token(TT_PLUS, pos_start=self.offset()))
+                self.advance()
+
+            elif self.current_char in DIGITS:
+                tokens.append(self.make_number())
+
+            elif self.current_char == '-':
+                tokens.append(self.make_minus_or_arrow())
+                # tokens.append(Token(TT_MINUS,pos_start=self.pos))
+                # self.advance()
+
+            elif self.current_char == '*':
+                tokens.append(Token(TT_MUL, pos_start=self.offset()))
+                self.advance()
+
+            elif self.current_char in LETTERS:
+                tokens.append(self.make_identifier())
+
+            elif self.current_char == '"':
+                tokens.append(self.make_string())
+
+            elif self.current_char == '/':
+                tokens.append(Token(TT_DIV, pos_start=self.offset()))
+                self.advance()
+
+
+            elif self.current_char == '(':
+                tokens.append(Token(TT_LPAREN, pos_start=self.offset()))
+                self.advance()
+
+            elif self.current_char == '^':
+                tokens.append(Token(TT_POW, pos_start=self.offset()))
+                self.advance()
+
+            elif self.current_char == ')':
+                tokens.append(Token(TT_RPAREN, pos_start=self.offset()))
+                self.advance()
+
+            elif self.current_char == '!':
+                token, error = self.make_not_equals()
+                if error: return [], error
+                tokens.append(token)
+
+            elif self.current_char == '=':
+                token, error = self.make_equals()
+                if error: return [], error
+                tokens.append(token)
+
+            elif self.current_char == '<':
+                token, error = self.make_less_than()
+                if error: return [], error
+                tokens.append(token)
+
+            elif self.current_char == '>':
+                token, error = self.make_greater_than()
+                if error: return [], error
+                tokens.append(token)
+
+
+            elif self.current_char == ',':
+                tokens.append(Token(TT_COMMA, pos_start=self.offset()))
+                self.advance()
+
+
+            elif self.current_char == '[':
+                tokens.append(Token(TT_LSQUARE, pos_start=self.offset()))
+                self.advance()
+
+
+            elif self.current_char == ']':
+                tokens.append(Token(TT_RSQUARE, pos_start=self.offset()))
+                self.advance()
+
+
+            else:
+                pos_start = self.offset()
+                self.advance()
+                return [], IllegalCharError(pos_start, self.offset(), f"'{self.current_char}'")
+
+        tokens.append(Token(TT_EOF, pos_start=self.offset()))
+
+        return tokens, None
+
+    def make_number(self):
+        num_str = ''
+        dot_count = 0
+        pos_start = self.offset()
+        while self.current_char != None and self.current_char in DIGITS + '.':
+            if self.current_char == '.' and dot_count > 0:
+                # print("unrecognized number ")
+                break
+            else:
+
+                if self.current_char == '.': dot_count += 1
+                num_str += self.current_char
+
+            self.advance()
+
+        if (dot_count == 0):
+            return Token(TT_INT, int(num_str), pos_start=pos_start, pos_end=self.offset())
+        else:
+            return Token(TT_FLOAT, float(num_str), pos_start=pos_start, pos_end=self.offset())
+
+    def make_identifier(self):
+        id_str = ''
+        pos_start = self.offset()
+
+        while self.current_char != None and self.current_char in LETTERS_DIGITS + '_':
+            id_str += self.current_char
+            self.advance()
+
+        token_type = KEYWORD_TYPES[id_str] if id_str in KEYWORDS else TT_IDENTIFIER
+
+        return Token(token_type, id_str, pos_start, self.offset())
+
+    def make_minus_or_arrow(self):
+        token_type = TT_MINUS
+        pos_start = self.offset()
+        self.advance()
+        if self.current_char == '>':
+            self.advance()
+            token_type = TT_ARROW
+
+        return Token(token_type, pos_start=pos_start, pos_end=self.offset())
+
+    def make_not_equals(self):
+        pos_start = self.offset()
+        self.advance()
+        if self.current_char == '=':
+            self.advance()
+            return Token(TT_NEQ, pos_start=pos_start, pos_end=self.offset()), None
+
+        self.advance()
+        return None, ExpectedCharError(pos_start, self.offset(), "    ' = '  after ( ' ! ' )")
+
+    def make_equals(self):
+        pos_start = self.offset()
+        self.advance()
+        token_type = TT_EQ
+        if self.current_char == '=':
+            self.advance()
+            token_type = TT_EE
+
+        return Token(token_type, pos_start=pos_start, pos_end=self.offset()), None
+
+    def make_less_than(self):
+        token_type = TT_LT
+        pos_start = self.offset()
+        # print(self.current_char)
+        self.advance()
+        if self.current_char == '=':
+            self.advance()
+            # print(self.current_char)
+            # self.advance()
+
+            token_type = TT_LTE
+
+        return Token(token_type, pos_start=pos_start, pos_end=self.offset()), None
+
+    def make_greater_than(self):
+        token_type = TT_GT
+        pos_start = self.offset()
+        self.advance()
+        # print(self.current_char)
+        if self.current_char == '=':
+            self.advance()
+
+            token_type = TT_GTE
+
+        return Token(token_type, pos_start=pos_start, pos_end=self.offset()), None
+
+    def make_string(self):
+        pos_start = self.offset()
+
+        string_value = ""
+        escape_character = False
+        self.advance()
+        # if not self.current_char == '"':
+        #     return
+        escaped_characters = {
+            'n': '\n',
+            't': '\t',
+            'j': '\tjingo\t'
+        }
+
+        while self.current_char != None and (self.current_char != '"' or escape_character):
+            if escape_character:
+                string_value += escaped_characters.get(self.current_char, self.current_char)
+                escape_character = False
+            else:
+                if self.current_char == '\\':
+                    escape_character = True
+                else:
+                    string_value += self.current_char
+                    escape_character = False
+            self.advance()
+
+        self.advance()
+        # print(string_value)
+        return Token(TT_STRING, string_value, pos_start, self.offset())
+
+    def skip_comment(self):
+        # jump straight to the end of the line , a comment on the last line ends at EOF
+        end = self.text.find('\n', self.pos.index)
+        if end < 0: end = len(self.text)
+        self.pos.col += end - self.pos.index
+        self.pos.index = end
+        self.current_char = self.text[end] if end < len(self.text) else None
+
+        if self.current_char == '\n':
+            self.advance()
+
+
+class DescentParser(Parser):
+    # the original one method per grammar level expression parser , which
+    # Parser.operation replaced , kept here to benchmark it against
+    def expr(self):
+
+        res = ParseResult()
+
+        if self.current_token.type == TT_LET:
+            res.register_advancement()
+            self.advance()
+            if self.current_token.type != TT_IDENTIFIER:
+                return res.failure(InvalidSyntaxError(
+                    self.current_token.pos_start, self.current_token.pos_end,
+                    'Expected Identifier'
+                ))
+            var_name = self.current_token
+            res.register_advancement()
+            self.advance()
+
+            if self.current_token.type != TT_EQ:
+                return res.failure(
+                    InvalidSyntaxError(
+                        self.current_token.pos_start, self.current_token.pos_end,
+                        'Expected = '
+                    )
+                )
+            res.register_advancement()
+            self.advance()
+            expr = res.register(self.expr())
+            if res.error: return res
+            return res.success(VarAssignNode(var_name, expr))
+
+        node = res.register(self.binary_op(self.comp_expr, (TT_AND, TT_OR)))
+        if res.error: return res.failure(InvalidSyntaxError(self.current_token.pos_start, self.current_token.pos_end,
+                                                            'Expected "let", int , float , identifier , "+","-", "("  , " [ " , "IF", "FOR", "WHILE", "FUNC" "not" '))
+
+        return res.success(node)
+
+    def comp_expr(self):
+        res = ParseResult()
+        if self.current_token.type == TT_NOT:
+            op_token = self.current_token
+            res.register_advancement()
+            self.advance()
+
+            node = res.register(self.comp_expr())
+            if res.error: return res
+
+            return res.success(UnaryOpNode(op_token, node))
+
+        node = res.register(self.binary_op(self.arith_expr, (TT_EE, TT_NEQ, TT_LT, TT_GT, TT_GTE, TT_LTE)))
+
+        if res.error:
+            return res.failure(
+                InvalidSyntaxError(
+                    self.current_token.pos_start, self.current_token.pos_end,
+                    'Expected int , float , identifier + - (  [ "not" '
+        ))
+
+        return res.success(node)
+
+    def arith_expr(self):
+        return self.binary_op(self.term, (TT_PLUS, TT_MINUS))
+
+
+    def term(self):
+
+        return self.binary_op(self.factor, (TT_MUL, TT_DIV))
+
+    def factor(self):
+        res = ParseResult()
+        token = self.current_token
+        if token.type in (TT_PLUS, TT_MINUS):
+            res.register_advancement()
+            self.advance()
+            factor = res.register(self.factor())
+            if res.error: return res
+
+            return res.success(UnaryOpNode(token, factor))
+
+        return self.power()
+
+    def power(self):
+        return self.binary_op(self.call, (TT_POW,), self.factor)
+
+    def call(self):
+        res = ParseResult()
+        atom = res.register(self.atom())
+        if res.error: return res
+        if self.current_token.type == TT_LPAREN:
+            res.register_advancement()
+            self.advance()
+            arg_nodes = []
+
+            if self.current_token.type == TT_RPAREN:
+                res.register_advancement()
+                self.advance()
+            else:
+                arg_nodes.append(res.register(self.expr()))
+                if res.error:  return res.failure(InvalidSyntaxError(
+                    self.current_token.pos_start, self.current_token.pos_end,
+                    'Expected "let", int , float , identifier , "+","-", "(", "["  or "not" from call \n '))
+
+                while self.current_token.type == TT_COMMA:
+                    res.register_advancement()
+                    self.advance()
+                    arg_nodes.append(res.register(self.expr()))
+                    if res.error: return res
+
+                if self.current_token.type != TT_RPAREN:
+                    return res.failure(InvalidSyntaxError(
+                        self.current_token.pos_start, self.current_token.pos_end,
+                        'Expected " , " or " ) " '
+                    ))
+                res.register_advancement()
+                self.advance()
+            return res.success(CallNode(atom, arg_nodes))
+        return res.success(atom)
+
+    def binary_op(self, func_a, op_tokens, func_b=None):
+        if func_b == None:
+            func_b = func_a
+
+        res = ParseResult()
+        # basically a rule is the unit slicer ( what ditermines a unit )
+        left = res.register(func_a())
+        if res.error: return res
+        # the left factor keeps on expanding to be the whole term in the end
+        # op_tokens the relation we need between these tokens
+        while self.current_token.type in op_tokens:
+            op_token = self.current_token
+            res.register_advancement()
+            self.advance()
+            right = res.register(func_b())
+            if res.error: return res
+            left = BinaryOpNode(left, op_token, right)
+
+        return res.success(left)
+
+
+
+def generate_script(line_count):
+    # a valid program made of the kind of lines our generated scripts have
+    lines = []
+    for i in range(line_count):
+        kind = i % 6
+        if kind == 0:
+            lines.append(f'LET VALUE_{i} = {i} * 2 + ({i} - 1) / 3')
+        elif kind == 1:
+            lines.append(f'LET NAME_{i} = "item \\"{i}\\"\\t" + "done"')
+        elif kind == 2:
+            lines.append(f'FUNC F_{i}(A, B) -> IF A >= B THEN A - B ELSE B ^ 2')
+        elif kind == 3:
+            lines.append(f'# step {i} : recompute the totals')
+        elif kind == 4:
+            lines.append(f'LET TOTAL = FOR I = 0 TO {i % 7 + 1} THEN I * 1.5')
+        else:
+            lines.append(f'LET LIST_{i} = [{i}, {i + 1}, {i + 2}] + ({i} == {i})')
+    return '\n'.join(lines) + '\n'
+
+
+def best_of(repeat, func):
+    # like timeit : the collector is off while timing so runs are comparable
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        if best is None or elapsed < best: best = elapsed
+    return best
+
+
+def bench_lexer():
+    text = generate_script(20000)
+    token_count = len(jingo.Lexer('<bench>', text).make_tokens()[0])
+    print(f'lexer : {len(text) / 1024:.0f} KB , {token_count} tokens')
+
+    for lexer_class in (CharLexer, jingo.Lexer):
+        elapsed = best_of(3, lambda: lexer_class('<bench>', text).make_tokens())
+        print(f'  {lexer_class.__name__:<10} {elapsed:8.3f} s   {token_count / elapsed:12,.0f} tokens/s')
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_comments():
+    # mostly comments and indentation , like our annotated generated scripts
+    lines = []
+    for i in range(20000):
+        lines.append(f'    # {i} : the next value is the previous one scaled , see the notes above')
+        lines.append(f'\t\t# and clamped to the bounds of the table                      {i}')
+        lines.append(f'    LET VALUE_{i} = {i} * 2')
+    text = '\n'.join(lines) + '\n# trailing comment without a newline'
+    print(f'comments : {len(text) / 1024:.0f} KB , {len(text.splitlines())} lines')
+
+    for lexer_class in (CharLexer, jingo.Lexer):
+        elapsed = best_of(3, lambda: lexer_class('<bench>', text).make_tokens())
+        print(f'  {lexer_class.__name__:<10} {elapsed:8.3f} s   {len(text) / 2 ** 20 / elapsed:8.1f} MB/s')
+
+
+def run_script(text, engine='tree'):
+    result, error = jingo.run('<bench>', text, engine)
+    if error: raise Exception(error.as_string())
+    return result
+
+
+def bench_variables():
+    # a loop that mostly reads and writes variables , at the top level and in a function
+    print('variables : 20000 iterations , 200 recursions 100 deep')
+    top_level = ('LET TOTAL_SO_FAR = 0\n'
+                 'LET STEP_SIZE = 3\n'
+                 'FOR INDEX = 0 TO 20000 THEN LET TOTAL_SO_FAR = TOTAL_SO_FAR + INDEX * STEP_SIZE - STEP_SIZE\n'
+                 'TOTAL_SO_FAR')
+    in_function = ('FUNC TOTAL(COUNT, STEP_SIZE, TOTAL_SO_FAR) -> '
+                   'FOR INDEX = 0 TO COUNT THEN LET TOTAL_SO_FAR = TOTAL_SO_FAR + INDEX * STEP_SIZE - STEP_SIZE\n'
+                   'TOTAL(20000, 3, 0)')
+    # SUM is found past every call of SUM above the one reading it
+    recursive = ('FUNC SUM(N) -> IF N == 0 THEN 0 ELSE N + SUM(N - 1)\n'
+                 'FOR INDEX = 0 TO 200 THEN SUM(100)')
+    for name, text in (('top level', top_level), ('function', in_function), ('recursive', recursive)):
+        for engine in ('tree', 'slots'):
+            elapsed = best_of(3, lambda: run_script(text, engine))
+            print(f'  {name:<10} {engine:<6} {elapsed:8.3f} s')
+
+
+FIB_SCRIPT = ('FUNC FIB(N) -> IF N < 2 THEN N ELSE FIB(N - 1) + FIB(N - 2)\n'
+              'FIB(18)')
+
+LOOP_SCRIPT = ('LET TOTAL = 0\n'
+               'FOR I = 0 TO 30000 THEN\n'
+               '    IF I / 3 == 0 THEN LET TOTAL = TOTAL + I ELSE LET TOTAL = TOTAL - 1\n'
+               'END\n'
+               'LET COUNT = 0\n'
+               'WHILE COUNT < 20000 THEN LET COUNT = COUNT + 1\n'
+               'TOTAL')
+
+
+def bench_engines():
+    print('engines : the same programs on each execution engine')
+    for name, text in (('fib', FIB_SCRIPT), ('loops', LOOP_SCRIPT)):
+        for engine in jingo.ENGINES:
+            elapsed = best_of(3, lambda: run_script(text, engine))
+            print(f'  {name:<6} {engine:<8} {elapsed:8.3f} s')
+
+
+def numbers_made(func):
+    # how many Numbers func allocates , shared ones aren't counted
+    made = 0
+    init = jingo.Number.__init__
+
+    def counting_init(number, value):
+        nonlocal made
+        made += 1
+        init(number, value)
+
+    jingo.Number.__init__ = counting_init
+    try:
+        func()
+    finally:
+        jingo.Number.__init__ = init
+    return made
+
+
+def bench_allocations():
+    count = 1000000
+    text = ('LET TOTAL = 0\n'
+            f'FOR I = 0 TO {count} THEN\n'
+            '    IF I < 100 THEN LET TOTAL = TOTAL + 1\n'
+            'END\n'
+            'TOTAL')
+    print(f'allocations : Numbers made per iteration of FOR I = 0 TO {count}')
+    for engine in jingo.ENGINES:
+        made = numbers_made(lambda: run_script(text, engine))
+        print(f'  {engine:<8} {made / count:6.2f} per iteration')
+
+
+def bench_loop_results():
+    # a one line loop standing as a statement of a function , its List of values is never seen
+    count = 200000
+    text = ('FUNC SUM_TO(N)\n'
+            '    LET TOTAL = 0\n'
+            '    FOR I = 0 TO N THEN LET TOTAL = TOTAL + I\n'
+            '    RETURN TOTAL\n'
+            'END\n'
+            f'SUM_TO({count})')
+    print(f'loop results : FOR I = 0 TO {count} as a statement in a FUNC')
+    for engine in jingo.ENGINES:
+        run_script(text, engine)
+        peak = peak_memory(lambda: run_script(text, engine))
+        elapsed = best_of(3, lambda: run_script(text, engine))
+        print(f'  {engine:<8} {peak / 2 ** 20:8.1f} MB   {elapsed:8.3f} s')
+
+
+def bench_ranges():
+    # a range built by a FOR , then read back by index
+    count = 100000
+    text = (f'LET R = FOR I = 0 TO {count} THEN I\n'
+            'LET TOTAL = 0\n'
+            f'FOR J = 0 TO {count} THEN LET TOTAL = TOTAL + R / J\n'
+            'TOTAL')
+    print(f'ranges : FOR I = 0 TO {count} THEN I , summed by index')
+    for engine in jingo.ENGINES:
+        run_script(text, engine)
+        peak = peak_memory(lambda: run_script(text, engine))
+        elapsed = best_of(3, lambda: run_script(text, engine))
+        print(f'  {engine:<8} {peak / 2 ** 20:8.1f} MB   {elapsed:8.3f} s')
+
+
+def bench_vectors():
+    # the same transform and sum , element by element in a loop and as one Vector expression
+    if jingo.numpy is None:
+        print('vectors : numpy is not installed')
+        return
+
+    count = 100000
+    loop_text = (f'LET XS = RANGE(0, {count})\n'
+                 'LET TOTAL = 0\n'
+                 f'FOR I = 0 TO {count} THEN LET TOTAL = TOTAL + (XS / I) * 2 + 1\n'
+                 'TOTAL')
+    vector_text = f'SUM(VECTOR(RANGE(0, {count})) * 2 + 1)'
+    print(f'vectors : X * 2 + 1 summed over {count} numbers')
+    for engine in jingo.ENGINES:
+        loop = best_of(3, lambda: run_script(loop_text, engine))
+        vector = best_of(3, lambda: run_script(vector_text, engine))
+        print(f'  {engine:<8} loop {loop:8.3f} s   vector {vector:8.4f} s')
+
+
+READ_SCRIPT = ('LET TEXT = "some text"\n'
+               'LET ITEMS = [1, 2, 3]\n'
+               'FUNC SIZE(X) -> X\n'
+               'FOR I = 0 TO 20000 THEN\n'
+               '    LET A = TEXT\n'
+               '    LET B = ITEMS\n'
+               '    LET C = SIZE(ITEMS)\n'
+               'END\n')
+
+
+def bench_reads():
+    # a loop reading strings , lists and functions out of variables
+    print('reads : 20000 iterations reading TEXT , ITEMS and SIZE')
+    for engine in jingo.ENGINES:
+        elapsed = best_of(5, lambda: run_script(READ_SCRIPT, engine))
+        print(f'  {engine:<8} {elapsed:8.3f} s   {elapsed / 20000 * 1e6:6.1f} us/iteration')
+
+
+def bench_dispatch():
+    # what getting from a node to the code for it costs , per node , on a node
+    # that is cheap to visit so the dispatch is most of it
+    count = 1000000
+    interpreter = jingo.Interpreter()
+    context = jingo.Context('<bench>')
+    context.symbol_table = jingo.global_symbol_table
+    print(f'dispatch : {count} visits of a CONTINUE node')
+
+    def visits(visit):
+        for _ in range(count): visit(node, context)
+
+    node = jingo.parse('<bench>', 'CONTINUE')[0].element_nodes[0]
+    direct = best_of(5, lambda: visits(interpreter.visit_ContinueNode))
+    by_name = best_of(5, lambda: visits(lambda node, context: getattr(interpreter, f'visit_{type(node).__name__}')(node, context)))
+    by_table = best_of(5, lambda: visits(interpreter.visit))
+    for name, elapsed in (('method name', by_name), ('table', by_table)):
+        print(f'  {name:<12} {elapsed / count * 1e9:6.0f} ns/node   {(elapsed - direct) / count * 1e9:6.0f} ns dispatch')
+
+    # an operator is found as fast whatever its place among the operators
+    print(f'  operators , {count // 10} evaluations each')
+    for text in ('1 + 2', '1 == 2', '1 OR 2'):
+        node = jingo.parse('<bench>', text)[0].element_nodes[0]
+        elapsed = best_of(5, lambda: [interpreter.visit(node, context) for _ in range(count // 10)])
+        print(f'  {text:<12} {elapsed / (count // 10) * 1e9:6.0f} ns/operation')
+
+
+def bench_caches():
+    # the inline caches of the operators , on numbers only and on a mix of types
+    print('caches : operator inline caches')
+    scripts = (
+        ('numbers', 'LET TOTAL = 0\n'
+                    'FOR I = 0 TO 20000 THEN LET TOTAL = TOTAL + I * 2 - (I / 4) + (I < 10) + (I == 3)\n'
+                    'TOTAL'),
+        ('mixed', 'LET VALUES = [1, "ab", 2.5]\n'
+                  'FOR I = 0 TO 7000 THEN FOR J = 0 TO 3 THEN (VALUES / J) * 2'),
+    )
+    for name, text in scripts:
+        jingo.operation_cache.clear()
+        elapsed = best_of(3, lambda: run_script(text))
+        cache = jingo.operation_cache
+        print(f'  {name:<8} {elapsed:8.3f} s   hits {cache.hits:>9}   misses {cache.misses:>7}   hit rate {cache.hit_rate():6.1%}')
+
+
+def bench_tail_calls():
+    # a tail recursive loop , the depth used to be bounded by the python stack
+    print('tail calls : LOOP(N, ACC) -> IF N == 0 THEN ACC ELSE LOOP(N - 1, ACC + N)')
+    for engine in jingo.ENGINES:
+        for count in (1000, 10000, 100000):
+            text = ('FUNC LOOP(N, ACC) -> IF N == 0 THEN ACC ELSE LOOP(N - 1, ACC + N)\n'
+                    f'LOOP({count}, 0)')
+            elapsed = best_of(3, lambda: run_script(text, engine))
+            print(f'  {engine:<8} {count:>6} calls   {elapsed:8.3f} s   {elapsed / count * 1e6:6.1f} us/call')
+
+    # two functions calling each other , each call takes over the frame of the other
+    print('tail calls : EVEN(N) -> IF N == 0 THEN 1 ELSE ODD(N - 1) , and ODD the same way')
+    for engine in jingo.ENGINES:
+        for count in (1000, 10000, 100000):
+            text = ('FUNC EVEN(N) -> IF N == 0 THEN 1 ELSE ODD(N - 1)\n'
+                    'FUNC ODD(N) -> IF N == 0 THEN 0 ELSE EVEN(N - 1)\n'
+                    f'EVEN({count})')
+            elapsed = best_of(3, lambda: run_script(text, engine))
+            print(f'  {engine:<8} {count:>6} calls   {elapsed:8.3f} s   {elapsed / count * 1e6:6.1f} us/call')
+
+
+def bench_recursion():
+    # recursion that isn't a tail call , on the vm the depth is bounded by
+    # MAX_CALL_DEPTH rather than by the python stack . the time per call should
+    # stay flat : SUM is found through the table of the call above
+    print('recursion : SUM(N) -> IF N == 0 THEN 0 ELSE N + SUM(N - 1) on the vm')
+    for count in (100, 1000, 5000, 9000):
+        text = ('FUNC SUM(N) -> IF N == 0 THEN 0 ELSE N + SUM(N - 1)\n'
+                f'SUM({count})')
+        elapsed = best_of(3, lambda: run_script(text, 'vm'))
+        print(f'  depth {count:>5}   {elapsed:8.3f} s   {elapsed / count * 1e6:6.1f} us/call')
+
+
+def bench_strings():
+    # a string built up with + in a loop , time per iteration should stay flat
+    print('strings : LET TEXT = TEXT + "..." in a loop')
+    for count in (5000, 10000, 20000, 40000):
+        text = ('LET TEXT = ""\n'
+                f'FOR INDEX = 0 TO {count} THEN LET TEXT = TEXT + "a few more characters , "\n'
+                'TEXT * 1')
+        elapsed = best_of(3, lambda: run_script(text))
+        print(f'  {count:>6} iterations   {elapsed:8.3f} s   {elapsed / count * 1e6:6.1f} us/iteration')
+
+
+def retained_memory(func):
+    # bytes still held by what func returns
+    tracemalloc.start()
+    try:
+        result = func()
+        return tracemalloc.get_traced_memory()[0], result
+    finally:
+        tracemalloc.stop()
+
+
+def bench_tokens():
+    text = generate_script(23500)
+    print(f'tokens : memory held by the tokens of a {len(text) / 2 ** 20:.2f} MB script')
+
+    def token_list():
+        return jingo.Lexer('<bench>', text).make_tokens()[0]
+
+    def token_buffer():
+        return jingo.Lexer('<bench>', text).make_token_buffer()[0]
+
+    for name, func in (('Token list', token_list), ('TokenBuffer', token_buffer)):
+        size, tokens = retained_memory(func)
+        print(f'  {name:<12} {size / 2 ** 20:8.1f} MB   {size / len(tokens):6.1f} bytes/token')
+
+
+def bench_parser():
+    text = generate_script(20000)
+    tokens = jingo.Lexer('<bench>', text).make_token_buffer()[0]
+    print(f'parser : {len(tokens)} tokens')
+
+    for parser_class in (DescentParser, jingo.Parser):
+        elapsed = best_of(3, lambda: parser_class(tokens).parse())
+        print(f'  {parser_class.__name__:<14} {elapsed:8.3f} s   {len(tokens) / elapsed:12,.0f} tokens/s')
+
+
+def bench_expressions():
+    # very long and very deeply nested expressions , time per term should stay flat
+    print('expressions : parse + evaluate')
+    shapes = (
+        ('chain', lambda count: ' + '.join(str(i) for i in range(count))),
+        ('brackets', lambda count: '(' * count + '1' + ')' * count),
+        ('powers', lambda count: ' ^ '.join(['1'] * count)),
+    )
+    for name, make_text in shapes:
+        for count in (25000, 50000, 100000):
+            text = make_text(count)
+            elapsed = best_of(3, lambda: run_script(text))
+            print(f'  {name:<9} {count:>7} terms   {elapsed:8.3f} s   {elapsed / count * 1e6:6.1f} us/term')
+
+    # the python engine compiles the code it writes on every run , see TRANSPILE_CHAIN_LIMIT
+    def transpile_and_run(text):
+        jingo.code_cache.clear()
+        return run_script(text, 'python')
+
+    for count in (25000, 50000, 100000):
+        text = shapes[0][1](count)
+        elapsed = best_of(3, lambda: transpile_and_run(text))
+        print(f'  {"python":<9} {count:>7} terms   {elapsed:8.3f} s   {elapsed / count * 1e6:6.1f} us/term')
+
+
+def bench_cache():
+    # a script that RUNs the same helper file in a loop
+    with tempfile.TemporaryDirectory() as directory:
+        helper = os.path.join(directory, 'helper.jingo')
+        with open(helper, 'w') as file:
+            file.write(generate_script(300))
+        text = f'FOR I = 0 TO 200 THEN RUN("{helper}")'
+        print('cache : RUN of a 300 line helper , 200 times')
+
+        for name, size in (('no cache', 0), ('cache', jingo.AST_CACHE_SIZE)):
+            jingo.ast_cache.resize(size)
+            jingo.ast_cache.clear()
+            elapsed = best_of(3, lambda: run_script(text))
+            print(f'  {name:<10} {elapsed:8.3f} s   hits {jingo.ast_cache.hits:>5}   misses {jingo.ast_cache.misses:>5}')
+
+
+def bench_startup():
+    # what a worker pays to get the tree of a script it was shipped
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, 'script.jingo')
+        with open(script, 'w') as file:
+            file.write(generate_script(20000))
+        jingo.compile_file(script)
+        size = os.path.getsize(jingo.artifact_path(script))
+        print(f'startup : {os.path.getsize(script) / 1024:.0f} KB script , {size / 1024:.0f} KB artifact')
+
+        def from_source():
+            with open(script) as file:
+                return jingo.parse(script, file.read())[0]
+
+        def from_artifact():
+            with open(script) as file:
+                return jingo.load_artifact(script, file.read())
+
+        for name, func in (('parse', from_source), ('load .jgc', from_artifact)):
+            print(f'  {name:<10} {best_of(3, func):8.3f} s')
+
+
+def bench_stream():
+    text = generate_script(20000)
+    print(f'stream : peak memory lexing + parsing {len(text) / 1024:.0f} KB')
+
+    def parse_list():
+        tokens, error = jingo.Lexer('<bench>', text).make_tokens()
+        return jingo.Parser(tokens).parse()
+
+    def parse_stream():
+        return jingo.Parser(jingo.Lexer('<bench>', text).iter_tokens()).parse()
+
+    for name, func in (('token list', parse_list), ('token stream', parse_stream)):
+        print(f'  {name:<14} {peak_memory(func) / 2 ** 20:8.1f} MB   {best_of(3, func):8.3f} s')
+
+
+BENCHMARKS = {
+    'lexer': bench_lexer,
+    'stream': bench_stream,
+    'tokens': bench_tokens,
+    'variables': bench_variables,
+    'dispatch': bench_dispatch,
+    'caches': bench_caches,
+    'allocations': bench_allocations,
+    'reads': bench_reads,
+    'loopresults': bench_loop_results,
+    'ranges': bench_ranges,
+    'vectors': bench_vectors,
+    'tailcalls': bench_tail_calls,
+    'recursion': bench_recursion,
+    'comments': bench_comments,
+    'strings': bench_strings,
+    'parser': bench_parser,
+    'expressions': bench_expressions,
+    'cache': bench_cache,
+    'startup': bench_startup,
+    'engines': bench_engines,
+}
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
@@ -1,40 +1,84 @@
 # IMPORTS:
+import bisect
+import hashlib
+import marshal
 import math
+import operator
 import os
 import re
+import sys
+import weakref
+import zlib
+from array import array
+from collections import OrderedDict
+from sys import intern
 
 from string_with_arrows import string_with_arrows
 import string
 
+try:
+    import numpy
+except ImportError:
+    # only Vector needs it , VECTOR says so when it isn't there
+    numpy = None
+
 # Binary Op Basic Tokens Types :
+# small ints , so the parser compares ints ( and TokenBuffer can keep them in a byte array )
+
+TT_INT = 0
+TT_FLOAT = 1
+TT_PLUS = 2
+TT_MINUS = 3
+TT_MUL = 4
+TT_DIV = 5
+TT_LPAREN = 6
+TT_RPAREN = 7
+TT_EOF = 8
+TT_POW = 9
+TT_IDENTIFIER = 10
+TT_EQ = 11
+TT_COMMA = 12
+TT_ARROW = 13
+TT_STRING = 14
+TT_LSQUARE = 15
+TT_RSQUARE = 16
+TT_EE = 17  # This is double equals used for comparison while the other solly used for assignment expressions
+
+TT_NEQ = 18
+TT_LT = 19
+TT_GT = 20
+TT_LTE = 21
+TT_GTE = 22
+
+TT_NEWLINE  =   23
+
+# every keyword has its own type , resolved when it is lexed
+TT_LET = 24
+TT_AND = 25
+TT_OR = 26
+TT_NOT = 27
+TT_IF = 28
+TT_THEN = 29
+TT_ELIF = 30
+TT_ELSE = 31
+TT_FOR = 32
+TT_TO = 33
+TT_STEP = 34
+TT_WHILE = 35
+TT_FUNC = 36
+TT_END = 37
+TT_RETURN = 38
+TT_CONTINUE = 39
+TT_BREAK = 40
+
+# the names tokens are printed with
+TOKEN_NAMES = [
+    'TT_INT', 'FLOAT', 'PLUS', 'MINUS', 'MUL', 'DIV', 'LAPERN', 'RPAREN', 'EOF', 'POW',
+    'IDENTIFIER', 'EQ', 'COMMA', 'ARROW', 'STRING', 'LSQUARE', 'RSQUARE', 'EE',
+    'NE', 'LT', 'GT', 'GTE', 'LTE',
+    'NEWLINE',
+] + ['KEYWORD'] * 17
 
-TT_INT = 'TT_INT'
-TT_FLOAT = 'FLOAT'
-TT_PLUS = 'PLUS'
-TT_MINUS = 'MINUS'
-TT_MUL = 'MUL'
-TT_DIV = 'DIV'
-TT_LPAREN = 'LAPERN'
-TT_RPAREN = 'RPAREN'
-TT_EOF = 'EOF'
-TT_POW = 'POW'
-TT_IDENTIFIER = 'IDENTIFIER'
-TT_KEYWORD = 'KEYWORD'
-TT_EQ = 'EQ'
-TT_COMMA = 'COMMA'
-TT_ARROW = 'ARROW'
-TT_STRING = 'STRING'
-TT_LSQUARE = 'LSQUARE'
-TT_RSQUARE = 'RSQUARE'
-TT_EE = 'EE'  # This is double equals used for comparison while the other solly used for assignment expressions
-
-TT_NEQ = 'NE'
-TT_LT = 'LT'
-TT_GT = 'GT'
-TT_LTE = 'GTE'
-TT_GTE = 'LTE'
-
-TT_NEWLINE  =   'NEWLINE'
 ##Constants
 
 
@@ -44,25 +88,27 @@ LETTERS = string.ascii_letters
 
 LETTERS_DIGITS = LETTERS + DIGITS
 
-KEYWORDS = [
-    'LET',
-    'AND',
-    'OR',
-    'NOT',
-    'IF',
-    'THEN',
-    'ELIF',
-    'ELSE',
-    'FOR',
-    'TO',
-    'STEP',
-    'WHILE',
-    'FUNC',
-    'END',
-    'RETURN',
-    'CONTINUE',
-    'BREAK'
-]
+KEYWORD_TYPES = {
+    'LET': TT_LET,
+    'AND': TT_AND,
+    'OR': TT_OR,
+    'NOT': TT_NOT,
+    'IF': TT_IF,
+    'THEN': TT_THEN,
+    'ELIF': TT_ELIF,
+    'ELSE': TT_ELSE,
+    'FOR': TT_FOR,
+    'TO': TT_TO,
+    'STEP': TT_STEP,
+    'WHILE': TT_WHILE,
+    'FUNC': TT_FUNC,
+    'END': TT_END,
+    'RETURN': TT_RETURN,
+    'CONTINUE': TT_CONTINUE,
+    'BREAK': TT_BREAK
+}
+
+KEYWORDS = frozenset(KEYWORD_TYPES)
 
 
 ##
@@ -76,10 +122,21 @@ class Error:
         self.pos_start = pos_start
         self.pos_end = pos_end
 
+    def keep_source(self):
+        # an error handed out of parse() or run() holds the source it points into ,
+        # whatever happens to the tree it came from
+        self.source_files = [source_files.file_at(offset) for offset in self.offsets() if offset is not None]
+        return self
+
+    def offsets(self):
+        return [self.pos_start]
+
     def as_string(self):
+        pos_start = source_files.position(self.pos_start)
+        pos_end = source_files.end_position(self.pos_end)
         res = f'{self.name} : {self.details}'
-        res += f'File {(self.pos_start.fn)} , line : {self.pos_start.row + 1} column: {self.pos_start.col} '
-        res += '\n\n' + string_with_arrows(self.pos_start.ftxt, self.pos_start, self.pos_end)
+        res += f'File {(pos_start.fn)} , line : {pos_start.row + 1} column: {pos_start.col} '
+        res += '\n\n' + string_with_arrows(pos_start.ftxt, pos_start, pos_end)
         return res
 
 
@@ -93,29 +150,59 @@ class InvalidSyntaxError(Error):
         super().__init__('Invalid Syntax', details, pos_start, pos_end)
 
 
+TRACEBACK_REPEATS = 3
+
+
 class RunTimeError(Error):
+    # set on an error of an operation that is about its right operand , see placed_error
+    about_operand = False
+
     def __init__(self, pos_start, pos_end, details, context):
         super().__init__('Runtime Error', details, pos_start, pos_end)
         self.context = context
 
     def as_string(self):
+        pos_start = source_files.position(self.pos_start)
+        pos_end = source_files.end_position(self.pos_end)
         res = self.generate_traceback()
         res += f'{self.name} : {self.details}'
-        res += f'File {(self.pos_start.fn)} , line : {self.pos_start.row + 1} column: {self.pos_start.col} '
-        res += '\n\n' + string_with_arrows(self.pos_start.ftxt, self.pos_start, self.pos_end)
+        res += f'File {(pos_start.fn)} , line : {pos_start.row + 1} column: {pos_start.col} '
+        res += '\n\n' + string_with_arrows(pos_start.ftxt, pos_start, pos_end)
         return res
 
+    def offsets(self):
+        # and the calls of the traceback
+        offsets = [self.pos_start]
+        context = self.context
+        while context:
+            offsets.append(context.parent_entry_pos)
+            context = context.parent
+        return offsets
+
     def generate_traceback(self):
-        result = ''
-        pos = self.pos_start
+        lines = []
+        offset = self.pos_start
         context = self.context
 
         while context:
-            result = f'File:  {pos.fn}, line {str(pos.row + 1)} , in {context.display_name}\n' + result
-            pos = context.parent_entry_pos
+            pos = source_files.position(offset)
+            lines.append(f'File:  {pos.fn}, line {str(pos.row + 1)} , in {context.display_name}\n')
+            offset = context.parent_entry_pos
             context = context.parent
+        lines.reverse()
+
+        # like python , a line repeated more than TRACEBACK_REPEATS times is shown that many times
+        result = []
+        start = 0
+        while start < len(lines):
+            end = start
+            while end < len(lines) and lines[end] == lines[start]: end += 1
+            result.extend(lines[start:min(end, start + TRACEBACK_REPEATS)])
+            if end - start > TRACEBACK_REPEATS:
+                result.append(f'[Previous line repeated {end - start - TRACEBACK_REPEATS} more times]\n')
+            start = end
 
-        return 'Traceback (most recent call last ):\n' + result
+        return 'Traceback (most recent call last ):\n' + ''.join(result)
 
 
 class ExpectedCharError(Error):
@@ -152,269 +239,307 @@ class Position:
         return Position(self.index, self.row, self.col, self.fn, self.ftxt)
 
 
+# tokens , nodes and values only keep plain int offsets into source_files ,
+# a Position with its row and column is built from them when an error is shown
+
+class SourceFile:
+    def __init__(self, fn, ftxt, base):
+        self.fn = fn
+        self.ftxt = ftxt
+        self.base = base
+        self.line_starts = None
+
+    def position(self, index):
+        if self.line_starts is None:
+            self.line_starts = [0] + [match.end() for match in re.finditer('\n', self.ftxt)]
+
+        row = bisect.bisect_right(self.line_starts, index) - 1
+        # the first row counts columns from 1 , the others from 0 , as Position.advance() always has
+        col = index - self.line_starts[row] if row else index + 1
+        return Position(index, row, col, self.fn, self.ftxt)
+
+
+class SourceFiles:
+    # every source handed to a lexer gets its own range of offsets , so an
+    # offset alone is enough to find the file , row and column it points at .
+    # sources are only held weakly : the lexer , the parsed tree , the bodies of
+    # the functions defined in it and the errors handed out keep theirs alive ,
+    # and a source none of them holds any more is dropped with its line table
+    def __init__(self):
+        self.bases = []
+        self.files = []
+        self.by_source = weakref.WeakValueDictionary()
+        self.next_base = 0
+
+    def add(self, fn, ftxt):
+        # the same source lexed again while it is held ( RUN in a loop , the same
+        # REPL line with its tree cached ) keeps its range
+        file = self.by_source.get((fn, ftxt))
+        if file: return file
+
+        file = SourceFile(fn, ftxt, self.next_base)
+        # tokens after an unterminated string or at EOF point up to two chars past the end
+        self.next_base += len(ftxt) + 3
+        self.bases.append(file.base)
+        self.files.append(weakref.ref(file, self.forget))
+        self.by_source[(fn, ftxt)] = file
+        return file
+
+    def forget(self, ref):
+        index = self.files.index(ref)
+        del self.bases[index]
+        del self.files[index]
+
+    def file_at(self, offset):
+        # None once the source of the offset was dropped
+        index = bisect.bisect_right(self.bases, offset) - 1
+        if index < 0: return None
+        file = self.files[index]()
+        if file is None or offset - file.base > len(file.ftxt) + 2: return None
+        return file
+
+    def position(self, offset):
+        file = self.file_at(offset)
+        if file is None: return Position(offset, 0, 0, '<unknown>', '')
+        return file.position(offset - file.base)
+
+    def end_position(self, offset):
+        # ends are exclusive : the end of a token that stops right after a '\n'
+        # ( a NEWLINE token ) stays on the row of that '\n'
+        file = self.file_at(offset - 1)
+        if file is None: return Position(offset, 0, 0, '<unknown>', '')
+        index = offset - file.base
+        if 0 < index <= len(file.ftxt) and file.ftxt[index - 1] == '\n':
+            pos = file.position(index - 1)
+            return Position(index, pos.row, pos.col + 1, file.fn, file.ftxt)
+        return file.position(index)
+
+
+source_files = SourceFiles()
+
+
 ##
 # Tokenizer
 ##
 
 class Token:
+    __slots__ = ('type', 'value', 'pos_start', 'pos_end')
+
     def __init__(self, type, value=None, pos_start=None, pos_end=None):
         self.type = type
         self.value = value
-        if (pos_start):
-            self.pos_start = pos_start.copy()
-            self.pos_end = pos_start.copy()
-            self.pos_end.advance()
-        if pos_end:
-            self.pos_end = pos_end.copy()
+        # offsets into source_files , a token without an end is one char long
+        self.pos_start = pos_start
+        self.pos_end = pos_start + 1 if pos_end is None and pos_start is not None else pos_end
 
     def matches(self, new_type, val):
         return self.type == new_type and self.value == val
 
     def __repr__(self):
-        if self.value: return f'{self.type}:{self.value}'
-        return f'{self.type}'
+        if self.value: return f'{TOKEN_NAMES[self.type]}:{self.value}'
+        return f'{TOKEN_NAMES[self.type]}'
+
+
+class TokenBuffer:
+    # a whole token stream as a struct of arrays : type , start , end and value index
+    # per token , about a tenth of the memory of a list of Token . values are shared
+    # between tokens that have the same one . iterating gives Token objects back ,
+    # so a Parser can read from it directly
+    def __init__(self, tokens=()):
+        self.types = array('B')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.value_indexes = array('i')
+        self.values = []
+        self.value_index_of = {}
+        for token in tokens:
+            self.append(token)
+
+    def append(self, token):
+        self.types.append(token.type)
+        self.starts.append(token.pos_start)
+        self.ends.append(token.pos_end)
+        if token.value is None:
+            self.value_indexes.append(-1)
+            return
+        # keyed by type too , an INT 1 and a FLOAT 1.0 are equal dict keys
+        key = (token.type, token.value)
+        value_index = self.value_index_of.get(key)
+        if value_index is None:
+            value_index = self.value_index_of[key] = len(self.values)
+            self.values.append(token.value)
+        self.value_indexes.append(value_index)
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        value_index = self.value_indexes[index]
+        return Token(self.types[index], self.values[value_index] if value_index >= 0 else None,
+                     self.starts[index], self.ends[index])
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield self[index]
 
 
 ##
 # Lexer
 ##
 
+# operators , brackets and separators , longest first in OPERATOR_PATTERN
+OPERATOR_TOKENS = {
+    '->': TT_ARROW,
+    '==': TT_EE,
+    '!=': TT_NEQ,
+    '<=': TT_LTE,
+    '>=': TT_GTE,
+    '+': TT_PLUS,
+    '-': TT_MINUS,
+    '*': TT_MUL,
+    '/': TT_DIV,
+    '^': TT_POW,
+    '(': TT_LPAREN,
+    ')': TT_RPAREN,
+    '[': TT_LSQUARE,
+    ']': TT_RSQUARE,
+    ',': TT_COMMA,
+    '=': TT_EQ,
+    '<': TT_LT,
+    '>': TT_GT,
+    ';': TT_NEWLINE,
+    '\n': TT_NEWLINE,
+}
+
+ESCAPED_CHARACTERS = {
+    'n': '\n',
+    't': '\t',
+    'j': '\tjingo\t'
+}
+
+# what a string literal holds up to its next quote or backslash
+STRING_CHUNK_PATTERN = re.compile(r'[^"\\]*')
+
+# one match skips the blanks and comments in front of a token and reads the whole
+# token , strings and anything illegal are left to Lexer.HANDLERS . a comment takes
+# its '\n' with it , or runs to the end of the source
+TOKEN_PATTERN = re.compile(r"""
+    (?:[ \t]|\#[^\n]*\n?)*
+    (?:
+        (?P<number>[0-9]+(?P<fraction>\.[0-9]*)?)
+      | (?P<identifier>[A-Za-z][A-Za-z0-9_]*)
+      | (?P<operator>->|==|!=|<=|>=|[-+*/^()\[\],=<>;\n])
+    )?
+""", re.VERBOSE)
+
+
 class Lexer:
+    # single pass lexer : a compiled master pattern reads one token per match , along
+    # with the blanks and comments in front of it , instead of one advance() per
+    # character . the few tokens it does not cover are picked by their first
+    # character from HANDLERS
     def __init__(self, fn, text):
         self.text = text
         self.fn = fn
-        self.pos = Position(-1, 0, 0, fn, text)
-        self.current_char = None
-        self.advance()
-
-    def advance(self):
-        self.pos.advance(self.current_char)
-        self.current_char = self.text[self.pos.index] if self.pos.index < len(self.text) else None
+        self.source_file = source_files.add(fn, text)
+        self.base = self.source_file.base
+        self.index = 0
+        self.error = None
 
     def make_tokens(self):
-        tokens = []
-
-        while (self.current_char != None):
-            if self.current_char in ' \t':
-                self.advance()
-
-            elif self.current_char in ';\n':
-                tokens.append(Token(TT_NEWLINE, pos_start=self.pos))
-                self.advance()
-
-            elif self.current_char == "#":
-                self.skip_comment()
-
-
-            elif self.current_char == '+':
-                tokens.append(Token(TT_PLUS, pos_start=self.pos))
-                self.advance()
-
-            elif self.current_char in DIGITS:
-                tokens.append(self.make_number())
-
-            elif self.current_char == '-':
-                tokens.append(self.make_minus_or_arrow())
-                # tokens.append(Token(TT_MINUS,pos_start=self.pos))
-                # self.advance()
-
-            elif self.current_char == '*':
-                tokens.append(Token(TT_MUL, pos_start=self.pos))
-                self.advance()
-
-            elif self.current_char in LETTERS:
-                tokens.append(self.make_identifier())
-
-            elif self.current_char == '"':
-                tokens.append(self.make_string())
-
-            elif self.current_char == '/':
-                tokens.append(Token(TT_DIV, pos_start=self.pos))
-                self.advance()
-
-
-            elif self.current_char == '(':
-                tokens.append(Token(TT_LPAREN, pos_start=self.pos))
-                self.advance()
-
-            elif self.current_char == '^':
-                tokens.append(Token(TT_POW, pos_start=self.pos))
-                self.advance()
-
-            elif self.current_char == ')':
-                tokens.append(Token(TT_RPAREN, pos_start=self.pos))
-                self.advance()
-
-            elif self.current_char == '!':
-                token, error = self.make_not_equals()
-                if error: return [], error
-                tokens.append(token)
-
-            elif self.current_char == '=':
-                token, error = self.make_equals()
-                if error: return [], error
-                tokens.append(token)
-
-            elif self.current_char == '<':
-                token, error = self.make_less_than()
-                if error: return [], error
-                tokens.append(token)
-
-            elif self.current_char == '>':
-                token, error = self.make_greater_than()
-                if error: return [], error
-                tokens.append(token)
-
-
-            elif self.current_char == ',':
-                tokens.append(Token(TT_COMMA, pos_start=self.pos))
-                self.advance()
-
-
-            elif self.current_char == '[':
-                tokens.append(Token(TT_LSQUARE, pos_start=self.pos))
-                self.advance()
-
-
-            elif self.current_char == ']':
-                tokens.append(Token(TT_RSQUARE, pos_start=self.pos))
-                self.advance()
-
-
-            else:
-                pos_start = self.pos.copy()
-                self.advance()
-                return [], IllegalCharError(pos_start, self.pos, f"'{self.current_char}'")
-
-        tokens.append(Token(TT_EOF, pos_start=self.pos))
-
+        tokens = list(self.iter_tokens())
+        if self.error: return [], self.error
         return tokens, None
 
-    def make_number(self):
-        num_str = ''
-        dot_count = 0
-        pos_start = self.pos.copy()
-        while self.current_char != None and self.current_char in DIGITS + '.':
-            if self.current_char == '.' and dot_count > 0:
-                # print("unrecognized number ")
-                break
-            else:
-
-                if self.current_char == '.': dot_count += 1
-                num_str += self.current_char
-
-            self.advance()
-
-        if (dot_count == 0):
-            return Token(TT_INT, int(num_str), pos_start=pos_start, pos_end=self.pos)
-        else:
-            return Token(TT_FLOAT, float(num_str), pos_start=pos_start, pos_end=self.pos)
-
-    def make_identifier(self):
-        id_str = ''
-        pos_start = self.pos.copy()
-
-        while self.current_char != None and self.current_char in LETTERS_DIGITS + '_':
-            id_str += self.current_char
-            self.advance()
-
-        token_type = TT_KEYWORD if id_str in KEYWORDS else TT_IDENTIFIER
-
-        return Token(token_type, id_str, pos_start, self.pos)
-
-    def make_minus_or_arrow(self):
-        token_type = TT_MINUS
-        pos_start = self.pos.copy()
-        self.advance()
-        if self.current_char == '>':
-            self.advance()
-            token_type = TT_ARROW
-
-        return Token(token_type, pos_start=pos_start, pos_end=self.pos)
-
-    def make_not_equals(self):
-        pos_start = self.pos.copy()
-        self.advance()
-        if self.current_char == '=':
-            self.advance()
-            return Token(TT_NEQ, pos_start=pos_start, pos_end=self.pos), None
-
-        self.advance()
-        return None, ExpectedCharError(pos_start, self.pos, "    ' = '  after ( ' ! ' )")
-
-    def make_equals(self):
-        pos_start = self.pos.copy()
-        self.advance()
-        token_type = TT_EQ
-        if self.current_char == '=':
-            self.advance()
-            token_type = TT_EE
-
-        return Token(token_type, pos_start=pos_start, pos_end=self.pos), None
-
-    def make_less_than(self):
-        token_type = TT_LT
-        pos_start = self.pos.copy()
-        # print(self.current_char)
-        self.advance()
-        if self.current_char == '=':
-            self.advance()
-            # print(self.current_char)
-            # self.advance()
-
-            token_type = TT_LTE
-
-        return Token(token_type, pos_start=pos_start, pos_end=self.pos), None
-
-    def make_greater_than(self):
-        token_type = TT_GT
-        pos_start = self.pos.copy()
-        self.advance()
-        # print(self.current_char)
-        if self.current_char == '=':
-            self.advance()
-
-            token_type = TT_GTE
+    def make_token_buffer(self):
+        tokens = TokenBuffer(self.iter_tokens())
+        if self.error: return TokenBuffer(), self.error
+        return tokens, None
 
-        return Token(token_type, pos_start=pos_start, pos_end=self.pos), None
+    def iter_tokens(self):
+        # yields the tokens as they are read , so the parser can start before the
+        # whole file is lexed . on an error , self.error is set and an EOF is
+        # yielded where it happened to stop whoever is reading
+        text = self.text
+        length = len(text)
+        base = self.base
+        match_token = TOKEN_PATTERN.match
+        handlers = self.HANDLERS
+
+        while self.index < length:
+            match = match_token(text, self.index)
+            kind = match.lastgroup
+            start = match.start(kind) if kind else match.end()
+            end = self.index = match.end()
+
+            if kind == 'operator':
+                yield Token(OPERATOR_TOKENS[match.group(kind)], None, base + start, base + end)
+
+            elif kind == 'identifier':
+                # interned , so the names the symbol tables are keyed and searched by are the
+                # same string objects and dict lookups stop at the identity check
+                id_str = intern(match.group(kind))
+                yield Token(KEYWORD_TYPES.get(id_str, TT_IDENTIFIER), id_str, base + start, base + end)
+
+            elif kind == 'number':
+                if match.group('fraction') is None:
+                    yield Token(TT_INT, int(match.group(kind)), base + start, base + end)
+                else:
+                    yield Token(TT_FLOAT, float(match.group(kind)), base + start, base + end)
 
-    def make_string(self):
-        pos_start = self.pos.copy()
+            elif start >= length:
+                break
 
-        string_value = ""
-        escape_character = False
-        self.advance()
-        # if not self.current_char == '"':
-        #     return
-        escaped_characters = {
-            'n': '\n',
-            't': '\t',
-            'j': '\tjingo\t'
-        }
-
-        while self.current_char != None and (self.current_char != '"' or escape_character):
-            if escape_character:
-                string_value += escaped_characters.get(self.current_char, self.current_char)
-                escape_character = False
             else:
-                if self.current_char == '\\':
-                    escape_character = True
-                else:
-                    string_value += self.current_char
-                    escape_character = False
-            self.advance()
-
-        self.advance()
-        # print(string_value)
-        return Token(TT_STRING, string_value, pos_start, self.pos)
+                handler = handlers.get(text[start], Lexer.illegal_char)
+                token, error = handler(self, start)
+                if error:
+                    self.error = error
+                    break
+                if token: yield token
+
+        yield Token(TT_EOF, pos_start=self.base + self.index)
+
+    def illegal_char(self, index):
+        self.index = index + 1
+        next_char = self.text[index + 1] if index + 1 < len(self.text) else None
+        return None, IllegalCharError(self.base + index, self.base + index + 1, f"'{next_char}'")
+
+    def make_not_equals(self, index):
+        # a '!' the pattern did not take as '!='
+        self.index = index + 2
+        return None, ExpectedCharError(self.base + index, self.base + index + 2,
+                                       "    ' = '  after ( ' ! ' )")
+
+    def make_string(self, index):
+        text = self.text
+        length = len(text)
+        pos_start = self.base + index
+        parts = []
+        index += 1
+
+        # copy every run up to the next quote or backslash in one slice
+        while True:
+            end = STRING_CHUNK_PATTERN.match(text, index).end()
+            parts.append(text[index:end])
+            if end >= length or text[end] == '"':
+                index = end
+                break
+            # a backslash : the char after it is kept as is or replaced from ESCAPED_CHARACTERS
+            if end + 1 < length:
+                char = text[end + 1]
+                parts.append(ESCAPED_CHARACTERS.get(char, char))
+            index = min(end + 2, length)
 
-    def skip_comment(self):
-        self.advance()
+        # a missing closing quote still moves one past the end , like the char lexer does
+        self.index = index + 1
+        return Token(TT_STRING, ''.join(parts), pos_start, self.base + self.index), None
 
-        while self.current_char != '\n':
-            self.advance()
+    HANDLERS = {
+        '"': make_string,
+        '!': make_not_equals,
+    }
 
-        self.advance()
 
 ##
 # ParseResult
@@ -459,9 +584,37 @@ class ParseResult:
 ##
 
 
+# binding power of the binary operators , higher binds tighter
+BINARY_PRECEDENCE = {
+    TT_AND: 1, TT_OR: 1,
+    TT_EE: 2, TT_NEQ: 2, TT_LT: 2, TT_GT: 2, TT_LTE: 2, TT_GTE: 2,
+    TT_PLUS: 3, TT_MINUS: 3,
+    TT_MUL: 4, TT_DIV: 4,
+    TT_POW: 5,
+}
+# operands from here up can start with "not"
+COMPARISON_PRECEDENCE = 2
+POW_PRECEDENCE = 5
+
+# what Parser.operation keeps on its stack
+BINARY_FRAME = 0
+UNARY_FRAME = 1
+BRACKET_FRAME = 2
+
+# how many consumed tokens can pile up before the parser lets go of them
+PARSER_TRIM_SIZE = 256
+
+
 class Parser:
+    # tokens can be a list or an iterator such as Lexer.iter_tokens() , only the
+    # tokens reverse() can still go back to are kept in self.buffer
     def __init__(self, tokens):
-        self.tokens = tokens
+        self.tokens = iter(tokens)
+        self.buffer = []
+        # token index of self.buffer[0]
+        self.buffer_start = 0
+        # token indexes a try_register() may reverse to
+        self.pins = []
         self.token_index = -1
         self.current_token = None
         self.advance()
@@ -477,8 +630,31 @@ class Parser:
         return self.current_token
 
     def update_current_token(self):
-        if self.token_index >=0 and self.token_index < len(self.tokens):
-            self.current_token = self.tokens[self.token_index]
+        while self.token_index - self.buffer_start >= len(self.buffer):
+            token = next(self.tokens, None)
+            # past EOF the current token stays the EOF
+            if token is None: return
+            self.buffer.append(token)
+            self.trim()
+
+        buffer_index = self.token_index - self.buffer_start
+        if buffer_index >= 0:
+            self.current_token = self.buffer[buffer_index]
+
+    def trim(self):
+        keep_from = min(self.pins[0], self.token_index) if self.pins else self.token_index
+        drop_count = keep_from - self.buffer_start
+        if drop_count >= PARSER_TRIM_SIZE:
+            del self.buffer[:drop_count]
+            self.buffer_start = keep_from
+
+    def pin(self):
+        # keep the current token and the ones after it until unpin() , so a
+        # failed try_register() can reverse() back to it
+        self.pins.append(self.token_index)
+
+    def unpin(self):
+        self.pins.pop()
 
     def parse(self):
         res = self.statements()
@@ -490,66 +666,34 @@ class Parser:
             ))
         return res
 
-    def call(self):
-        res = ParseResult()
-        atom = res.register(self.atom())
-        if res.error: return res
-        if self.current_token.type == TT_LPAREN:
-            res.register_advancement()
-            self.advance()
-            arg_nodes = []
-
-            if self.current_token.type == TT_RPAREN:
-                res.register_advancement()
-                self.advance()
-            else:
-                arg_nodes.append(res.register(self.expr()))
-                if res.error:  return res.failure(InvalidSyntaxError(
-                    self.current_token.pos_start, self.current_token.pos_end,
-                    'Expected "let", int , float , identifier , "+","-", "(", "["  or "not" from call \n '))
-
-                while self.current_token.type == TT_COMMA:
-                    res.register_advancement()
-                    self.advance()
-                    arg_nodes.append(res.register(self.expr()))
-                    if res.error: return res
-
-                if self.current_token.type != TT_RPAREN:
-                    return res.failure(InvalidSyntaxError(
-                        self.current_token.pos_start, self.current_token.pos_end,
-                        'Expected " , " or " ) " '
-                    ))
-                res.register_advancement()
-                self.advance()
-            return res.success(CallNode(atom, arg_nodes))
-        return res.success(atom)
-
     def statement(self):
         res = ParseResult()
-        pos_start = self.current_token.pos_start.copy()
+        pos_start = self.current_token.pos_start
 
-        if self.current_token.matches(TT_KEYWORD,'RETURN'):
+        if self.current_token.type == TT_RETURN:
             res.register_advancement()
             self.advance()
+            self.pin()
             expr = res.try_register(self.expr())
+            self.unpin()
             if not expr :
                 self.reverse(res.to_reverse_count)
 
-            return res.success(ReturnNode(expr,pos_start,self.current_token.pos_end.copy()))
+            return res.success(ReturnNode(expr,pos_start,self.current_token.pos_end))
 
-        if self.current_token.matches(TT_KEYWORD,'CONTINUE'):
+        if self.current_token.type == TT_CONTINUE:
             res.register_advancement()
             self.advance()
-            return res.success(ContinueNode(pos_start,self.current_token.pos_end.copy()))
+            return res.success(ContinueNode(pos_start,self.current_token.pos_end))
 
-        if self.current_token.matches(TT_KEYWORD,'BREAK'):
+        if self.current_token.type == TT_BREAK:
             res.register_advancement()
             self.advance()
-            return res.success(BreakNode(pos_start,self.current_token.pos_end.copy()))
+            return res.success(BreakNode(pos_start,self.current_token.pos_end))
 
         expr = res.register(self.expr())
         if res.error: return res.failure(InvalidSyntaxError(
-            pos_start,self.current_token.pos_end.copy(),
+            pos_start,self.current_token.pos_end,
             'Expected expr + continue / break / return '
         ))
         return res.success(expr)
@@ -557,7 +701,7 @@ class Parser:
     def statements(self):
         res = ParseResult()
         statements = []
-        pos_start = self.current_token.pos_start.copy()
+        pos_start = self.current_token.pos_start
 
         while self.current_token.type == TT_NEWLINE :
             res.register_advancement()
@@ -580,9 +724,11 @@ class Parser:
 
             if not more_statements : break
 
+            self.pin()
             statement = res.try_register(self.statement())
+            self.unpin()
             # print("try statement :",end="\t\t")
-            print(statement)
+            # print(statement)
             if not statement:
                 self.reverse(res.to_reverse_count)
                 more_statements = False
@@ -592,9 +738,23 @@ class Parser:
         return res.success(ListNode(
             statements,
             pos_start,
-            self.current_token.pos_end.copy()
+            self.current_token.pos_end
         ))
 
+    def discard_value(self, node):
+        # a loop whose value is thrown away needn't keep the values of its body . called
+        # on the blocks of FOR , WHILE , IF and multi-line FUNC , never on the program ,
+        # whose statement values run() gives back and the shell prints
+        if type(node) is ListNode:
+            for element_node in node.element_nodes:
+                self.discard_value(element_node)
+        elif type(node) is ForNode or type(node) is WhileNode:
+            node.should_return_null = True
+        elif type(node) is IfNode:
+            for _, expr, _ in node.cases:
+                self.discard_value(expr)
+            if node.else_case: self.discard_value(node.else_case[0])
+
     def atom(self):
         res = ParseResult()
         token = self.current_token
@@ -634,22 +794,22 @@ class Parser:
 
             return res.success(list_expr)
 
-        elif token.matches(TT_KEYWORD, 'IF'):
+        elif token.type == TT_IF:
             if_expr = res.register(self.if_expr())
             if res.error: return res
             return res.success(if_expr)
 
-        elif token.matches(TT_KEYWORD, 'FOR'):
+        elif token.type == TT_FOR:
             for_expr = res.register(self.for_expr())
             if res.error: return res
             return res.success(for_expr)
 
-        elif token.matches(TT_KEYWORD, 'WHILE'):
+        elif token.type == TT_WHILE:
             while_expr = res.register(self.while_expr())
             if res.error: return res
             return res.success(while_expr)
 
-        elif token.matches(TT_KEYWORD, 'FUNC'):
+        elif token.type == TT_FUNC:
             func_def = res.register(self.func_def())
             if res.error: return res
             return res.success(func_def)
@@ -662,7 +822,7 @@ class Parser:
     def list_expr(self):
         res = ParseResult()
         element_nodes = []
-        pos_start = self.current_token.pos_start.copy()
+        pos_start = self.current_token.pos_start
 
         if self.current_token.type != TT_LSQUARE:
             return res.failure(InvalidSyntaxError(
@@ -697,12 +857,12 @@ class Parser:
         return res.success(ListNode(
             element_nodes,
             pos_start,
-            self.current_token.pos_end.copy()
+            self.current_token.pos_end
         ))
 
     def for_expr(self):
         res = ParseResult()
-        if not self.current_token.matches(TT_KEYWORD, 'FOR'):
+        if self.current_token.type != TT_FOR:
             return res.failure(InvalidSyntaxError(
                 self.current_token.pos_start, self.current_token.pos_end,
                 'Expected "FOR" '
@@ -731,7 +891,7 @@ class Parser:
         start_value = res.register(self.expr())
         if res.error: return res
 
-        if not self.current_token.matches(TT_KEYWORD, 'TO'):
+        if self.current_token.type != TT_TO:
             return res.failure(InvalidSyntaxError(
                 self.current_token.pos_start, self.current_token.pos_end,
                 'Expected \'TO\''
@@ -744,7 +904,7 @@ class Parser:
 
         if res.error: return res
 
-        if self.current_token.matches(TT_KEYWORD, 'STEP'):
+        if self.current_token.type == TT_STEP:
             res.register_advancement()
             self.advance()
 
@@ -753,7 +913,7 @@ class Parser:
         else:
             step_value = None
 
-        if not self.current_token.matches(TT_KEYWORD, 'THEN'):
+        if self.current_token.type != TT_THEN:
             return res.failure(InvalidSyntaxError(
                 self.current_token.pos_start, self.current_token.pos_end,
                 'Expected \' THEN \' '
@@ -769,7 +929,7 @@ class Parser:
             body = res.register(self.statements())
             if res.error: return res
 
-            if not self.current_token.matches(TT_KEYWORD,'END'):
+            if self.current_token.type != TT_END:
                 return res.failure(InvalidSyntaxError(
                 self.current_token.pos_start,self.current_token.pos_end,
                 f"Expected '{'END'}'"
@@ -778,6 +938,7 @@ class Parser:
             res.register_advancement()
             self.advance()
 
+            self.discard_value(body)
             return res.success(ForNode(var_name, start_value, end_value, step_value, body, True))
 
 
@@ -789,7 +950,7 @@ class Parser:
 
     def while_expr(self):
         res = ParseResult()
-        if not self.current_token.matches(TT_KEYWORD, 'WHILE'):
+        if self.current_token.type != TT_WHILE:
             return res.failure(InvalidSyntaxError(
                 self.current_token.pos_start, self.current_token.pos_end,
                 'Expected "WHILE" '
@@ -802,7 +963,7 @@ class Parser:
 
         if res.error: return res
 
-        if not self.current_token.matches(TT_KEYWORD, 'THEN'):
+        if self.current_token.type != TT_THEN:
             return res.failure(InvalidSyntaxError(
                 self.current_token.pos_start, self.current_token.pos_end,
                 'Expected " THEN " '
@@ -818,12 +979,16 @@ class Parser:
             body = res.register(self.statements())
             if res.error : return res
 
-            if not self.current_token.matches(TT_KEYWORD,'END'):
+            if self.current_token.type != TT_END:
                 return res.failure(InvalidSyntaxError(
                 self.current_token.pos_start,self.current_token.pos_end,
                 f"Expected '{'END'}'"
             ))
 
+            res.register_advancement()
+            self.advance()
+
+            self.discard_value(body)
             return res.success(WhileNode(condition, body,True))
 
         body = res.register(self.statement())
@@ -834,7 +999,7 @@ class Parser:
     def func_def(self):
         res = ParseResult()
 
-        if not self.current_token.matches(TT_KEYWORD, 'FUNC'):
+        if self.current_token.type != TT_FUNC:
             return res.failure(InvalidSyntaxError(
                 self.current_token.pos_start, self.current_token.pos_end,
                 'Expected "FUNC" '
@@ -918,10 +1083,10 @@ class Parser:
 
         # print(self.current_token)
         body = res.register(self.statements())
-        if re.error : return res
+        if res.error: return res
 
 
-        if not self.current_token.matches(TT_KEYWORD,'END'):
+        if self.current_token.type != TT_END:
             return res.failure(InvalidSyntaxError(
                 self.current_token.pos_start,self.current_token.pos_end,
                 f"Expected '{'END'}'"
@@ -929,6 +1094,7 @@ class Parser:
         res.register_advancement()
         self.advance()
 
+        self.discard_value(body)
         return res.success(FuncDefNode(
             var_name_token,
             arg_name_tokens,
@@ -936,9 +1102,6 @@ class Parser:
             False
         ))
 
-    def power(self):
-        return self.binary_op(self.call, (TT_POW,), self.factor)
-
     def elif_expr(self):
         return self.if_expr_cases('ELIF')
 
@@ -946,7 +1109,7 @@ class Parser:
         res = ParseResult()
         else_case = None
 
-        if self.current_token.matches(TT_KEYWORD,'ELSE'):
+        if self.current_token.type == TT_ELSE:
             res.register_advancement()
             self.advance()
 
@@ -955,8 +1118,9 @@ class Parser:
                 self.advance()
                 statements = res.register(self.statements())
                 if res.error: return res
+                self.discard_value(statements)
                 else_case = (statements , True)
-                if self.current_token.matches(TT_KEYWORD,'END'):
+                if self.current_token.type == TT_END:
                     res.register_advancement()
                     self.advance()
                 else :
@@ -978,7 +1142,7 @@ class Parser:
         cases = []
         else_case = None
 
-        if not self.current_token.matches(TT_KEYWORD,keyword):
+        if self.current_token.type != KEYWORD_TYPES[keyword]:
             return res.failure(InvalidSyntaxError(
                 self.current_token.pos_start,self.current_token.pos_end,
                 f"Expected '{keyword}'"
@@ -988,7 +1152,7 @@ class Parser:
         self.advance()
         condition = res.register(self.expr())
         if res.error : return res
-        if not self.current_token.matches(TT_KEYWORD,'THEN'):
+        if self.current_token.type != TT_THEN:
             return res.failure(InvalidSyntaxError(
                 self.current_token.pos_start,self.current_token.pos_end,
                 f"Expected '{'THEN'}'"
@@ -1002,9 +1166,10 @@ class Parser:
             self.advance()
             statements = res.register(self.statements())
             if res.error : return res
+            self.discard_value(statements)
             cases.append((condition,statements,True))
 
-            if self.current_token.matches(TT_KEYWORD,'END'):
+            if self.current_token.type == TT_END:
                 res.register_advancement()
                 self.advance()
             else:
@@ -1030,7 +1195,7 @@ class Parser:
         res = ParseResult()
         cases , else_case = [],None
 
-        if self.current_token.matches(TT_KEYWORD,'ELIF'):
+        if self.current_token.type == TT_ELIF:
             all_cases = res.register(self.elif_expr())
             if res.error  : return res
             cases , else_case = all_cases
@@ -1056,7 +1221,7 @@ class Parser:
         # cases = []
         # else_case = None
         #
-        # if not self.current_token.matches(TT_KEYWORD, 'IF'):
+        # if self.current_token.type != TT_IF:
         #     return res.failure(InvalidSyntaxError(
         #         self.current_token.pos_start, self.current_token.pos_end,
         #         'Expected "IF" '
@@ -1068,7 +1233,7 @@ class Parser:
         # condition = res.register(self.expr())
         # if res.error: return res
         #
-        # if not self.current_token.matches(TT_KEYWORD, 'THEN'):
+        # if self.current_token.type != TT_THEN:
         #     return res.failure(InvalidSyntaxError(
         #         self.current_token.pos_start, self.current_token.pos_end,
         #         'Expected \'THEN\' '
@@ -1080,14 +1245,14 @@ class Parser:
         # if res.error: return res
         # cases.append((condition, expretion))
         #
-        # while self.current_token.matches(TT_KEYWORD, 'ELIF'):
+        # while self.current_token.type == TT_ELIF:
         #     res.register_advancement()
         #     self.advance()
         #
         #     condition = res.register(self.expr())
         #     if res.error: return res
         #
-        #     if not self.current_token.matches(TT_KEYWORD, 'THEN'):
+        #     if self.current_token.type != TT_THEN:
         #         return res.failure(InvalidSyntaxError(
         #             self.current_token.pos_start, self.current_token.pos_end,
         #             'Expected \'THEN\''
@@ -1102,7 +1267,7 @@ class Parser:
         #
         #     cases.append((condition, expretion))
         #
-        # if self.current_token.matches(TT_KEYWORD, 'ELSE'):
+        # if self.current_token.type == TT_ELSE:
         #     res.register_advancement()
         #     self.advance()
         #     else_case = res.register(self.expr())
@@ -1112,54 +1277,16 @@ class Parser:
         #
         # return res.success(IfNode(cases, else_case))
 
-    def factor(self):
-        res = ParseResult()
-        token = self.current_token
-        if token.type in (TT_PLUS, TT_MINUS):
-            res.register_advancement()
-            self.advance()
-            factor = res.register(self.factor())
-            if res.error: return res
-
-            return res.success(UnaryOpNode(token, factor))
-
-        return self.power()
-
-    def term(self):
-
-        return self.binary_op(self.factor, (TT_MUL, TT_DIV))
-
-    def binary_op(self, func_a, op_tokens, func_b=None):
-        if func_b == None:
-            func_b = func_a
-
-        res = ParseResult()
-        # basically a rule is the unit slicer ( what ditermines a unit )
-        left = res.register(func_a())
-        if res.error: return res
-        # the left factor keeps on expanding to be the whole term in the end
-        # op_tokens the relation we need between these tokens
-        while (self.current_token.type in op_tokens or (
-                self.current_token.type, self.current_token.value) in op_tokens):
-            op_token = self.current_token
-            res.register_advancement()
-            self.advance()
-            right = res.register(func_b())
-            if res.error: return res
-            left = BinaryOpNode(left, op_token, right)
-
-        return res.success(left)
-
     def expr(self):
 
         res = ParseResult()
 
-        if self.current_token.matches(TT_KEYWORD, 'LET'):
+        if self.current_token.type == TT_LET:
             res.register_advancement()
             self.advance()
             if self.current_token.type != TT_IDENTIFIER:
                 return res.failure(InvalidSyntaxError(
-                    self.current_token.pos_start, self.current_token,
+                    self.current_token.pos_start, self.current_token.pos_end,
                     'Expected Identifier'
                 ))
             var_name = self.current_token
@@ -1179,41 +1306,153 @@ class Parser:
             if res.error: return res
             return res.success(VarAssignNode(var_name, expr))
 
-        node = res.register(self.binary_op(self.comp_expr, ((TT_KEYWORD, "and"), (TT_KEYWORD, "or"))))
+        node = self.operation(res, 1)
         if res.error: return res.failure(InvalidSyntaxError(self.current_token.pos_start, self.current_token.pos_end,
                                                             'Expected "let", int , float , identifier , "+","-", "("  , " [ " , "IF", "FOR", "WHILE", "FUNC" "not" '))
 
         return res.success(node)
 
-    def comp_expr(self):
-        res = ParseResult()
-        if self.current_token.matches(TT_KEYWORD, 'NOT'):
-            op_token = self.current_token
+    def operation(self, res, min_precedence):
+        # precedence climbing over BINARY_PRECEDENCE , every token is registered in the
+        # caller's res . the operators and brackets still waiting for an operand are kept
+        # on an explicit stack , so long chains and deep nesting don't recurse .
+        # builds the same nodes and errors as the DescentParser of bench.py
+        stack = []
+        while True:
+            # prefix operators and brackets wait on the stack for their operand
+            token = self.current_token
+            if token.type == TT_NOT and min_precedence <= COMPARISON_PRECEDENCE:
+                stack.append((UNARY_FRAME, min_precedence, token))
+                min_precedence = COMPARISON_PRECEDENCE
+                res.register_advancement()
+                self.advance()
+                continue
+
+            if token.type in (TT_PLUS, TT_MINUS):
+                stack.append((UNARY_FRAME, min_precedence, token))
+                min_precedence = POW_PRECEDENCE
+                res.register_advancement()
+                self.advance()
+                continue
+
+            if token.type == TT_LPAREN:
+                stack.append((BRACKET_FRAME, min_precedence))
+                min_precedence = 1
+                res.register_advancement()
+                self.advance()
+                if self.current_token.type != TT_LET: continue
+                node = res.register(self.expr())
+                if res.error: return None
+            else:
+                advance_count = res.advance_count
+                node = self.operand(res)
+                if res.error:
+                    # nothing could be read , the same messages expr / comp_expr gave
+                    if res.advance_count == advance_count and min_precedence <= COMPARISON_PRECEDENCE:
+                        if stack and stack[-1][0] == BRACKET_FRAME:
+                            details = 'Expected "let", int , float , identifier , "+","-", "("  , " [ " , "IF", "FOR", "WHILE", "FUNC" "not" '
+                        else:
+                            details = 'Expected int , float , identifier + - (  [ "not" '
+                        res.error = InvalidSyntaxError(self.current_token.pos_start, self.current_token.pos_end, details)
+                    return None
+
+            # close the frames the operand finishes , up to an operator that takes it as its left side
+            while True:
+                op_token = self.current_token
+                precedence = BINARY_PRECEDENCE.get(op_token.type)
+                if precedence is not None and precedence >= min_precedence: break
+                if not stack: return node
+
+                frame = stack.pop()
+                min_precedence = frame[1]
+                if frame[0] == BINARY_FRAME:
+                    node = BinaryOpNode(frame[2], frame[3], node)
+                elif frame[0] == UNARY_FRAME:
+                    node = UnaryOpNode(frame[2], node)
+                else:
+                    if op_token.type != TT_RPAREN:
+                        res.failure(InvalidSyntaxError(op_token.pos_start, op_token.pos_end, "Expected ')' "))
+                        return None
+                    res.register_advancement()
+                    self.advance()
+                    node = self.call_arguments(res, node)
+                    if res.error: return None
+
+            stack.append((BINARY_FRAME, min_precedence, node, op_token))
+            # ^ is right associative , the others are left associative
+            min_precedence = precedence if precedence == POW_PRECEDENCE else precedence + 1
             res.register_advancement()
             self.advance()
 
-            node = res.register(self.comp_expr())
-            if res.error: return res
-
-            return res.success(UnaryOpNode(op_token, node))
+    def operand(self, res):
+        # an atom and the arguments it is called with
+        token = self.current_token
+        if token.type in (TT_INT, TT_FLOAT):
+            res.register_advancement()
+            self.advance()
+            atom = NumberNode(token)
+        elif token.type == TT_STRING:
+            res.register_advancement()
+            self.advance()
+            atom = StringNode(token)
+        elif token.type == TT_IDENTIFIER:
+            res.register_advancement()
+            self.advance()
+            atom = VarAccessNode(token)
+        else:
+            atom = res.register(self.atom())
+            if res.error: return None
+        return self.call_arguments(res, atom)
 
-        node = res.register(self.binary_op(self.arith_expr, (TT_EE, TT_NEQ, TT_LT, TT_GT, TT_GTE, TT_LTE)))
+    def call_arguments(self, res, atom):
+        if self.current_token.type != TT_LPAREN: return atom
+        res.register_advancement()
+        self.advance()
+        arg_nodes = []
 
-        if res.error:
-            return res.failure(
-                InvalidSyntaxError(
-                    self.current_token.pos_start, self.current_token.pos_end,
-                    'Expected int , float , identifier + - (  [ "not" '
-        ))
+        if self.current_token.type == TT_RPAREN:
+            res.register_advancement()
+            self.advance()
+            return CallNode(atom, arg_nodes)
 
-        return res.success(node)
+        arg_nodes.append(res.register(self.expr()))
+        if res.error: return None
+        while self.current_token.type == TT_COMMA:
+            res.register_advancement()
+            self.advance()
+            arg_nodes.append(res.register(self.expr()))
+            if res.error: return None
 
-    def arith_expr(self):
-        return self.binary_op(self.term, (TT_PLUS, TT_MINUS))
+        if self.current_token.type != TT_RPAREN:
+            res.failure(InvalidSyntaxError(
+                self.current_token.pos_start, self.current_token.pos_end,
+                'Expected " , " or " ) " '
+            ))
+            return None
+        res.register_advancement()
+        self.advance()
+        return CallNode(atom, arg_nodes)
 
 
 # Nodes
 
+# the Value method each binary operator calls
+BINARY_OPERATION_METHODS = {
+    TT_PLUS: 'added_to',
+    TT_MINUS: 'subbed_by',
+    TT_MUL: 'multed_by',
+    TT_DIV: 'dived_by',
+    TT_POW: 'powed_by',
+    TT_EE: 'get_comparison_eq',
+    TT_NEQ: 'get_comparison_ne',
+    TT_LT: 'get_comparison_lt',
+    TT_LTE: 'get_comparison_lte',
+    TT_GT: 'get_comparison_gt',
+    TT_GTE: 'get_comparison_gte',
+    TT_AND: 'anded_by',
+    TT_OR: 'ored_by',
+}
+
 
 class NumberNode:
     def __init__(self, token):
@@ -1240,6 +1479,8 @@ class VarAccessNode:
         self.var_name_token = var_name_token
         self.pos_start = self.var_name_token.pos_start
         self.pos_end = self.var_name_token.pos_end
+        # set by the Resolver in a function body
+        self.slot = None
 
 
 class VarAssignNode:
@@ -1248,6 +1489,7 @@ class VarAssignNode:
         self.value_node = value_node
         self.pos_start = self.var_name_token.pos_start
         self.pos_end = self.var_name_token.pos_end
+        self.slot = None
 
 
 class BinaryOpNode:
@@ -1255,6 +1497,11 @@ class BinaryOpNode:
         self.left_node = left_node
         self.op_token = op_token
         self.right_node = right_node
+        # the name of the Value method , looked up once here rather than per evaluation
+        self.operation = BINARY_OPERATION_METHODS[op_token.type]
+        # the inline cache of the Interpreter : the operand types seen last and what
+        # handled them , see OperationCache
+        self.left_type = self.right_type = self.handler = None
         self.pos_start = self.left_node.pos_start
         self.pos_end = self.right_node.pos_end
 
@@ -1311,6 +1558,9 @@ class FuncDefNode:
         self.arg_name_tokens = arg_name_tokens
         self.body_node = body_node
         self.should_auto_return = should_auto_return
+        # the slots of the names local to the body , set by the Resolver
+        self.slot_of = None
+        mark_tail_calls(self)
 
         if self.var_name_token:
             self.pos_start = self.var_name_token.pos_start
@@ -1321,12 +1571,17 @@ class FuncDefNode:
             self.pos_start = self.body_node.pos_start
 
         self.pos_end = self.body_node.pos_end
+        # the function values made from the body can outlive the tree , their errors
+        # need its source
+        body_node.source_file = source_files.file_at(self.pos_start)
 
 
 class CallNode:
     def __init__(self, node_to_call, arg_nodes):
         self.node_to_call = node_to_call
         self.arg_nodes = arg_nodes
+        # what the function it is in returns , see mark_tail_calls
+        self.tail = False
 
         self.pos_start = node_to_call.pos_start
 
@@ -1361,6 +1616,29 @@ class BreakNode :
         self.pos_end = pos_end
 
 
+def mark_tail_calls(func_def_node):
+    # the calls whose value is the value of the function : the body of an arrow
+    # function , or a case of an IF that is , and what a RETURN gives . every
+    # engine makes them once the body is done with , in the frame of the caller :
+    # Function.execute , ClosureFunction.call and OP_TAIL_CALL on the VirtualMachine
+    tail = [func_def_node.body_node] if func_def_node.should_auto_return else []
+    while tail:
+        node = tail.pop()
+        if type(node) is CallNode:
+            node.tail = True
+        elif type(node) is IfNode:
+            tail.extend(expr for _, expr, should_return_null in node.cases if not should_return_null)
+            if node.else_case and not node.else_case[1]: tail.append(node.else_case[0])
+
+    stack = [func_def_node.body_node]
+    while stack:
+        node = stack.pop()
+        if type(node) is ReturnNode and type(node.node_to_return) is CallNode:
+            node.node_to_return.tail = True
+        # a function in the body has its own returns
+        if type(node) is not FuncDefNode: stack.extend(child_nodes(node))
+
+
 
 ##
 # RunTime Result :
@@ -1414,16 +1692,82 @@ class RunTimeResult:
     def should_return(self):
         return (self.error or self.func_return_value or self.loop_should_break or self.loop_should_continue)
 
+
+# what a visit of the Interpreter gives instead of a value when a break , continue
+# or return is on its way out , passed up by every visit it goes through . the value
+# of a return waits on the Interpreter , so none of them allocates anything
+class Signal:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f'<{self.name} signal>'
+
+
+BREAK = Signal('break')
+CONTINUE = Signal('continue')
+RETURN = Signal('return')
+
+
+# an error is raised , by the Interpreter , functions and builtins , as are break /
+# continue / return by the closures of the ClosureCompiler
+class ErrorSignal(Exception):
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+
+class BreakSignal(Exception):
+    pass
+
+
+class ContinueSignal(Exception):
+    pass
+
+
+class ReturnSignal(Exception):
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
 class SymbolTable:
     def __init__(self, parent=None):
         self.symbols = {}
         self.parent = parent
+        # name : the table further up it was found in , see get
+        self.found = None
 
     def get(self, name):
-        value = self.symbols.get(name, None)
-        if value == None and self.parent:
-            return self.parent.get(name)
-        return value
+        # walks up without recursion , the chain is as long as the calls are deep . a
+        # table remembers where up the chain it found a name , and the walk stops at
+        # the first table that remembers it : only the innermost call sets names , so
+        # none of the tables in between can get it while this one is there . RUN can
+        # set it again at the top , which is why the value is looked up each time
+        symbol_table = self
+        while True:
+            parent = symbol_table.parent
+            if type(symbol_table) is SymbolTable:
+                value = symbol_table.symbols.get(name, None)
+                if value is None and symbol_table.found:
+                    found_in = symbol_table.found.get(name)
+                    if found_in is not None:
+                        value = found_in.symbols.get(name, None)
+                        if value is not None: symbol_table = found_in
+            else:
+                # Frame.own , written out
+                slot = symbol_table.slot_of.get(name)
+                if slot is not None:
+                    value = symbol_table.values[slot]
+                else:
+                    value = symbol_table.others.get(name) if symbol_table.others else None
+                    parent = symbol_table.outer
+            if value is not None:
+                if symbol_table is not self and type(symbol_table) is SymbolTable and type(self) is SymbolTable:
+                    if self.found is None: self.found = {}
+                    self.found[name] = symbol_table
+                return value
+            if not parent: return value
+            symbol_table = parent
 
     def set(self, name, value):
         self.symbols[name] = value
@@ -1432,7 +1776,56 @@ class SymbolTable:
         del self.symbols[name]
 
 
+class Frame(SymbolTable):
+    # the symbol table of a call to a SlotFunction : the names the Resolver found
+    # local to its body are a fixed size list , any other name goes to a dict
+    def __init__(self, slot_of, parent=None):
+        self.slot_of = slot_of
+        self.values = [None] * len(slot_of)
+        self.others = None
+        self.parent = parent
+        # where a name that isn't one of the slots is looked for next : past the calls
+        # of the same function right above , which only have these slots either . only
+        # the innermost call sets names , so they can't get others while this one runs
+        if type(parent) is Frame and parent.slot_of is slot_of and parent.others is None:
+            self.outer = parent.outer
+        else:
+            self.outer = parent
+
+    @property
+    def symbols(self):
+        # what a SymbolTable would hold , for code walking the chain by hand
+        symbols = dict(self.others or ())
+        for name, slot in self.slot_of.items():
+            if self.values[slot] is not None: symbols[name] = self.values[slot]
+        return symbols
+
+    def own(self, name):
+        # the value in this frame only , SymbolTable.get does the walk up
+        slot = self.slot_of.get(name)
+        if slot is not None: return self.values[slot]
+        return self.others.get(name) if self.others else None
+
+    def set(self, name, value):
+        slot = self.slot_of.get(name)
+        if slot is not None:
+            self.values[slot] = value
+        else:
+            if self.others is None: self.others = {}
+            self.others[name] = value
+
+    def remove(self, name):
+        slot = self.slot_of.get(name)
+        if slot is not None:
+            self.values[slot] = None
+        else:
+            del self.others[name]
+
+
 class Context:
+    # what run() runs the program on , set on the <program> context for RUN
+    engine = 'tree'
+
     def __init__(self, display_name, parent=None, parent_entry_pos=None):
         self.display_name = display_name
         self.parent = parent
@@ -1444,6 +1837,8 @@ class Context:
 # VALUES
 ##
 class Value:
+    __slots__ = ()
+
     def __init__(self):
         self.set_pos()
         self.set_context()
@@ -1503,155 +1898,232 @@ class Value:
         return False
 
     def execute(self, args):
-        return None, self.illegal_operation()
+        raise ErrorSignal(self.illegal_operation())
 
     def copy(self):
         raise Exception('No Copy Method Defined Inside The \'Value\' Class ')
 
     def illegal_operation(self, other=None):
-        if not other: other = self
-        return RunTimeError(
-            self.pos_start, other.pos_end,
-            'Illegal Operation',
-            self.context
-        )
+        # placed at the operation by the engine running it
+        return RunTimeError(None, None, 'Illegal Operation', None)
 
 
 class Number(Value):
+    # Numbers are immutable and shared : the small ints and the results of comparisons
+    # are the ones in the pool of number_of . so a Number has no position or context ,
+    # setting them leaves it as it is
+    __slots__ = ('value',)
+    pos_start = pos_end = context = None
 
     def __init__(self, value):
-        super().__init__()
         self.value = value
 
-    def added_to(self, other):
-        if isinstance(other, Number):
-            return Number(self.value + other.value).set_context(self.context), None
+    def set_pos(self, pos_start=None, pos_end=None):
+        return self
+
+    def set_context(self, context=None):
+        return self
+
+    def added_to(self, other):
+        if isinstance(other, Number):
+            return number_of(self.value + other.value), None
+        elif type(other) is Vector:
+            return other.operated('add', self, swapped=True)
         else:
-            return None, Value.illegal_operation(self.pos_start, other.pos_end)
+            return None, self.illegal_operation(other)
 
     def subbed_by(self, other):
         if isinstance(other, Number):
-            return Number(self.value - other.value).set_context(self.context), None
+            return number_of(self.value - other.value), None
+        elif type(other) is Vector:
+            return other.operated('subtract', self, swapped=True)
         else:
-            return None, Value.illegal_operation(self.pos_start, other.pos_end)
+            return None, self.illegal_operation(other)
 
     def multed_by(self, other):
         if isinstance(other, Number):
-            return Number(self.value * other.value).set_context(self.context), None
+            return number_of(self.value * other.value), None
+        elif type(other) is Vector:
+            return other.operated('multiply', self, swapped=True)
         else:
-            return None, Value.illegal_operation(self.pos_start, other.pos_end)
+            return None, self.illegal_operation(other)
 
     def dived_by(self, other):
         if isinstance(other, Number):
             if other.value == 0:
-                return None, RunTimeError(
-                    other.pos_start, other.pos_end,
-                    'Division By Zero',
-                    self.context
-                )
-            return Number(self.value / other.value).set_context(self.context), None
+                return None, operand_error('Division By Zero')
+            return Number(self.value / other.value), None
+        elif type(other) is Vector:
+            return other.operated('true_divide', self, swapped=True)
         else:
-            return None, Value.illegal_operation(self.pos_start, other.pos_end)
+            return None, self.illegal_operation(other)
 
     def powed_by(self, other):
         if isinstance(other, Number):
-            return Number(self.value ** other.value).set_context(self.context), None
+            return number_of(self.value ** other.value), None
+        elif type(other) is Vector:
+            return other.operated('power', self, swapped=True)
         else:
-            return None, Value.illegal_operation(self.pos_start, other.pos_end)
+            return None, self.illegal_operation(other)
 
     def get_comparison_eq(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value == other.value)).set_context(self.context), None
+            return (Number.true if self.value == other.value else Number.false), None
+        elif type(other) is Vector:
+            return other.operated('equal', self, swapped=True)
         else:
-            return None, Value.illegal_operation(self.pos_start, other.pos_end)
+            return None, self.illegal_operation(other)
 
     def get_comparison_ne(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value != other.value)).set_context(self.context), None
+            return (Number.true if self.value != other.value else Number.false), None
+        elif type(other) is Vector:
+            return other.operated('not_equal', self, swapped=True)
         else:
-            return None, Value.illegal_operation(self.pos_start, other.pos_end)
+            return None, self.illegal_operation(other)
 
     def get_comparison_lt(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value < other.value)).set_context(self.context), None
+            return (Number.true if self.value < other.value else Number.false), None
+        elif type(other) is Vector:
+            return other.operated('less', self, swapped=True)
         else:
-            return None, Value.illegal_operation(self.pos_start, other.pos_end)
+            return None, self.illegal_operation(other)
 
     def get_comparison_lte(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value <= other.value)).set_context(self.context), None
+            return (Number.true if self.value <= other.value else Number.false), None
+        elif type(other) is Vector:
+            return other.operated('less_equal', self, swapped=True)
         else:
-            return None, Value.illegal_operation(self.pos_start, other.pos_end)
+            return None, self.illegal_operation(other)
 
     def get_comparison_gt(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value > other.value)).set_context(self.context), None
+            return (Number.true if self.value > other.value else Number.false), None
+        elif type(other) is Vector:
+            return other.operated('greater', self, swapped=True)
         else:
-            return None, Value.illegal_operation(self.pos_start, other.pos_end)
+            return None, self.illegal_operation(other)
 
     def get_comparison_gte(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value >= other.value)).set_context(self.context), None
+            return (Number.true if self.value >= other.value else Number.false), None
+        elif type(other) is Vector:
+            return other.operated('greater_equal', self, swapped=True)
         else:
-            return None, Value.illegal_operation(self.pos_start, other.pos_end)
+            return None, self.illegal_operation(other)
 
     def anded_by(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value and other.value)).set_context(self.context), None
+            return number_of(int(self.value and other.value)), None
         else:
-            return None, Value.illegal_operation(self.pos_start, other.pos_end)
+            return None, self.illegal_operation(other)
 
     def ored_by(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value or other.value)).set_context(self.context), None
+            return number_of(int(self.value or other.value)), None
         else:
-            return None, Value.illegal_operation(self.pos_start, other.pos_end)
+            return None, self.illegal_operation(other)
 
     def notted(self):
-        return Number(1 if self.value == 0 else 0).set_context(self.context), None
+        return (Number.true if self.value == 0 else Number.false), None
 
     def is_true(self):
         return self.value != 0
 
     def copy(self):
-        copy = Number(self.value)
-        copy.set_pos(self.pos_start, self.pos_end)
-        copy.set_context(self.context)
-        return copy
+        return self
 
     def __repr__(self):
         return str(self.value)
 
 
-Number.null = Number(0)
-Number.true = Number(1)
-Number.false = Number(0)
+# the ints number_of gives shared Numbers for
+SMALL_INT_MIN = -256
+SMALL_INT_MAX = 4096
+
+SMALL_INTS = [Number(value) for value in range(SMALL_INT_MIN, SMALL_INT_MAX + 1)]
+
+
+def number_of(value):
+    # the Number for value , from the pool if it is a small int
+    if type(value) is int and SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+        return SMALL_INTS[value - SMALL_INT_MIN]
+    return Number(value)
+
+
+def operand_error(details):
+    error = RunTimeError(None, None, details, None)
+    error.about_operand = True
+    return error
+
+
+def placed_error(error, node, context):
+    # values don't carry where they were read , so the errors of operations on them
+    # are made without a position or context . the engine places them : at the node
+    # of the operation ( or call ) , at its operand for an error about the right
+    # operand or the only one , in the context it ran in . errors already placed ,
+    # like those of a function called , are left as they are
+    if error.pos_start is None:
+        node_type = type(node)
+        if node_type is UnaryOpNode: node = node.node
+        elif node_type is BinaryOpNode and error.about_operand: node = node.right_node
+        error.pos_start, error.pos_end = node.pos_start, node.pos_end
+    if error.context is None: error.context = context
+    return error
+
+
+Number.null = number_of(0)
+Number.true = number_of(1)
+Number.false = number_of(0)
 Number.MATH_PI = Number(math.pi)
 
 
 class String(Value):
-    def __init__(self, value):
+    # the text is kept as a list of parts and only joined when it is needed ( printed ,
+    # repeated , used as a file name ) , so building a string with + in a loop is
+    # linear instead of quadratic . a string made by + shares the parts list of its
+    # left operand : the first one made from it appends to the list , any later one
+    # copies its share of it first
+    def __init__(self, value, parts=None, part_count=None, length=None):
         super().__init__()
-        self.value = value
+        # None until the parts are joined
+        self.joined = value
+        self.parts = [value] if parts is None else parts
+        self.part_count = len(self.parts) if part_count is None else part_count
+        self.length = len(value) if length is None else length
+
+    @property
+    def value(self):
+        if self.joined is None:
+            self.joined = ''.join(self.parts[:self.part_count])
+            # the joined text stands in for the parts , the shared list is left alone
+            self.parts = [self.joined]
+            self.part_count = 1
+        return self.joined
 
     def added_to(self, other):
         if isinstance(other, String):
-            return String(self.value + other.value).set_context(self.context), None
+            parts = self.parts
+            if len(parts) != self.part_count:
+                parts = parts[:self.part_count]
+            parts.append(other.value)
+            return String(None, parts, len(parts), self.length + other.length).set_context(self.context), None
         else:
-            return None, Value.illegal_operation(self.pos_start,
-                                                 other.pos_end if (other and other.pos_end) else self.pos_end)
+            return None, self.illegal_operation(other)
 
     def multed_by(self, other):
         if isinstance(other, Number):
             return String(self.value * other.value).set_context(self.context), None
         else:
-            return None, Value.illegal_operation(self, other)
+            return None, self.illegal_operation(other)
 
     def is_true(self):
-        return len(self.value) > 0
+        return self.length > 0
 
     def copy(self):
-        copy = String(self.value)
+        copy = String(self.joined, self.parts, self.part_count, self.length)
         copy.set_pos(self.pos_start, self.pos_end)
         copy.set_context(self.context)
         return copy
@@ -1676,7 +2148,7 @@ class List(Value):
             new_list.elements.extend(other.elements)
             return new_list, None
         else:
-            return None, Value.illegal_operation(self, other)
+            return None, self.illegal_operation(other)
 
     def subbed_by(self, other):
         if isinstance(other, Number):
@@ -1685,27 +2157,19 @@ class List(Value):
                 new_list.elements.pop(other.value)
                 return new_list, None
             except:
-                return None, RunTimeError(
-                    other.pos_start, other.pos_end,
-                    f'Element at this index {other.value} Could not be removed from the list ',
-                    self.context
-                )
+                return None, operand_error(f'Element at this index {other.value} Could not be removed from the list ')
         else:
-            return None, Value.illegal_operation(self, other)
+            return None, self.illegal_operation(other)
 
     def dived_by(self, other):
         if isinstance(other, Number):
             try:
                 return self.elements[other.value], None
             except:
-                return None, RunTimeError(
-                    other.pos_start, other.pos_end,
-                    f'Element at this index {other.value} Could not be retrieved  from the list ',
-                    self.context
-                )
+                return None, operand_error(f'Element at this index {other.value} Could not be retrieved  from the list ')
 
         else:
-            return None, Value.illegal_operation(self, other)
+            return None, self.illegal_operation(other)
 
     def copy(self):
         copy = List(self.elements)
@@ -1713,8 +2177,184 @@ class List(Value):
         copy.set_context(self.context)
         return copy
 
+    def length(self):
+        return len(self.elements)
+
+    def __iter__(self):
+        return iter(self.elements)
+
+    def __repr__(self):
+        return f'[{", ".join([str(x) for x in self])} ]'
+
+
+class Range(List):
+    # the numbers of FOR I = .. TO .. THEN I , or of RANGE , kept as a python range :
+    # LEN , / and going through them make no more than the Numbers asked for .
+    # whatever needs the elements themselves , to change or copy them , makes them
+    # once , and from then on it is a List like any other
+    def __init__(self, numbers):
+        Value.__init__(self)
+        self.numbers = numbers
+        self.made = None
+
+    @property
+    def elements(self):
+        if self.made is None: self.made = [number_of(i) for i in self.numbers]
+        return self.made
+
+    @elements.setter
+    def elements(self, elements):
+        self.made = elements
+
+    def dived_by(self, other):
+        if self.made is not None or not isinstance(other, Number): return super().dived_by(other)
+        try:
+            return number_of(self.numbers[other.value]), None
+        except:
+            return None, operand_error(f'Element at this index {other.value} Could not be retrieved  from the list ')
+
+    def length(self):
+        return len(self.numbers) if self.made is None else len(self.made)
+
+    def __iter__(self):
+        return map(number_of, self.numbers) if self.made is None else iter(self.made)
+
+
+def loop_range(start, end, step):
+    # the values of a FOR variable , a range when they are all ints
+    if type(start) is int and type(end) is int and type(step) is int:
+        return range(start, end, step)
+    return stepped_range(start, end, step)
+
+
+def stepped_range(i, end, step):
+    while (i > end) if step < 0 else (i < end):
+        yield i
+        i += step
+
+
+def range_value(start, end, step):
+    # the numbers from start by step up to end , a Range when they are ints
+    numbers = loop_range(start, end, step)
+    if type(numbers) is range: return Range(numbers)
+    return List([number_of(i) for i in numbers])
+
+
+def is_range_loop(node):
+    # FOR I = .. TO .. THEN I , whose value is just the numbers I goes through
+    body_node = node.body_node
+    return (not node.should_return_null and type(body_node) is VarAccessNode
+            and body_node.var_name_token.value == node.var_name_token.value)
+
+
+def range_loop(symbol_table, var_name, start, end, step):
+    # the value of a range loop , without running its body : var_name is left at the
+    # last of the numbers , as the loop leaves it
+    value = range_value(start, end, step)
+    if value.length(): symbol_table.set(var_name, value.dived_by(number_of(-1))[0])
+    return value
+
+
+# the ints a Vector holds , numpy int64
+VECTOR_INT_MIN = -2 ** 63
+VECTOR_INT_MAX = 2 ** 63 - 1
+
+# the ufuncs whose int results can leave the int64 range
+INT_OVERFLOWING_UFUNCS = frozenset(('add', 'subtract', 'multiply', 'power'))
+
+
+def int_overflow(ufunc_name, left, right):
+    # whether the int64 ufunc wrapped around somewhere . a float pass bounds every
+    # result , python ints settle the ones that come near the edge
+    with numpy.errstate(all='ignore'):
+        floats = getattr(numpy, ufunc_name)(numpy.asarray(left, dtype=float), numpy.asarray(right, dtype=float))
+        bound = numpy.max(numpy.abs(floats), initial=0)
+    if bound < 2 ** 62: return False
+    if not bound <= 2 ** 64: return True
+    exact = getattr(numpy, ufunc_name)(numpy.asarray(left, dtype=object), numpy.asarray(right, dtype=object))
+    return not all(VECTOR_INT_MIN <= value <= VECTOR_INT_MAX for value in exact.tolist())
+
+
+class Vector(Value):
+    # numbers in a numpy array : an operator between it and a Vector or a Number is one
+    # numpy call over all of them , the Number standing for every element . VECTOR
+    # makes one out of a List , LIST turns it back . ints are int64 , where Numbers
+    # have no bound , so an int result that doesn't fit is an error , not wrapped
+    def __init__(self, array):
+        super().__init__()
+        self.array = array
+
+    def operated(self, ufunc_name, other, swapped=False):
+        # the numpy ufunc on this and other , swapped when this was the right operand
+        if isinstance(other, Vector): other_array = other.array
+        elif isinstance(other, Number): other_array = other.value
+        else: return None, self.illegal_operation(other)
+
+        left, right = (other_array, self.array) if swapped else (self.array, other_array)
+        if ufunc_name == 'true_divide' and numpy.any(numpy.equal(right, 0)):
+            return None, operand_error('Division By Zero')
+        if ufunc_name == 'power' and numpy.any(numpy.less(right, 0)):
+            # numpy won't raise ints to negative ints , python gives floats
+            left = numpy.asarray(left, dtype=float)
+
+        try:
+            with numpy.errstate(all='ignore'):
+                array = getattr(numpy, ufunc_name)(left, right)
+        except ValueError:
+            return None, operand_error(f'Vectors of sizes {numpy.size(left)} and {numpy.size(right)} do not match')
+        except OverflowError:
+            return None, RunTimeError(None, None, 'Number too big for a vector', None)
+
+        if array.dtype.kind == 'i' and ufunc_name in INT_OVERFLOWING_UFUNCS and int_overflow(ufunc_name, left, right):
+            return None, RunTimeError(None, None, 'Vector elements out of the int64 range', None)
+        # comparisons give bools , a Vector holds the 1 and 0 the Numbers would
+        if array.dtype.kind == 'b': array = array.astype(int)
+        return Vector(array), None
+
+    def added_to(self, other):
+        return self.operated('add', other)
+
+    def subbed_by(self, other):
+        return self.operated('subtract', other)
+
+    def multed_by(self, other):
+        return self.operated('multiply', other)
+
+    def dived_by(self, other):
+        return self.operated('true_divide', other)
+
+    def powed_by(self, other):
+        return self.operated('power', other)
+
+    def get_comparison_eq(self, other):
+        return self.operated('equal', other)
+
+    def get_comparison_ne(self, other):
+        return self.operated('not_equal', other)
+
+    def get_comparison_lt(self, other):
+        return self.operated('less', other)
+
+    def get_comparison_lte(self, other):
+        return self.operated('less_equal', other)
+
+    def get_comparison_gt(self, other):
+        return self.operated('greater', other)
+
+    def get_comparison_gte(self, other):
+        return self.operated('greater_equal', other)
+
+    def length(self):
+        return len(self.array)
+
+    def copy(self):
+        copy = Vector(self.array)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
     def __repr__(self):
-        return f'[{", ".join([str(x) for x in self.elements])} ]'
+        return f'<vector {numpy.array2string(self.array, separator=", ")}>'
 
 
 class BaseFunction(Value):
@@ -1728,35 +2368,37 @@ class BaseFunction(Value):
         new_context.symbol_table = SymbolTable(new_context.parent.symbol_table)
         return new_context
 
-    def check_args(self, arg_names, args):
-        res = RunTimeResult()
+    def arg_count_error(self, arg_names, args):
         if len(args) > len(arg_names):
-            return res.failure(RunTimeError(
+            return RunTimeError(
                 self.pos_start, self.pos_end,
                 f"{len(args) - len(arg_names)}  too many args passed into '{self.name}' ",
                 self.context
-            ))
+            )
         if len(args) < len(arg_names):
-            return res.failure(RunTimeError(
+            return RunTimeError(
                 self.pos_start, self.pos_end,
                 f"{len(arg_names) - len(args)} too few args passed into '{self.name}' ",
                 self.context
-            ))
-        return res.success(None)
+            )
+        return None
+
+    def recursion_error(self):
+        # the call of this function went deeper than the python stack does , the
+        # error is at the call , with the calls around it for a traceback
+        return RunTimeError(self.pos_start, self.pos_end, 'Maximum recursion depth exceeded', self.context)
+
+    def check_args(self, arg_names, args):
+        error = self.arg_count_error(arg_names, args)
+        if error: raise ErrorSignal(error)
 
     def populate_args(self, arg_names, args, execution_context):
         for i in range(len(args)):
-            arg_name = arg_names[i]
-            arg_value = args[i]
-            arg_value.set_context(execution_context)
-            execution_context.symbol_table.set(arg_name, arg_value)
+            execution_context.symbol_table.set(arg_names[i], args[i])
 
     def check_and_populate_args(self, arg_names, args, execution_context):
-        res = RunTimeResult()
-        res.register(self.check_args(arg_names, args))
-        if res.should_return(): return res
+        self.check_args(arg_names, args)
         self.populate_args(arg_names, args, execution_context)
-        return res.success(None)
 
 
 class Function(BaseFunction):
@@ -1768,18 +2410,54 @@ class Function(BaseFunction):
         self.arg_names = arg_names
 
     def execute(self, args):
-        res = RunTimeResult()
-        interpreter = Interpreter()
+        # the value of the call , or BREAK / CONTINUE for a break / continue leaving
+        # it for the loop around the call . errors are raised
+        function = self
         execution_context = self.generate_new_context()
 
-        res.register(self.check_and_populate_args(self.arg_names, args, execution_context))
-        if res.should_return(): return res
+        while True:
+            function.check_and_populate_args(function.arg_names, args, execution_context)
+
+            try:
+                return_value = function.run_body(execution_context)
+            except RecursionError:
+                raise ErrorSignal(function.recursion_error())
+            if type(return_value) is not TailCall: return return_value
+
+            # a call in tail position , made here so the python stack stays flat . the
+            # frame of this call is done with , and with scoping being dynamic only
+            # the running calls can see it : a function calling itself gets it back ,
+            # any other takes it over , so the chain doesn't grow with the calls
+            callee, args = return_value.function, return_value.args
+            if not (callee.body_node is function.body_node and callee.context is execution_context):
+                execution_context = callee.generate_tail_context(execution_context)
+            function = callee
+
+    def generate_tail_context(self, caller_context):
+        # the context of a call in tail position , made from that of the finished call
+        # making it : the symbol table is kept , the names of the caller are still seen
+        # by the callee as they would be one level up , and the callee is entered from
+        # where the caller was
+        new_context = Context(self.name, caller_context.parent, caller_context.parent_entry_pos)
+        new_context.symbol_table = caller_context.symbol_table
+        return new_context
+
+    def run_body(self, execution_context):
+        # what execute gives , or a TailCall
+        return self.visit_body(Interpreter(), execution_context)
 
-        value = res.register(interpreter.visit(self.body_node, execution_context))
-        if res.should_return() and res.func_return_value==None: return res
+    def visit_body(self, interpreter, execution_context):
+        value = interpreter.visit(self.body_node, execution_context)
+        if value is RETURN: return interpreter.return_value
+        if value is BREAK or value is CONTINUE: return value
+        return (value if self.should_auto_return else None) or Number.null
 
-        return_value = (value if self.should_auto_return else  None) or res.func_return_value or Number.null
-        return res.success(return_value)
+    def body_result(self, res):
+        # run_body for the RunTimeResult of a body that ran on another engine
+        if res.error: raise ErrorSignal(res.error)
+        if res.loop_should_break: return BREAK
+        if res.loop_should_continue: return CONTINUE
+        return (res.value if self.should_auto_return else None) or res.func_return_value or Number.null
 
     def copy(self):
         copy = Function(self.name, self.body_node, self.arg_names,self.should_auto_return)
@@ -1791,20 +2469,129 @@ class Function(BaseFunction):
         return f"<Function {self.name}>"
 
 
+class TailCall:
+    # what a call in tail position gives the Function.execute running the body it is in
+    def __init__(self, function, args):
+        self.function = function
+        self.args = args
+
+
+class CompiledFunction(Function):
+    # a function defined by code running on the VirtualMachine , its body is bytecode too
+    def __init__(self, name, body_node, arg_names, should_auto_return, bytecode):
+        super().__init__(name, body_node, arg_names, should_auto_return)
+        self.bytecode = bytecode
+
+    def run_body(self, execution_context):
+        return self.body_result(VirtualMachine().run(self.bytecode, execution_context))
+
+    def copy(self):
+        copy = CompiledFunction(self.name, self.body_node, self.arg_names, self.should_auto_return, self.bytecode)
+        copy.set_context(self.context)
+        copy.set_pos(self.pos_start, self.pos_end)
+        return copy
+
+
+class SlotFunction(Function):
+    # a function defined by code on the SlotInterpreter , each call gets a Frame
+    def __init__(self, name, body_node, arg_names, should_auto_return, slot_of):
+        super().__init__(name, body_node, arg_names, should_auto_return)
+        self.slot_of = slot_of
+
+    def generate_new_context(self):
+        new_context = Context(self.name, self.context, self.pos_start)
+        new_context.symbol_table = Frame(self.slot_of, new_context.parent.symbol_table)
+        return new_context
+
+    def generate_tail_context(self, caller_context):
+        symbol_table = caller_context.symbol_table
+        if type(symbol_table) is Frame and symbol_table.slot_of is self.slot_of:
+            return super().generate_tail_context(caller_context)
+        # a Frame has the slots of one function , the names of the caller move to a new one
+        new_context = Context(self.name, caller_context.parent, caller_context.parent_entry_pos)
+        new_context.symbol_table = Frame(self.slot_of, symbol_table.parent)
+        for name, value in symbol_table.symbols.items():
+            new_context.symbol_table.set(name, value)
+        return new_context
+
+    def populate_args(self, arg_names, args, execution_context):
+        # the args are all slots
+        values, slot_of = execution_context.symbol_table.values, self.slot_of
+        for i in range(len(args)):
+            values[slot_of[arg_names[i]]] = args[i]
+
+    def run_body(self, execution_context):
+        return self.visit_body(SlotInterpreter(), execution_context)
+
+    def copy(self):
+        copy = SlotFunction(self.name, self.body_node, self.arg_names, self.should_auto_return, self.slot_of)
+        copy.set_context(self.context)
+        copy.set_pos(self.pos_start, self.pos_end)
+        return copy
+
+
+class ClosureFunction(Function):
+    # a function defined by code from the ClosureCompiler or the Transpiler , its
+    # body is a python callable taking the context , that raises the closure signals
+    def __init__(self, name, body_node, arg_names, should_auto_return, body):
+        super().__init__(name, body_node, arg_names, should_auto_return)
+        self.body = body
+
+    def run_body(self, execution_context):
+        try:
+            value = self.body(execution_context)
+        except ReturnSignal as signal:
+            return signal.value
+        except BreakSignal:
+            return BREAK
+        except ContinueSignal:
+            return CONTINUE
+        return value if self.should_auto_return else Number.null
+
+    def call(self, args):
+        # execute() for other closures : break / continue raised as well
+        function = self
+        execution_context = self.generate_new_context()
+
+        while True:
+            if len(args) != len(function.arg_names):
+                raise ErrorSignal(function.arg_count_error(function.arg_names, args))
+            function.populate_args(function.arg_names, args, execution_context)
+
+            try:
+                value = function.body(execution_context)
+            except ReturnSignal as signal:
+                value = signal.value
+            except RecursionError:
+                raise ErrorSignal(function.recursion_error())
+            else:
+                if not function.should_auto_return: return Number.null
+            if type(value) is not TailCall: return value
+
+            # as in Function.execute
+            callee, args = value.function, value.args
+            if callee.body_node is not function.body_node:
+                execution_context = callee.generate_tail_context(execution_context)
+            function = callee
+
+    def copy(self):
+        copy = ClosureFunction(self.name, self.body_node, self.arg_names, self.should_auto_return, self.body)
+        copy.set_context(self.context)
+        copy.set_pos(self.pos_start, self.pos_end)
+        return copy
+
+
 class BuiltInFunction(BaseFunction):
     def __init__(self, name):
         super().__init__(name)
 
     def execute(self, args):
-        res = RunTimeResult()
+        # the execute_ methods give their value , errors are raised
         execution_context = self.generate_new_context()
         method_name = f'execute_{self.name}'
         method = getattr(self, method_name, self.no_visit_method)
-        res.register(self.check_and_populate_args(method.arg_names, args, execution_context))
-        if res.should_return(): return res
-        ret = res.register(method(execution_context))
-        if res.should_return(): return res
-        return res.success(ret)
+        self.check_and_populate_args(method.arg_names, args, execution_context)
+        return method(execution_context)
 
     def no_visit_method(self, node, context):
         raise Exception(f'No execute_{self.name} methoud defined ')
@@ -1820,18 +2607,18 @@ class BuiltInFunction(BaseFunction):
 
     def execute_print(self, execution_context):
         # print(str(execution_context.symbol_table.get('value')))
-        return RunTimeResult().success(Number.null)
+        return Number.null
 
     execute_print.arg_names = ['value']
 
     def execute_print_return(self, execution_context):
-        return RunTimeResult().success(String(str(execution_context.symbol_table.get('value'))))
+        return String(str(execution_context.symbol_table.get('value')))
 
     execute_print_return.arg_names = ['value']
 
     def execute_input(self, execution_context):
         text = input()
-        return RunTimeResult().success(String(text))
+        return String(text)
 
     execute_input.arg_names = []
 
@@ -1844,37 +2631,37 @@ class BuiltInFunction(BaseFunction):
             except ValueError:
                 print(f"{text} must be an integer")
 
-        return RunTimeResult().success(Number(number))
+        return number_of(number)
 
     execute_input_int.arg_names = []
 
     def execute_clear(self, execution_context):
         os.system('cls' if os.name == 'nt' else 'clear')
-        return RunTimeResult().success(Number.null)
+        return Number.null
 
     execute_clear.arg_names = []
 
     def execute_is_number(self, execution_context):
         is_number = isinstance(execution_context.symbol_table.get('value'), Number)
-        return RunTimeResult().success(Number.true if is_number else Number.false)
+        return Number.true if is_number else Number.false
 
     execute_is_number.arg_names = ['value']
 
     def execute_is_string(self, execution_context):
         is_string = isinstance(execution_context.symbol_table.get("value"), String)
-        return RunTimeResult().success(Number.true if is_string else Number.false)
+        return Number.true if is_string else Number.false
 
     execute_is_string.arg_names = ['value']
 
     def execute_is_list(self, execution_context):
         is_list = isinstance(execution_context.symbol_table.get('value'), List)
-        return RunTimeResult().success(Number.true if is_list else Number.false)
+        return Number.true if is_list else Number.false
 
     execute_is_list.arg_names = ['value']
 
     def execute_is_function(self, execution_context):
         is_function = isinstance(execution_context.symbol_table.get("value"), BaseFunction)
-        return RunTimeResult().success(Number.true if is_function else Number.false)
+        return Number.true if is_function else Number.false
 
     execute_is_function.arg_names = ['value']
 
@@ -1883,29 +2670,28 @@ class BuiltInFunction(BaseFunction):
         value = execution_context.symbol_table.get('value')
 
         if not isinstance(list_, List):
-            return RunTimeResult().failure(RunTimeError(
+            raise ErrorSignal(RunTimeError(
                 self.pos_start, self.pos_end,
                 "First argument must be list",
                 execution_context
             ))
         list_.elements.append(value)
-        return RunTimeResult().success(Number.null)
+        return Number.null
 
     execute_append.arg_names = ['list', 'value']
 
     def execute_pop(self, execution_context):
         list_ = execution_context.symbol_table.get('list')
         index = execution_context.symbol_table.get("index")
-        res = RunTimeResult()
         if not isinstance(list_, List):
-            return res.failure(RunTimeError(
+            raise ErrorSignal(RunTimeError(
                 self.pos_start, self.pos_end,
                 "First Argument must be a list",
                 execution_context
             ))
 
         if not isinstance(index, Number):
-            return res.failure(RunTimeError(
+            raise ErrorSignal(RunTimeError(
                 self.pos_start, self.pos_end,
                 "Second Argument must be a number",
                 execution_context
@@ -1914,44 +2700,42 @@ class BuiltInFunction(BaseFunction):
         try:
             element = list_.elements.pop()
         except:
-            return res.failure(RunTimeError(
+            raise ErrorSignal(RunTimeError(
                 self.pos_start, self.pos_end,
                 "Indexing Out Of Bound"
             ))
 
-        return res.success(element)
+        return element
 
     execute_pop.arg_names = ['list', 'index']
 
     def execute_extend(self, execution_context):
         list1 = execution_context.symbol_table.get("list1")
         list2 = execution_context.symbol_table.get("list2")
-        res = RunTimeResult()
 
         if not isinstance(list1, List):
-            return res.failure(RunTimeError(
+            raise ErrorSignal(RunTimeError(
                 self.pos_start, self.pos_end,
                 "First Argument must be a list",
                 execution_context
             ))
 
         if not isinstance(list2, List):
-            return res.failure(RunTimeError(
+            raise ErrorSignal(RunTimeError(
                 self.pos_start, self.pos_end,
                 "Second Argument must be a list",
                 execution_context
             ))
 
         list1.elements.extend(list2.elements)
-        return res.success(Number.null)
+        return Number.null
 
     execute_extend.arg_names = ['list1', 'list2']
 
     def execute_run(self,execution_context):
-        res = RunTimeResult()
         fn = execution_context.symbol_table.get("fn")
         if not isinstance(fn,String):
-            return res.failure(RunTimeError(
+            raise ErrorSignal(RunTimeError(
                 self.pos_start,self.pos_end,
                 "Argument must be a string",
                 execution_context
@@ -1964,7 +2748,7 @@ class BuiltInFunction(BaseFunction):
                 script = file.read()
                 # print(script)
         except Exception as e :
-            return res.failure(
+            raise ErrorSignal(
                 RunTimeError(
                     self.pos_start, self.pos_end,
                     f"Failed to load script \"  {fn} \" \n {str(e)} \n",
@@ -1972,17 +2756,20 @@ class BuiltInFunction(BaseFunction):
                 )
             )
 
-        _,error = run(fn,script)
+        # the script runs on the engine the program calling RUN does
+        program_context = execution_context
+        while program_context.parent: program_context = program_context.parent
+        _,error = run(fn,script, program_context.engine)
         # print(error)
         # print(_)
         if error :
-            return res.failure(RunTimeError(
+            raise ErrorSignal(RunTimeError(
                 self.pos_start, self.pos_end,
                 f"Failed to finish executing script \"{fn} \" \n"  + error.as_string(),
                 execution_context
             ))
 
-        return res.success(Number.null)
+        return Number.null
 
 
     execute_run.arg_names = ['fn']
@@ -1990,18 +2777,137 @@ class BuiltInFunction(BaseFunction):
 
     def execute_len(self,execution_context):
         list_ = execution_context.symbol_table.get("list")
-        res = RunTimeResult()
-        if not isinstance(list_ , List) :
-            return res.error(RunTimeError(
+        if not isinstance(list_ , (List, Vector)) :
+            raise ErrorSignal(RunTimeError(
                 self.pos_start,self.pos_end,
-                "Argument must be a list",
+                "Argument must be a list or a vector",
                 execution_context
             ))
 
-        return res.success(Number(len(list.elements)))
+        return number_of(list_.length())
 
     execute_len.arg_names = ["list"]
 
+    def execute_range(self, execution_context):
+        start = execution_context.symbol_table.get('start')
+        end = execution_context.symbol_table.get('end')
+        if not isinstance(start, Number) or not isinstance(end, Number):
+            raise ErrorSignal(RunTimeError(
+                self.pos_start, self.pos_end,
+                "Arguments must be numbers",
+                execution_context
+            ))
+
+        # counting up or down like a FOR without a STEP
+        step = 1 if start.value < end.value else -1
+        return range_value(start.value, end.value, step)
+
+    execute_range.arg_names = ['start', 'end']
+
+    def execute_list(self, execution_context):
+        list_ = execution_context.symbol_table.get('list')
+        if isinstance(list_, Vector):
+            return List([number_of(value) for value in list_.array.tolist()])
+
+        if not isinstance(list_, List):
+            raise ErrorSignal(RunTimeError(
+                self.pos_start, self.pos_end,
+                "Argument must be a list or a vector",
+                execution_context
+            ))
+
+        # a List of its own , the elements of a Range made here
+        return List(list(list_))
+
+    execute_list.arg_names = ['list']
+
+    def execute_vector(self, execution_context):
+        list_ = execution_context.symbol_table.get('list')
+        if numpy is None:
+            raise ErrorSignal(RunTimeError(
+                self.pos_start, self.pos_end,
+                "VECTOR needs numpy , which is not installed",
+                execution_context
+            ))
+
+        if not isinstance(list_, List):
+            raise ErrorSignal(RunTimeError(
+                self.pos_start, self.pos_end,
+                "Argument must be a list",
+                execution_context
+            ))
+
+        if type(list_) is Range and list_.made is None:
+            numbers = list_.numbers
+            if numbers and not VECTOR_INT_MIN <= min(numbers[0], numbers[-1]) <= max(numbers[0], numbers[-1]) <= VECTOR_INT_MAX:
+                raise ErrorSignal(RunTimeError(
+                    self.pos_start, self.pos_end,
+                    "Elements of the list are too big for a vector",
+                    execution_context
+                ))
+            try:
+                return Vector(numpy.arange(numbers.start, numbers.stop, numbers.step, dtype=numpy.int64))
+            except OverflowError:
+                # a stop past the int64 range , the numbers themselves fit
+                return Vector(numpy.fromiter(numbers, dtype=numpy.int64, count=len(numbers)))
+
+        if not all(type(element) is Number for element in list_):
+            raise ErrorSignal(RunTimeError(
+                self.pos_start, self.pos_end,
+                "Elements of the list must be numbers",
+                execution_context
+            ))
+
+        # an empty one holds ints , so its SUM is the int 0
+        array = numpy.array([element.value for element in list_], dtype=None if list_.length() else numpy.int64)
+        if array.dtype.kind not in 'if':
+            raise ErrorSignal(RunTimeError(
+                self.pos_start, self.pos_end,
+                "Elements of the list are too big for a vector",
+                execution_context
+            ))
+        return Vector(array)
+
+    execute_vector.arg_names = ['list']
+
+    def vector_argument(self, execution_context, may_be_empty=False):
+        # the Vector a reduction is over , raising if it isn't one , or has nothing in it
+        # for a reduction without a value then
+        vector = execution_context.symbol_table.get('vector')
+        if not isinstance(vector, Vector):
+            raise ErrorSignal(RunTimeError(
+                self.pos_start, self.pos_end,
+                "Argument must be a vector",
+                execution_context
+            ))
+
+        if not may_be_empty and not vector.length():
+            raise ErrorSignal(RunTimeError(
+                self.pos_start, self.pos_end,
+                "Vector is empty",
+                execution_context
+            ))
+        return vector
+
+    def execute_sum(self, execution_context):
+        array = self.vector_argument(execution_context, may_be_empty=True).array
+        if array.dtype.kind == 'i' and numpy.abs(array.astype(float)).sum() >= 2 ** 62:
+            # an int64 sum could wrap around , python ints don't
+            return number_of(sum(array.tolist()))
+        return number_of(array.sum().item())
+
+    execute_sum.arg_names = ['vector']
+
+    def execute_mean(self, execution_context):
+        return number_of(self.vector_argument(execution_context).array.mean().item())
+
+    execute_mean.arg_names = ['vector']
+
+    def execute_max(self, execution_context):
+        return number_of(self.vector_argument(execution_context).array.max().item())
+
+    execute_max.arg_names = ['vector']
+
 BuiltInFunction.print = BuiltInFunction("print")
 BuiltInFunction.print_return = BuiltInFunction("print_return")
 BuiltInFunction.input = BuiltInFunction("input")
@@ -2016,218 +2922,283 @@ BuiltInFunction.pop = BuiltInFunction("pop")
 BuiltInFunction.extend = BuiltInFunction("extend")
 BuiltInFunction.run = BuiltInFunction("run")
 BuiltInFunction.len = BuiltInFunction("len")
+BuiltInFunction.range = BuiltInFunction("range")
+BuiltInFunction.list = BuiltInFunction("list")
+BuiltInFunction.vector = BuiltInFunction("vector")
+BuiltInFunction.sum = BuiltInFunction("sum")
+BuiltInFunction.mean = BuiltInFunction("mean")
+BuiltInFunction.max = BuiltInFunction("max")
+
+
+# what an operator computes from the values of two Numbers , / is left to
+# Number.dived_by for its check of zero
+NUMBER_OPERATIONS = {
+    TT_PLUS: operator.add,
+    TT_MINUS: operator.sub,
+    TT_MUL: operator.mul,
+    TT_POW: operator.pow,
+    TT_EE: lambda left, right: int(left == right),
+    TT_NEQ: lambda left, right: int(left != right),
+    TT_LT: lambda left, right: int(left < right),
+    TT_LTE: lambda left, right: int(left <= right),
+    TT_GT: lambda left, right: int(left > right),
+    TT_GTE: lambda left, right: int(left >= right),
+    TT_AND: lambda left, right: int(left and right),
+    TT_OR: lambda left, right: int(left or right),
+}
+
+
+def number_handler(number_operation):
+    def handler(left, right):
+        return number_of(number_operation(left.value, right.value)), None
+    return handler
+
+
+NUMBER_HANDLERS = {op_type: number_handler(number_operation) for op_type, number_operation in NUMBER_OPERATIONS.items()}
+
+
+class OperationCache:
+    # every BinaryOpNode keeps the types of the operands it saw last and the
+    # function it called for them , a handler taking ( left , right ) and giving
+    # ( result , error ) : the raw python operation for two Numbers , the Value
+    # method otherwise . the Interpreter calls it directly while the types stay
+    # the same and comes here when they change . hits and misses are counted
+    # over all the nodes , a low hit rate means operators seeing mixed types
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
 
+    def miss(self, node, left, right):
+        self.misses += 1
+        node.left_type, node.right_type = type(left), type(right)
+        handler = None
+        if node.left_type is Number and node.right_type is Number:
+            handler = NUMBER_HANDLERS.get(node.op_token.type)
+        node.handler = handler or getattr(node.left_type, node.operation)
+        return node.handler(left, right)
 
-class Interpreter:
-    def visit(self, node, context):
-        # visit binaryopnode -- uniopnode
-
-        method_name = f'visit_{type(node).__name__}'
-
-        method = getattr(self, method_name, self.no_visit_method)
-        # this is for getting a method in the object from a string and takes the default method if no method was found
-        return method(node, context)
-
-    def no_visit_method(self, node, context):
-        raise Exception(f'no visit_{type(node).__name__} method defined')
-
-    def visit_NumberNode(self, node, context):
-        return RunTimeResult().success(
-            Number(node.token.value).set_context(context).set_pos(node.pos_start, node.pos_end))
-
-        # print("Found number node!")
-
-    def visit_BinaryOpNode(self, node, context):
-        res = RunTimeResult()
-        result = error = None
-        left = res.register(self.visit(node.left_node, context))
-        right = res.register(self.visit(node.right_node, context))
-        if res.should_return(): return res
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
 
-        if node.op_token.type == TT_PLUS:
-            result, error = left.added_to(right)
+    def clear(self):
+        self.hits = 0
+        self.misses = 0
 
-        elif node.op_token.type == TT_MINUS:
-            result, error = left.subbed_by(right)
 
-        elif node.op_token.type == TT_MUL:
-            result, error = left.multed_by(right)
+operation_cache = OperationCache()
 
-        elif node.op_token.type == TT_DIV:
-            result, error = left.dived_by(right)
 
-        elif node.op_token.type == TT_POW:
-            result, error = left.powed_by(right)
+class Interpreter:
+    # node class -> visit method , filled in the first time a node class comes up .
+    # each subclass gets its own , so its overrides are the ones found
+    handlers = {}
 
-        elif node.op_token.type == TT_EE:
-            result, error = left.get_comparison_eq(right)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.handlers = {}
 
-        elif node.op_token.type == TT_NEQ:
-            result, error = left.get_comparison_ne(right)
+    def visit(self, node, context):
+        handler = self.handlers.get(type(node))
+        if handler is None: handler = self.add_handler(type(node))
+        return handler(self, node, context)
 
+    def add_handler(self, node_class):
+        interpreter_class = type(self)
+        handler = getattr(interpreter_class, f'visit_{node_class.__name__}', interpreter_class.no_visit_method)
+        interpreter_class.handlers[node_class] = handler
+        return handler
 
-        elif node.op_token.type == TT_LT:
-            result, error = left.get_comparison_lt(right)
+    def no_visit_method(self, node, context):
+        raise Exception(f'no visit_{type(node).__name__} method defined')
 
-        elif node.op_token.type == TT_LTE:
-            result, error = left.get_comparison_lte(right)
+    def run(self, node, context):
+        # the RunTimeResult for a whole tree , what run() gets from an engine
+        res = RunTimeResult()
+        try:
+            value = self.visit(node, context)
+        except ErrorSignal as signal:
+            return res.failure(signal.error)
+        if value is RETURN: return res.success_return(self.return_value)
+        if value is BREAK: return res.success_break()
+        if value is CONTINUE: return res.success_continue()
+        return res.success(value)
 
+    # every visit gives the value of its node , or a Signal it passes up , and
+    # raises ErrorSignal for an error
 
-        elif node.op_token.type == TT_GT:
-            result, error = left.get_comparison_gt(right)
+    def visit_NumberNode(self, node, context):
+        return number_of(node.token.value)
 
+        # print("Found number node!")
 
-        elif node.op_token.type == TT_GTE:
-            result, error = left.get_comparison_gte(right)
+    def visit_BinaryOpNode(self, node, context):
+        # a whole tree of operators is walked with an explicit stack , so long chains
+        # and deep nesting don't hit the recursion limit . an operator node is pushed
+        # again with operands_done set once its operands are on the stack of values
+        values = []
+        stack = [(node, False)]
+        while stack:
+            node, operands_done = stack.pop()
+            node_type = type(node)
+            if operands_done:
+                if node_type is BinaryOpNode:
+                    right = values.pop()
+                    left = values.pop()
+                    if type(left) is node.left_type and type(right) is node.right_type:
+                        operation_cache.hits += 1
+                        result, error = node.handler(left, right)
+                    else:
+                        result, error = operation_cache.miss(node, left, right)
+                    if error: raise ErrorSignal(placed_error(error, node, context))
+                    values.append(result.set_pos(node.pos_start, node.pos_end).set_context(context))
+                else:
+                    result, error = self.unary_operation(node.op_token.type, values.pop())
+                    if error: raise ErrorSignal(placed_error(error, node, context))
+                    values.append(result.set_pos(node.pos_start, node.pos_end))
+            elif node_type is BinaryOpNode:
+                stack.append((node, True))
+                stack.append((node.right_node, False))
+                stack.append((node.left_node, False))
+            elif node_type is UnaryOpNode:
+                stack.append((node, True))
+                stack.append((node.node, False))
+            else:
+                value = self.visit(node, context)
+                if type(value) is Signal: return value
+                values.append(value)
 
-        elif node.op_token.matches(TT_KEYWORD, "and"):
-            result, error = left.anded_by(right)
+        return values.pop()
 
-        elif node.op_token.matches(TT_KEYWORD, "or"):
-            result, error = left.ored_by(right)
+    visit_UnaryOpNode = visit_BinaryOpNode
 
-        if error:
-            return res.failure(error)
-        else:
-            return res.success(result.set_pos(node.pos_start, node.pos_end).set_context(context))
-
-    def visit_UnaryOpNode(self, node, context):
-        res = RunTimeResult()
-        number = res.register(self.visit(node.node, context))
-        if res.should_return(): return res
+    def unary_operation(self, op_type, number):
         error = None
-        if node.op_token.type == TT_MINUS:
-            number, error = number.multed_by(Number(-1))
+        if op_type == TT_MINUS:
+            number, error = number.multed_by(number_of(-1))
 
-        elif node.op_token.matches(TT_KEYWORD, "not"):
+        elif op_type == TT_NOT:
             number, error = number.notted()
 
-        if error:
-            return res.failure(error)
-        else:
-            return res.success(number.set_pos(node.pos_start, node.pos_end))
+        return number, error
 
     def visit_VarAccessNode(self, node, context):
-        res = RunTimeResult()
         var_name = node.var_name_token.value
         value = context.symbol_table.get(var_name)
         if not value:
-            return res.failure(RunTimeError(
+            raise ErrorSignal(RunTimeError(
                 node.pos_start, node.pos_end,
                 f'{var_name} is not defined ',
                 context
             ))
-        value = value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
-
-        return res.success(value)
+        # the value itself , where it was read matters only to errors , which get it from the node
+        return value
 
     def visit_VarAssignNode(self, node, context):
-        res = RunTimeResult()
         var_name = node.var_name_token.value
-        value = res.register(self.visit(node.value_node, context))
-        if res.should_return(): return res
+        value = self.visit(node.value_node, context)
+        if type(value) is Signal: return value
         context.symbol_table.set(var_name, value)
-        return res.success(value)
+        return value
 
     def visit_IfNode(self, node, context):
-        res = RunTimeResult()
         for condition, expr ,should_return_null  in node.cases:
-            condition_value = res.register(self.visit(condition, context))
-            if res.should_return(): return res
+            condition_value = self.visit(condition, context)
+            if type(condition_value) is Signal: return condition_value
             if condition_value.is_true():
-                expr_value = res.register(self.visit(expr, context))
-                if res.should_return(): return res
-                return res.success(Number.null if should_return_null else expr_value)
+                expr_value = self.visit(expr, context)
+                if type(expr_value) is Signal: return expr_value
+                return Number.null if should_return_null else expr_value
 
         if node.else_case:
             expr , should_return_null = node.else_case
-            else_value = res.register(self.visit(expr, context))
-            if res.should_return(): return res
-            return res.success(Number.null if should_return_null else else_value)
+            else_value = self.visit(expr, context)
+            if type(else_value) is Signal: return else_value
+            return Number.null if should_return_null else else_value
 
-        return res.success(Number.null)
+        return Number.null
 
     def visit_ForNode(self, node, context):
-        res = RunTimeResult()
-
-        elements = []
-        start_value = res.register(self.visit(node.start_value_node, context))
-        if res.should_return(): return res
+        # None for a loop whose value is thrown away , it keeps nothing
+        elements = None if node.should_return_null else []
+        start_value = self.visit(node.start_value_node, context)
+        if type(start_value) is Signal: return start_value
 
-        end_value = res.register(self.visit(node.end_value_node, context))
-        if res.should_return(): return res
+        end_value = self.visit(node.end_value_node, context)
+        if type(end_value) is Signal: return end_value
 
         # body = res.register(self.visit(node.body_node,context))
         # if res.error : return res
 
         if node.step_value_node:
-            step = res.register(self.visit(node.step_value_node, context))
-            if res.should_return(): return res
+            step = self.visit(node.step_value_node, context)
+            if type(step) is Signal: return step
         else:
             # wihtout this we can exit right away from the while loop
 
-            step = Number(1)
+            step = number_of(1)
             if start_value.value < end_value.value:
-                step = Number(1)
+                step = number_of(1)
             else:
-                step = Number(-1)
+                step = number_of(-1)
 
         i = start_value.value
 
         if step.value == 0:
-            return res.failure(RunTimeError(
+            raise ErrorSignal(RunTimeError(
                 node.pos_start, node.pos_end,
                 'STEP value must be none zero',
                 context
             ))
 
+        if is_range_loop(node):
+            value = range_loop(context.symbol_table, node.var_name_token.value, i, end_value.value, step.value)
+            return value.set_context(context).set_pos(node.pos_start, node.pos_end)
+
         condition = lambda: i < end_value.value
         if step.value < 0:
             condition = lambda: i > end_value.value
 
         while condition():
-            context.symbol_table.set(node.var_name_token.value, Number(i))
+            context.symbol_table.set(node.var_name_token.value, number_of(i))
 
             i += step.value
-            value = res.register(self.visit(node.body_node, context))
-            if res.should_return() and res.loop_should_continue == False and res.loop_should_break == False: return res
+            value = self.visit(node.body_node, context)
+            if type(value) is Signal:
+                if value is CONTINUE: continue
+                if value is BREAK: break
+                return value
 
-            if res.loop_should_continue : continue
-            if res.loop_should_break  : break
+            if elements is not None: elements.append(value)
 
-            elements.append(value)
 
-
-        return res.success(
-            Number.null if node.should_return_null else
+        return (
+            Number.null if elements is None else
             List(elements).set_context(context).set_pos(node.pos_start, node.pos_end))
 
     def visit_WhileNode(self, node, context):
-        res = RunTimeResult()
-        elements = []
+        elements = None if node.should_return_null else []
 
         while True:
-            condition = res.register(self.visit(node.condition_node, context))
-            if res.should_return(): return res
+            condition = self.visit(node.condition_node, context)
+            if type(condition) is Signal: return condition
 
             if not condition.is_true(): break;
 
-            value =res.register(self.visit(node.body_node, context))
-            if res.should_return() and res.loop_should_break == False  and res.loop_should_continue == False: return res
-
-            if res.loop_should_break : break
-            if res.loop_should_continue : continue
+            value = self.visit(node.body_node, context)
+            if type(value) is Signal:
+                if value is BREAK: break
+                if value is CONTINUE: continue
+                return value
 
-            elements.append(value)
+            if elements is not None: elements.append(value)
 
-        return res.success(
-            Number.null if node.should_return_null else
+        return (
+            Number.null if elements is None else
             List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
         )
 
     def visit_FuncDefNode(self, node, context):
-        res = RunTimeResult()
-
         func_name = node.var_name_token.value if node.var_name_token else None
         body_node = node.body_node
         arg_names = [arg_name.value for arg_name in node.arg_name_tokens]
@@ -2237,60 +3208,920 @@ class Interpreter:
 
         if node.var_name_token: context.symbol_table.set(func_name, func_value)
 
-        return res.success(func_value)
-
-        pass
+        return func_value
 
     def visit_CallNode(self, node, context):
-        res = RunTimeResult()
         args = []
-        value_to_call = res.register(self.visit(node.node_to_call, context))
-        if res.should_return(): return res
+        value_to_call = self.visit(node.node_to_call, context)
+        if type(value_to_call) is Signal: return value_to_call
 
-        value_to_call = value_to_call.copy().set_pos(node.pos_start, node.pos_end)
+        # a call gives the function it calls its position and , scoping being dynamic ,
+        # the context the call is in
+        value_to_call = value_to_call.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
 
         for arg_node in node.arg_nodes:
-            args.append(res.register(self.visit(arg_node, context)))
-            if res.should_return(): return res
+            arg = self.visit(arg_node, context)
+            if type(arg) is Signal: return arg
+            args.append(arg)
+
+        if node.tail and isinstance(value_to_call, Function):
+            return TailCall(value_to_call, args)
 
-        ret = res.register(value_to_call.execute(args))
-        if res.should_return(): return res
-        ret = ret.copy().set_pos(node.pos_start,node.pos_end).set_context(context)
-        return res.success(ret)
+        try:
+            ret = value_to_call.execute(args)
+        except ErrorSignal as signal:
+            # calling a value that isn't a function , the error has no position yet
+            placed_error(signal.error, node, context)
+            raise
+        return ret
 
     def visit_StringNode(self, node, context):
-        res = RunTimeResult()
-        return res.success(String(node.token.value).set_context(context).set_pos(node.pos_start, node.pos_end))
+        return String(node.token.value).set_context(context).set_pos(node.pos_start, node.pos_end)
 
     def visit_ListNode(self, node, context):
-        res = RunTimeResult()
         elements = []
         for element_node in node.element_nodes:
-            elements.append(res.register(self.visit(element_node, context)))
-            if res.should_return(): return res
+            element = self.visit(element_node, context)
+            if type(element) is Signal: return element
+            elements.append(element)
 
-        return res.success(List(elements).set_context(context).set_pos(node.pos_start, node.pos_end))
+        return List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
 
     def visit_ReturnNode(self,node,context):
-        res = RunTimeResult()
-
         if node.node_to_return :
-            value = res.register(self.visit(node.node_to_return,context))
-            if res.should_return() : return res
+            value = self.visit(node.node_to_return,context)
+            if type(value) is Signal : return value
         else:
             value = Number.null
 
-        return res.success_return(value)
+        self.return_value = value
+        return RETURN
 
     def visit_ContinueNode(self,node,context):
+        return CONTINUE
+
+    def visit_BreakNode(self,node,context):
+        return BREAK
+
+
+##
+# Scopes
+##
+
+class Resolver:
+    # gives every name a function body assigns ( its args , LET , FOR and FUNC
+    # names ) a slot in the Frame of its calls , and the nodes reading or writing
+    # them that slot . scoping is dynamic : a function sees the variables of
+    # whoever read it , so a name not local to a body has no static place and is
+    # still looked up through the chain , as are names at the top level , which
+    # live in the global symbol table RUN and the REPL share
+    def resolve(self, tree):
+        # a cached tree is run again as it is
+        if getattr(tree, 'resolved', False): return tree
+        tree.resolved = True
+        # ( node , slots of the function it is in or None ) , walked without recursion
+        stack = [(tree, None)]
+        while stack:
+            node, slot_of = stack.pop()
+            node_type = type(node)
+            if node_type is VarAccessNode or node_type is VarAssignNode:
+                node.slot = slot_of.get(node.var_name_token.value) if slot_of is not None else None
+            elif node_type is FuncDefNode:
+                node.slot_of = {name: slot for slot, name in enumerate(self.local_names(node))}
+                stack.append((node.body_node, node.slot_of))
+                continue
+            stack.extend((child, slot_of) for child in child_nodes(node))
+        return tree
+
+    def local_names(self, func_node):
+        names = dict.fromkeys(arg_name.value for arg_name in func_node.arg_name_tokens)
+        stack = [func_node.body_node]
+        while stack:
+            node = stack.pop()
+            node_type = type(node)
+            if node_type is VarAssignNode or node_type is ForNode:
+                names[node.var_name_token.value] = None
+            elif node_type is FuncDefNode:
+                # its name is local here , its body is a scope of its own
+                if node.var_name_token: names[node.var_name_token.value] = None
+                continue
+            stack.extend(child_nodes(node))
+        return list(names)
+
+
+class SlotInterpreter(Interpreter):
+    # the Interpreter for a tree the Resolver went through : in a function body ,
+    # a local is read and written by its index in the Frame , not by name
+    def visit_VarAccessNode(self, node, context):
+        slot = node.slot
+        if slot is not None:
+            value = context.symbol_table.values[slot]
+            if value is not None: return value
+        # a name not local to the body , or not assigned yet in this call : a variable
+        # of the callers , if any
+        return Interpreter.visit_VarAccessNode(self, node, context)
+
+    def visit_VarAssignNode(self, node, context):
+        if node.slot is None: return Interpreter.visit_VarAssignNode(self, node, context)
+        value = self.visit(node.value_node, context)
+        if type(value) is Signal: return value
+        context.symbol_table.values[node.slot] = value
+        return value
+
+    def visit_FuncDefNode(self, node, context):
+        func_name = node.var_name_token.value if node.var_name_token else None
+        arg_names = [arg_name.value for arg_name in node.arg_name_tokens]
+        func_value = SlotFunction(
+            func_name, node.body_node, arg_names, node.should_auto_return, node.slot_of
+        ).set_context(context).set_pos(node.pos_start, node.pos_end)
+
+        if func_name: context.symbol_table.set(func_name, func_value)
+        return func_value
+
+
+class ProgramSlotInterpreter(Interpreter):
+    # the top level of a tree the Resolver went through , where no name has a slot :
+    # only the functions it defines differ from the Interpreter
+    visit_FuncDefNode = SlotInterpreter.visit_FuncDefNode
+
+
+##
+# Bytecode
+##
+
+# what the VirtualMachine runs : a flat list of ( opcode , argument , node )
+# instructions , the node being the one whose positions errors and values get
+OP_LOAD_NAME = 0        # push the value of a variable , not a copy
+OP_STORE_NAME = 1       # set a variable to the value on top , which stays
+OP_NUMBER = 2           # push the Number of a literal
+OP_STRING = 3           # push a new String
+OP_BINARY = 4           # pop right , left , push left.<method>(right)
+OP_UNARY = 5            # pop a value , push it negated / notted
+OP_JUMP = 6
+OP_JUMP_IF_FALSE = 7    # pop a value , jump if it isn't true
+OP_POP = 8
+OP_NULL = 9             # push Number.null
+OP_CALL = 10            # pop argument count values and the value to call , push what it returns
+OP_BUILD_LIST = 11      # pop argument count values , push a List of them
+OP_MAKE_FUNCTION = 12
+OP_FOR_SETUP = 13       # pop [ step ] , end , start into the loop slots
+OP_FOR_ITER = 14        # set the loop variable and step it , or jump out
+OP_LOOP_SETUP = 15      # start the elements of a WHILE loop
+OP_LOOP_APPEND = 16     # pop the value of the body into the elements
+OP_LOOP_RESULT = 17     # push the List of the elements , or Number.null
+OP_BREAK = 18           # drop what the loop body left on the stack and jump
+OP_CONTINUE = 19
+OP_ESCAPE = 20          # a break / continue outside any loop here leaves the code , as in the tree walker
+OP_RETURN = 21
+OP_END = 22
+OP_RANGE_RESULT = 23    # push the Range of a FOR whose body is its variable , from the loop slots
+OP_TAIL_CALL = 24       # OP_CALL for a call in tail position , see mark_tail_calls
+
+# the slots each loop gets , from the first one
+LOOP_ELEMENTS = 0       # values of the body , None if they are not kept
+LOOP_DEPTH = 1          # stack size when the loop started
+LOOP_INDEX = 2          # FOR only : the loop variable , the end and the step
+LOOP_END = 3
+LOOP_STEP = 4
+LOOP_SLOT_COUNT = 5
+
+
+class Bytecode:
+    def __init__(self, instructions, slot_count, loops):
+        self.instructions = instructions
+        self.slot_count = slot_count
+        # ( body start , body end , first slot , break target , continue target ) of
+        # every loop , inner loops first : a break / continue coming back from a call
+        # goes to the innermost loop whose body has the call
+        self.loops = loops
+
+
+class Compiler:
+    # turns a tree from Parser.parse into Bytecode , doing at compile time the
+    # dispatch Interpreter.visit does on every visit
+    def __init__(self):
+        self.instructions = []
+        self.slot_count = 0
+        self.loops = []
+        # ( first slot , continue target , break jumps to patch ) of the loops being compiled
+        self.loop_stack = []
+
+    def compile(self, node):
+        self.compile_node(node)
+        self.emit(OP_END)
+        return Bytecode(self.instructions, self.slot_count, self.loops)
+
+    def emit(self, op, arg=None, node=None):
+        self.instructions.append((op, arg, node))
+        return len(self.instructions) - 1
+
+    def patch(self, index, arg):
+        op, _, node = self.instructions[index]
+        self.instructions[index] = (op, arg, node)
+
+    def compile_node(self, node):
+        method = getattr(self, f'compile_{type(node).__name__}', self.no_compile_method)
+        method(node)
+
+    def no_compile_method(self, node):
+        raise Exception(f'no compile_{type(node).__name__} method defined')
+
+    def compile_NumberNode(self, node):
+        self.emit(OP_NUMBER, number_of(node.token.value), node)
+
+    def compile_StringNode(self, node):
+        self.emit(OP_STRING, node.token.value, node)
+
+    def compile_VarAccessNode(self, node):
+        self.emit(OP_LOAD_NAME, node.var_name_token.value, node)
+
+    def compile_VarAssignNode(self, node):
+        self.compile_node(node.value_node)
+        self.emit(OP_STORE_NAME, node.var_name_token.value, node)
+
+    def compile_BinaryOpNode(self, node):
+        # the same explicit stack as Interpreter.visit_BinaryOpNode
+        stack = [(node, False)]
+        while stack:
+            node, operands_done = stack.pop()
+            node_type = type(node)
+            if operands_done:
+                if node_type is BinaryOpNode:
+                    self.emit(OP_BINARY, node.operation, node)
+                else:
+                    self.emit(OP_UNARY, node.op_token.type, node)
+            elif node_type is BinaryOpNode:
+                stack.append((node, True))
+                stack.append((node.right_node, False))
+                stack.append((node.left_node, False))
+            elif node_type is UnaryOpNode:
+                stack.append((node, True))
+                stack.append((node.node, False))
+            else:
+                self.compile_node(node)
+
+    compile_UnaryOpNode = compile_BinaryOpNode
+
+    def compile_IfNode(self, node):
+        end_jumps = []
+        for condition, expr, should_return_null in node.cases:
+            self.compile_node(condition)
+            false_jump = self.emit(OP_JUMP_IF_FALSE, None, condition)
+            self.compile_case(expr, should_return_null)
+            end_jumps.append(self.emit(OP_JUMP))
+            self.patch(false_jump, len(self.instructions))
+
+        if node.else_case:
+            expr, should_return_null = node.else_case
+            self.compile_case(expr, should_return_null)
+        else:
+            self.emit(OP_NULL)
+
+        for jump in end_jumps:
+            self.patch(jump, len(self.instructions))
+
+    def compile_case(self, expr, should_return_null):
+        self.compile_node(expr)
+        if should_return_null:
+            self.emit(OP_POP)
+            self.emit(OP_NULL)
+
+    def compile_ForNode(self, node):
+        self.compile_node(node.start_value_node)
+        self.compile_node(node.end_value_node)
+        if node.step_value_node:
+            self.compile_node(node.step_value_node)
+
+        slot = self.new_loop_slots()
+        self.emit(OP_FOR_SETUP, (slot, node.step_value_node is not None, node.should_return_null), node)
+        if is_range_loop(node):
+            self.emit(OP_RANGE_RESULT, (slot, node.var_name_token.value), node)
+            return
+        loop_start = self.emit(OP_FOR_ITER, None, node)
+        self.compile_loop_body(node, slot, loop_start)
+        self.patch(loop_start, (slot, node.var_name_token.value, len(self.instructions)))
+        self.emit(OP_LOOP_RESULT, slot, node)
+
+    def compile_WhileNode(self, node):
+        slot = self.new_loop_slots()
+        self.emit(OP_LOOP_SETUP, (slot, node.should_return_null))
+        # the condition is not part of the body : a break in it is for an outer loop
+        loop_start = len(self.instructions)
+        self.compile_node(node.condition_node)
+        false_jump = self.emit(OP_JUMP_IF_FALSE, None, node.condition_node)
+        self.compile_loop_body(node, slot, loop_start)
+        self.patch(false_jump, len(self.instructions))
+        self.emit(OP_LOOP_RESULT, slot, node)
+
+    def new_loop_slots(self):
+        slot = self.slot_count
+        self.slot_count += LOOP_SLOT_COUNT
+        return slot
+
+    def compile_loop_body(self, node, slot, continue_target):
+        # the body , keeping its value if the loop has one , then back to continue_target ; break jumps
+        # are patched to just after that
+        break_jumps = []
+        body_start = len(self.instructions)
+        self.loop_stack.append((slot, continue_target, break_jumps))
+        self.compile_node(node.body_node)
+        self.loop_stack.pop()
+        body_end = len(self.instructions)
+
+        if node.should_return_null: self.emit(OP_POP)
+        else: self.emit(OP_LOOP_APPEND, slot)
+        self.emit(OP_JUMP, continue_target)
+        loop_end = len(self.instructions)
+        for jump in break_jumps:
+            self.patch(jump, (slot, loop_end))
+        self.loops.append((body_start, body_end, slot, loop_end, continue_target))
+
+    def compile_FuncDefNode(self, node):
+        func_name = node.var_name_token.value if node.var_name_token else None
+        arg_names = [arg_name.value for arg_name in node.arg_name_tokens]
+        bytecode = Compiler().compile(node.body_node)
+        self.emit(OP_MAKE_FUNCTION, (func_name, arg_names, node.should_auto_return, bytecode), node)
+
+    def compile_CallNode(self, node):
+        self.compile_node(node.node_to_call)
+        for arg_node in node.arg_nodes:
+            self.compile_node(arg_node)
+        self.emit(OP_TAIL_CALL if node.tail else OP_CALL, len(node.arg_nodes), node)
+
+    def compile_ListNode(self, node):
+        for element_node in node.element_nodes:
+            self.compile_node(element_node)
+        self.emit(OP_BUILD_LIST, len(node.element_nodes), node)
+
+    def compile_ReturnNode(self, node):
+        if node.node_to_return:
+            self.compile_node(node.node_to_return)
+        else:
+            self.emit(OP_NULL)
+        self.emit(OP_RETURN)
+
+    def compile_ContinueNode(self, node):
+        if not self.loop_stack:
+            self.emit(OP_ESCAPE, 'continue')
+            return
+        slot, continue_target, _ = self.loop_stack[-1]
+        self.emit(OP_CONTINUE, (slot, continue_target))
+
+    def compile_BreakNode(self, node):
+        if not self.loop_stack:
+            self.emit(OP_ESCAPE, 'break')
+            return
+        _, _, break_jumps = self.loop_stack[-1]
+        break_jumps.append(self.emit(OP_BREAK))
+
+
+# how deep calls of compiled functions can go on a VirtualMachine
+MAX_CALL_DEPTH = 10000
+
+
+class VirtualMachine:
+    # runs Bytecode with a value stack , giving the same values , errors and
+    # RunTimeResult the Interpreter gives for the tree it was compiled from .
+    # a call of a CompiledFunction doesn't run another VirtualMachine : the state
+    # of the caller goes on frames and the bytecode of the callee is run by the
+    # same loop , so recursion in jingo is bounded by max_call_depth rather than
+    # by the python stack , and going past it is a RunTimeError
+    def __init__(self, max_call_depth=None):
+        self.max_call_depth = MAX_CALL_DEPTH if max_call_depth is None else max_call_depth
+
+    def run(self, bytecode, context):
         res = RunTimeResult()
+        instructions = bytecode.instructions
+        symbol_table = context.symbol_table
+        stack = []
+        slots = [None] * bytecode.slot_count
+        pc = 0
+        # ( bytecode , pc , stack , slots , context , function , call node ) of each caller
+        frames = []
+        function = None
 
-        return res.success_continue()
+        while True:
+            op, arg, node = instructions[pc]
+            pc += 1
+
+            if op == OP_LOAD_NAME:
+                value = symbol_table.get(arg)
+                if not value:
+                    return res.failure(RunTimeError(
+                        node.pos_start, node.pos_end,
+                        f'{arg} is not defined ',
+                        context
+                    ))
+                stack.append(value)
 
-    def visit_BreakNode(self,node,context):
-        res  = RunTimeResult()
+            elif op == OP_NUMBER:
+                stack.append(arg)
+
+            elif op == OP_BINARY:
+                right = stack.pop()
+                result, error = getattr(stack.pop(), arg)(right)
+                if error: return res.failure(placed_error(error, node, context))
+                stack.append(result.set_pos(node.pos_start, node.pos_end).set_context(context))
+
+            elif op == OP_JUMP_IF_FALSE:
+                if not stack.pop().is_true(): pc = arg
+
+            elif op == OP_JUMP:
+                pc = arg
+
+            elif op == OP_STORE_NAME:
+                symbol_table.set(arg, stack[-1])
+
+            elif op == OP_FOR_ITER:
+                slot, var_name, loop_end = arg
+                i = slots[slot + LOOP_INDEX]
+                if (i > slots[slot + LOOP_END]) if slots[slot + LOOP_STEP] < 0 else (i < slots[slot + LOOP_END]):
+                    symbol_table.set(var_name, number_of(i))
+                    slots[slot + LOOP_INDEX] = i + slots[slot + LOOP_STEP]
+                else:
+                    pc = loop_end
+
+            elif op == OP_LOOP_APPEND:
+                value = stack.pop()
+                elements = slots[arg + LOOP_ELEMENTS]
+                if elements is not None: elements.append(value)
+
+            elif op == OP_CALL or op == OP_TAIL_CALL:
+                args = stack[len(stack) - arg:]
+                del stack[len(stack) - arg:]
+                value_to_call = stack.pop().copy().set_pos(node.pos_start, node.pos_end).set_context(context)
+
+                if op == OP_TAIL_CALL and type(value_to_call) is CompiledFunction and function is not None:
+                    # the callee takes the frame of the function making the call , as in
+                    # Function.execute : a function calling itself gets its context back
+                    if value_to_call.body_node is not function.body_node:
+                        context = value_to_call.generate_tail_context(context)
+                    if len(args) != len(value_to_call.arg_names):
+                        return res.failure(value_to_call.arg_count_error(value_to_call.arg_names, args))
+                    value_to_call.populate_args(value_to_call.arg_names, args, context)
+
+                    function, bytecode = value_to_call, value_to_call.bytecode
+                    instructions, symbol_table = bytecode.instructions, context.symbol_table
+                    stack, slots, pc = [], [None] * bytecode.slot_count, 0
+                    continue
+
+                if type(value_to_call) is CompiledFunction:
+                    if len(frames) >= self.max_call_depth:
+                        return res.failure(RunTimeError(
+                            node.pos_start, node.pos_end,
+                            f'Maximum call depth of {self.max_call_depth} exceeded',
+                            context
+                        ))
+                    # what Function.execute does , up to running the body
+                    execution_context = value_to_call.generate_new_context()
+                    if len(args) != len(value_to_call.arg_names):
+                        return res.failure(value_to_call.arg_count_error(value_to_call.arg_names, args))
+                    value_to_call.populate_args(value_to_call.arg_names, args, execution_context)
+
+                    frames.append((bytecode, pc, stack, slots, context, function, node))
+                    function, bytecode, context = value_to_call, value_to_call.bytecode, execution_context
+                    instructions, symbol_table = bytecode.instructions, context.symbol_table
+                    stack, slots, pc = [], [None] * bytecode.slot_count, 0
+                    continue
+
+                try:
+                    value = value_to_call.execute(args)
+                except ErrorSignal as signal:
+                    return res.failure(placed_error(signal.error, node, context))
+
+                if value is BREAK or value is CONTINUE:
+                    # a break / continue that left the function , for the loop around the call
+                    pc = self.leave_loop(bytecode, pc, stack, slots, value is BREAK)
+                    if pc is None:
+                        return res.success_break() if value is BREAK else res.success_continue()
+                    continue
+
+                stack.append(value)
+
+            elif op == OP_STRING:
+                stack.append(String(arg).set_context(context).set_pos(node.pos_start, node.pos_end))
+
+            elif op == OP_UNARY:
+                number = stack.pop()
+                error = None
+                if arg == TT_MINUS:
+                    number, error = number.multed_by(number_of(-1))
+                elif arg == TT_NOT:
+                    number, error = number.notted()
+                if error: return res.failure(placed_error(error, node, context))
+                stack.append(number.set_pos(node.pos_start, node.pos_end))
+
+            elif op == OP_POP:
+                stack.pop()
+
+            elif op == OP_NULL:
+                stack.append(Number.null)
+
+            elif op == OP_BUILD_LIST:
+                elements = stack[len(stack) - arg:]
+                del stack[len(stack) - arg:]
+                stack.append(List(elements).set_context(context).set_pos(node.pos_start, node.pos_end))
+
+            elif op == OP_MAKE_FUNCTION:
+                func_name, arg_names, should_auto_return, body_bytecode = arg
+                func_value = CompiledFunction(
+                    func_name, node.body_node, arg_names, should_auto_return, body_bytecode
+                ).set_context(context).set_pos(node.pos_start, node.pos_end)
+                if func_name: symbol_table.set(func_name, func_value)
+                stack.append(func_value)
+
+            elif op == OP_FOR_SETUP:
+                slot, has_step, should_return_null = arg
+                step = stack.pop() if has_step else None
+                end_value = stack.pop()
+                start_value = stack.pop()
+                if not has_step:
+                    step = number_of(1) if start_value.value < end_value.value else number_of(-1)
+
+                if step.value == 0:
+                    return res.failure(RunTimeError(
+                        node.pos_start, node.pos_end,
+                        'STEP value must be none zero',
+                        context
+                    ))
+                slots[slot + LOOP_ELEMENTS] = None if should_return_null else []
+                slots[slot + LOOP_DEPTH] = len(stack)
+                slots[slot + LOOP_INDEX] = start_value.value
+                slots[slot + LOOP_END] = end_value.value
+                slots[slot + LOOP_STEP] = step.value
+
+            elif op == OP_LOOP_SETUP:
+                slot, should_return_null = arg
+                slots[slot + LOOP_ELEMENTS] = None if should_return_null else []
+                slots[slot + LOOP_DEPTH] = len(stack)
+
+            elif op == OP_RANGE_RESULT:
+                slot, var_name = arg
+                value = range_loop(symbol_table, var_name, slots[slot + LOOP_INDEX], slots[slot + LOOP_END],
+                                   slots[slot + LOOP_STEP])
+                stack.append(value.set_context(context).set_pos(node.pos_start, node.pos_end))
+
+            elif op == OP_LOOP_RESULT:
+                elements = slots[arg + LOOP_ELEMENTS]
+                stack.append(Number.null if elements is None else
+                             List(elements).set_context(context).set_pos(node.pos_start, node.pos_end))
+
+            elif op == OP_BREAK or op == OP_CONTINUE:
+                slot, target = arg
+                del stack[slots[slot + LOOP_DEPTH]:]
+                pc = target
+
+            elif op == OP_ESCAPE:
+                # out of the function , to the loop around its call , or further out
+                target = None
+                while target is None and frames:
+                    bytecode, pc, stack, slots, context, function, node = frames.pop()
+                    target = self.leave_loop(bytecode, pc, stack, slots, arg == 'break')
+                if target is None:
+                    return res.success_break() if arg == 'break' else res.success_continue()
+                instructions, symbol_table, pc = bytecode.instructions, context.symbol_table, target
+
+            elif op == OP_RETURN:
+                if not frames: return res.success_return(stack.pop())
+                return_value = stack.pop()
+                bytecode, pc, stack, slots, context, function, node = frames.pop()
+                instructions, symbol_table = bytecode.instructions, context.symbol_table
+                stack.append(return_value)
+
+            else:
+                if not frames: return res.success(stack.pop())
+                value = stack.pop()
+                return_value = (value if function.should_auto_return else None) or Number.null
+                bytecode, pc, stack, slots, context, function, node = frames.pop()
+                instructions, symbol_table = bytecode.instructions, context.symbol_table
+                stack.append(return_value)
+
+    def leave_loop(self, bytecode, pc, stack, slots, should_break):
+        # where a break / continue at pc goes in the innermost loop around it , None outside any
+        for body_start, body_end, slot, break_target, continue_target in bytecode.loops:
+            if body_start < pc <= body_end:
+                del stack[slots[slot + LOOP_DEPTH]:]
+                return break_target if should_break else continue_target
+        return None
 
+
+##
+# Closures
+##
+
+def run_closure(closure, context):
+    # the RunTimeResult the Interpreter would give for the tree of the closure
+    res = RunTimeResult()
+    try:
+        return res.success(closure(context))
+    except ReturnSignal as signal:
+        return res.success_return(signal.value)
+    except BreakSignal:
         return res.success_break()
+    except ContinueSignal:
+        return res.success_continue()
+    except ErrorSignal as signal:
+        return res.failure(signal.error)
+
+
+def call_value(value_to_call, args, node, context):
+    # execute() , with a break / continue leaving the function raised and the error
+    # of calling a value that isn't a function placed at the call
+    try:
+        value = value_to_call.execute(args)
+    except ErrorSignal as signal:
+        placed_error(signal.error, node, context)
+        raise
+    if value is BREAK: raise BreakSignal()
+    if value is CONTINUE: raise ContinueSignal()
+    return value
+
+
+# deeper operator trees are evaluated from a postfix list , not nested closures ,
+# so they don't hit the recursion limit
+CLOSURE_NESTING_LIMIT = 200
+
+
+class ClosureCompiler:
+    # turns every node of a tree into a python closure taking the context , with its
+    # children , literal values and operator methods bound once at compile time .
+    # the closures give the values and errors the Interpreter gives , break /
+    # continue / return and errors travel as the signals above
+    def compile(self, node):
+        method = getattr(self, f'compile_{type(node).__name__}', self.no_compile_method)
+        return method(node)
+
+    def no_compile_method(self, node):
+        raise Exception(f'no compile_{type(node).__name__} method defined')
+
+    def compile_NumberNode(self, node):
+        value = number_of(node.token.value)
+
+        def number(context):
+            return value
+        return number
+
+    def compile_StringNode(self, node):
+        value, pos_start, pos_end = node.token.value, node.pos_start, node.pos_end
+
+        def string(context):
+            return String(value).set_context(context).set_pos(pos_start, pos_end)
+        return string
+
+    def compile_VarAccessNode(self, node):
+        var_name, pos_start, pos_end = node.var_name_token.value, node.pos_start, node.pos_end
+
+        def var_access(context):
+            # SymbolTable.get without the recursion , the chain is as deep as the calls
+            symbol_table = context.symbol_table
+            value = symbol_table.symbols.get(var_name)
+            while value is None and symbol_table.parent:
+                symbol_table = symbol_table.parent
+                value = symbol_table.symbols.get(var_name)
+            if not value:
+                raise ErrorSignal(RunTimeError(pos_start, pos_end, f'{var_name} is not defined ', context))
+            return value
+        return var_access
+
+    def compile_VarAssignNode(self, node):
+        var_name, value_closure = node.var_name_token.value, self.compile(node.value_node)
+
+        def var_assign(context):
+            value = value_closure(context)
+            context.symbol_table.set(var_name, value)
+            return value
+        return var_assign
+
+    def compile_BinaryOpNode(self, node):
+        # the operands in postfix order , through the same explicit stack as
+        # Interpreter.visit_BinaryOpNode , then put together bottom up
+        postfix = []
+        max_depth = 0
+        stack = [(node, False, 1)]
+        while stack:
+            node, operands_done, depth = stack.pop()
+            node_type = type(node)
+            if operands_done:
+                postfix.append((node, None))
+            elif node_type is BinaryOpNode:
+                stack.append((node, True, depth))
+                stack.append((node.right_node, False, depth + 1))
+                stack.append((node.left_node, False, depth + 1))
+            elif node_type is UnaryOpNode:
+                stack.append((node, True, depth))
+                stack.append((node.node, False, depth + 1))
+            else:
+                postfix.append((node, self.compile(node)))
+            max_depth = max(max_depth, depth)
+
+        if max_depth > CLOSURE_NESTING_LIMIT:
+            return self.postfix_operation(postfix)
+
+        closures = []
+        for node, closure in postfix:
+            if closure is None:
+                if type(node) is BinaryOpNode:
+                    right = closures.pop()
+                    closure = self.binary_operation(node, closures.pop(), right)
+                else:
+                    closure = self.unary_operation(node, closures.pop())
+            closures.append(closure)
+        return closures.pop()
+
+    compile_UnaryOpNode = compile_BinaryOpNode
+
+    def binary_operation(self, node, left, right):
+        method_name = node.operation
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def binary_operation(context):
+            left_value = left(context)
+            result, error = getattr(left_value, method_name)(right(context))
+            if error: raise ErrorSignal(placed_error(error, node, context))
+            if type(result) is not Number:
+                result.pos_start, result.pos_end, result.context = pos_start, pos_end, context
+            return result
+        return binary_operation
+
+    def unary_operation(self, node, operand):
+        op_type, pos_start, pos_end = node.op_token.type, node.pos_start, node.pos_end
+
+        def unary_operation(context):
+            number = operand(context)
+            error = None
+            if op_type == TT_MINUS:
+                number, error = number.multed_by(number_of(-1))
+            elif op_type == TT_NOT:
+                number, error = number.notted()
+            if error: raise ErrorSignal(placed_error(error, node, context))
+            return number.set_pos(pos_start, pos_end)
+        return unary_operation
+
+    def postfix_operation(self, postfix):
+        def postfix_operation(context):
+            values = []
+            for node, closure in postfix:
+                if closure is not None:
+                    values.append(closure(context))
+                elif type(node) is BinaryOpNode:
+                    right = values.pop()
+                    result, error = getattr(values.pop(), node.operation)(right)
+                    if error: raise ErrorSignal(placed_error(error, node, context))
+                    values.append(result.set_pos(node.pos_start, node.pos_end).set_context(context))
+                else:
+                    number = values.pop()
+                    error = None
+                    if node.op_token.type == TT_MINUS:
+                        number, error = number.multed_by(number_of(-1))
+                    elif node.op_token.type == TT_NOT:
+                        number, error = number.notted()
+                    if error: raise ErrorSignal(placed_error(error, node, context))
+                    values.append(number.set_pos(node.pos_start, node.pos_end))
+            return values.pop()
+        return postfix_operation
+
+    def compile_IfNode(self, node):
+        cases = [(self.compile(condition), self.compile(expr), should_return_null)
+                 for condition, expr, should_return_null in node.cases]
+        else_case = None
+        if node.else_case:
+            expr, should_return_null = node.else_case
+            else_case = (self.compile(expr), should_return_null)
+
+        def if_expr(context):
+            for condition, expr, should_return_null in cases:
+                if condition(context).is_true():
+                    expr_value = expr(context)
+                    return Number.null if should_return_null else expr_value
+
+            if else_case:
+                expr, should_return_null = else_case
+                else_value = expr(context)
+                return Number.null if should_return_null else else_value
+
+            return Number.null
+        return if_expr
+
+    def compile_ForNode(self, node):
+        var_name = node.var_name_token.value
+        start_closure = self.compile(node.start_value_node)
+        end_closure = self.compile(node.end_value_node)
+        step_closure = self.compile(node.step_value_node) if node.step_value_node else None
+        body = self.compile(node.body_node)
+        should_return_null, pos_start, pos_end = node.should_return_null, node.pos_start, node.pos_end
+        counts_itself = is_range_loop(node)
+
+        def for_expr(context):
+            start_value = start_closure(context)
+            end_value = end_closure(context)
+            if step_closure:
+                step = step_closure(context)
+            else:
+                step = number_of(1) if start_value.value < end_value.value else number_of(-1)
+
+            i = start_value.value
+            if step.value == 0:
+                raise ErrorSignal(RunTimeError(pos_start, pos_end, 'STEP value must be none zero', context))
+            if counts_itself:
+                value = range_loop(context.symbol_table, var_name, i, end_value.value, step.value)
+                return value.set_context(context).set_pos(pos_start, pos_end)
+
+            elements = None if should_return_null else []
+            symbol_table = context.symbol_table
+            end, step = end_value.value, step.value
+            while (i > end) if step < 0 else (i < end):
+                symbol_table.set(var_name, number_of(i))
+                i += step
+                try:
+                    value = body(context)
+                except ContinueSignal:
+                    continue
+                except BreakSignal:
+                    break
+                if elements is not None: elements.append(value)
+
+            return Number.null if elements is None else List(elements).set_context(context).set_pos(pos_start, pos_end)
+        return for_expr
+
+    def compile_WhileNode(self, node):
+        condition = self.compile(node.condition_node)
+        body = self.compile(node.body_node)
+        should_return_null, pos_start, pos_end = node.should_return_null, node.pos_start, node.pos_end
+
+        def while_expr(context):
+            elements = None if should_return_null else []
+            while condition(context).is_true():
+                try:
+                    value = body(context)
+                except BreakSignal:
+                    break
+                except ContinueSignal:
+                    continue
+                if elements is not None: elements.append(value)
+
+            return Number.null if elements is None else List(elements).set_context(context).set_pos(pos_start, pos_end)
+        return while_expr
+
+    def compile_FuncDefNode(self, node):
+        func_name = node.var_name_token.value if node.var_name_token else None
+        arg_names = [arg_name.value for arg_name in node.arg_name_tokens]
+        body = self.compile(node.body_node)
+
+        def func_def(context):
+            func_value = ClosureFunction(
+                func_name, node.body_node, arg_names, node.should_auto_return, body
+            ).set_context(context).set_pos(node.pos_start, node.pos_end)
+            if func_name: context.symbol_table.set(func_name, func_value)
+            return func_value
+        return func_def
+
+    def compile_CallNode(self, node):
+        callee = self.compile(node.node_to_call)
+        arg_closures = [self.compile(arg_node) for arg_node in node.arg_nodes]
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def call(context):
+            value_to_call = callee(context).copy().set_pos(pos_start, pos_end).set_context(context)
+            args = [arg(context) for arg in arg_closures]
+            if type(value_to_call) is ClosureFunction:
+                ret = value_to_call.call(args)
+            else:
+                ret = call_value(value_to_call, args, node, context)
+            return ret
+
+        def tail_call(context):
+            # made by the ClosureFunction running the body , see mark_tail_calls
+            value_to_call = callee(context).copy().set_pos(pos_start, pos_end).set_context(context)
+            args = [arg(context) for arg in arg_closures]
+            if type(value_to_call) is ClosureFunction: return TailCall(value_to_call, args)
+            return call_value(value_to_call, args, node, context)
+        return tail_call if node.tail else call
+
+    def compile_ListNode(self, node):
+        element_closures = [self.compile(element_node) for element_node in node.element_nodes]
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def list_expr(context):
+            elements = [element(context) for element in element_closures]
+            return List(elements).set_context(context).set_pos(pos_start, pos_end)
+        return list_expr
+
+    def compile_ReturnNode(self, node):
+        value_closure = self.compile(node.node_to_return) if node.node_to_return else None
+
+        def return_statement(context):
+            raise ReturnSignal(value_closure(context) if value_closure else Number.null)
+        return return_statement
+
+    def compile_ContinueNode(self, node):
+        def continue_statement(context):
+            raise ContinueSignal()
+        return continue_statement
+
+    def compile_BreakNode(self, node):
+        def break_statement(context):
+            raise BreakSignal()
+        return break_statement
 
 ##Global Context
 
@@ -2313,26 +4144,695 @@ global_symbol_table.set("APPEND", BuiltInFunction.append)
 global_symbol_table.set("POP", BuiltInFunction.pop)
 global_symbol_table.set("EXTEND", BuiltInFunction.extend)
 global_symbol_table.set("LEN", BuiltInFunction.len)
+global_symbol_table.set("RANGE", BuiltInFunction.range)
+global_symbol_table.set("LIST", BuiltInFunction.list)
+global_symbol_table.set("VECTOR", BuiltInFunction.vector)
+global_symbol_table.set("SUM", BuiltInFunction.sum)
+global_symbol_table.set("MEAN", BuiltInFunction.mean)
+global_symbol_table.set("MAX", BuiltInFunction.max)
 global_symbol_table.set("RUN", BuiltInFunction.run)
 
 
-def run(fn, text):
+##
+# AST cache
+##
+
+def source_hash(text):
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+# how many parsed sources run() keeps , 0 turns the cache off
+AST_CACHE_SIZE = 128
+
+
+class AstCache:
+    # parsed trees by ( file name , hash of the source ) , least recently used first ,
+    # so RUN in a loop or a repeated REPL line is parsed once . a cached tree holds
+    # its source as source_file , so its offsets stay valid until it is evicted
+    def __init__(self, max_size=AST_CACHE_SIZE):
+        self.max_size = max_size
+        self.trees = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(fn, text):
+        return fn, source_hash(text)
+
+    def get(self, key):
+        tree = self.trees.get(key)
+        if tree is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.trees.move_to_end(key)
+        return tree
+
+    def put(self, key, tree):
+        if self.max_size <= 0: return
+        self.trees[key] = tree
+        self.trees.move_to_end(key)
+        self.evict()
+
+    def resize(self, max_size):
+        self.max_size = max_size
+        self.evict()
+
+    def evict(self):
+        while self.trees and len(self.trees) > self.max_size:
+            self.trees.popitem(last=False)
+
+    def clear(self):
+        self.trees.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+ast_cache = AstCache()
+
+
+##
+# Compiled artifacts
+##
+
+# a .jgc file is the magic , the format version , the hash of the source it was
+# compiled from , then zlib compressed marshal data : a table of token values and
+# the tree lowered to ints . every node is its opcode followed by what its
+# constructor takes , and comes after the nodes it refers to by index , so one
+# forward pass rebuilds the tree however deep it is . offsets are stored from the
+# start of the source and moved to where source_files puts it on load
+ARTIFACT_MAGIC = b'JGC'
+ARTIFACT_VERSION = 3
+ARTIFACT_HEADER = ARTIFACT_MAGIC + bytes([ARTIFACT_VERSION])
+
+# what a constructor argument is stored as
+NODE_ARG = 0            # index of an earlier node
+OPTIONAL_NODE_ARG = 1   # the same , -1 for None
+NODES_ARG = 2           # count , then indexes
+TOKEN_ARG = 3           # type , value index , start , end
+OPTIONAL_TOKEN_ARG = 4  # the same , a type of -1 for None
+TOKENS_ARG = 5          # count , then tokens
+FLAG_ARG = 6            # 0 or 1
+POSITION_ARG = 7        # offset
+CASES_ARG = 8           # count , then condition index , body index , flag for each
+ELSE_CASE_ARG = 9       # -1 for None , else body index , flag
+
+# the opcode of a node is its index here
+NODE_LAYOUTS = (
+    (NumberNode, (('token', TOKEN_ARG),)),
+    (StringNode, (('token', TOKEN_ARG),)),
+    (VarAccessNode, (('var_name_token', TOKEN_ARG),)),
+    (VarAssignNode, (('var_name_token', TOKEN_ARG), ('value_node', NODE_ARG))),
+    (BinaryOpNode, (('left_node', NODE_ARG), ('op_token', TOKEN_ARG), ('right_node', NODE_ARG))),
+    (UnaryOpNode, (('op_token', TOKEN_ARG), ('node', NODE_ARG))),
+    (IfNode, (('cases', CASES_ARG), ('else_case', ELSE_CASE_ARG))),
+    (ForNode, (('var_name_token', TOKEN_ARG), ('start_value_node', NODE_ARG), ('end_value_node', NODE_ARG),
+               ('step_value_node', OPTIONAL_NODE_ARG), ('body_node', NODE_ARG), ('should_return_null', FLAG_ARG))),
+    (WhileNode, (('condition_node', NODE_ARG), ('body_node', NODE_ARG), ('should_return_null', FLAG_ARG))),
+    (FuncDefNode, (('var_name_token', OPTIONAL_TOKEN_ARG), ('arg_name_tokens', TOKENS_ARG),
+                   ('body_node', NODE_ARG), ('should_auto_return', FLAG_ARG))),
+    (CallNode, (('node_to_call', NODE_ARG), ('arg_nodes', NODES_ARG))),
+    (ListNode, (('element_nodes', NODES_ARG), ('pos_start', POSITION_ARG), ('pos_end', POSITION_ARG))),
+    (ReturnNode, (('node_to_return', OPTIONAL_NODE_ARG), ('pos_start', POSITION_ARG), ('pos_end', POSITION_ARG))),
+    (ContinueNode, (('pos_start', POSITION_ARG), ('pos_end', POSITION_ARG))),
+    (BreakNode, (('pos_start', POSITION_ARG), ('pos_end', POSITION_ARG))),
+)
+OPCODE_OF = {node_class: opcode for opcode, (node_class, _) in enumerate(NODE_LAYOUTS)}
+
+
+def artifact_path(fn):
+    return os.path.splitext(fn)[0] + '.jgc'
+
+
+def child_nodes(node):
+    _, args = NODE_LAYOUTS[OPCODE_OF[type(node)]]
+    for name, kind in args:
+        value = getattr(node, name)
+        if kind == NODE_ARG or (kind == OPTIONAL_NODE_ARG and value is not None):
+            yield value
+        elif kind == NODES_ARG:
+            yield from value
+        elif kind == CASES_ARG:
+            for condition, body, _ in value:
+                yield condition
+                yield body
+        elif kind == ELSE_CASE_ARG and value is not None:
+            yield value[0]
+
+
+def dump_artifact(node, fn, text):
+    base = source_files.add(fn, text).base
+    code = array('q')
+    values = []
+    value_index_of = {}
+    node_index_of = {}
+
+    def add_token(token):
+        # 1 , 1.0 and True are different values
+        key = (type(token.value), token.value)
+        value_index = value_index_of.get(key)
+        if value_index is None:
+            value_index = value_index_of[key] = len(values)
+            values.append(token.value)
+        code.extend((token.type, value_index, token.pos_start - base, token.pos_end - base))
+
+    # post order , children first
+    stack = [(node, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(list(child_nodes(node))))
+            continue
+
+        opcode = OPCODE_OF[type(node)]
+        code.append(opcode)
+        for name, kind in NODE_LAYOUTS[opcode][1]:
+            value = getattr(node, name)
+            if kind == NODE_ARG:
+                code.append(node_index_of[id(value)])
+            elif kind == OPTIONAL_NODE_ARG:
+                code.append(-1 if value is None else node_index_of[id(value)])
+            elif kind == NODES_ARG:
+                code.append(len(value))
+                code.extend(node_index_of[id(item)] for item in value)
+            elif kind == TOKEN_ARG:
+                add_token(value)
+            elif kind == OPTIONAL_TOKEN_ARG:
+                if value is None: code.append(-1)
+                else: add_token(value)
+            elif kind == TOKENS_ARG:
+                code.append(len(value))
+                for token in value: add_token(token)
+            elif kind == FLAG_ARG:
+                code.append(1 if value else 0)
+            elif kind == POSITION_ARG:
+                code.append(value - base)
+            elif kind == CASES_ARG:
+                code.append(len(value))
+                for condition, body, flag in value:
+                    code.extend((node_index_of[id(condition)], node_index_of[id(body)], 1 if flag else 0))
+            else:
+                if value is None: code.append(-1)
+                else: code.extend((node_index_of[id(value[0])], 1 if value[1] else 0))
+        node_index_of[id(node)] = len(node_index_of)
+
+    if sys.byteorder == 'big': code.byteswap()
+    payload = zlib.compress(marshal.dumps((values, code.tobytes())))
+    return ARTIFACT_HEADER + source_hash(text) + payload
+
+
+def load_artifact(fn, text, digest=None):
+    # the tree compiled from this exact source , or None to parse it instead
+    try:
+        with open(artifact_path(fn), 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+
+    if digest is None: digest = source_hash(text)
+    header_size = len(ARTIFACT_HEADER)
+    if data[:header_size] != ARTIFACT_HEADER or data[header_size:header_size + len(digest)] != digest:
+        return None
+
+    try:
+        values, code_bytes = marshal.loads(zlib.decompress(data[header_size + len(digest):]))
+        code = array('q')
+        code.frombytes(code_bytes)
+        if sys.byteorder == 'big': code.byteswap()
+        source_file = source_files.add(fn, text)
+        node = load_tree(values, code, source_file.base)
+        node.source_file = source_file
+        return node
+    except (ValueError, EOFError, TypeError, IndexError, StopIteration, zlib.error):
+        return None
+
+
+def load_tree(values, code, base):
+    values = [intern(value) if type(value) is str else value for value in values]
+    nodes = []
+    ints = iter(code)
+
+    def read_token(token_type):
+        return Token(token_type, values[next(ints)], base + next(ints), base + next(ints))
+
+    for opcode in ints:
+        node_class, layout = NODE_LAYOUTS[opcode]
+        args = []
+        for _, kind in layout:
+            if kind == NODE_ARG:
+                args.append(nodes[next(ints)])
+            elif kind == TOKEN_ARG:
+                args.append(read_token(next(ints)))
+            elif kind == FLAG_ARG:
+                args.append(next(ints) == 1)
+            elif kind == NODES_ARG:
+                args.append([nodes[next(ints)] for _ in range(next(ints))])
+            elif kind == POSITION_ARG:
+                args.append(base + next(ints))
+            elif kind == OPTIONAL_NODE_ARG:
+                index = next(ints)
+                args.append(None if index < 0 else nodes[index])
+            elif kind == OPTIONAL_TOKEN_ARG:
+                token_type = next(ints)
+                args.append(None if token_type < 0 else read_token(token_type))
+            elif kind == TOKENS_ARG:
+                args.append([read_token(next(ints)) for _ in range(next(ints))])
+            elif kind == CASES_ARG:
+                args.append([(nodes[next(ints)], nodes[next(ints)], next(ints) == 1) for _ in range(next(ints))])
+            else:
+                index = next(ints)
+                args.append(None if index < 0 else (nodes[index], next(ints) == 1))
+        nodes.append(node_class(*args))
+
+    return nodes[-1]
+
+
+def compile_file(fn):
+    # parse a script and write its tree next to it , for run() and RUN to load
+    with open(fn, "r") as file:
+        text = file.read()
+    node, error = parse(fn, text)
+    if error: return None, error
+
+    path = artifact_path(fn)
+    with open(path, 'wb') as file:
+        file.write(dump_artifact(node, fn, text))
+    return path, None
+
+
+def parse(fn, text):
     ## Generate Tokens
     lexer = Lexer(fn, text)
-    tokens, error = lexer.make_tokens()
-    if error: return None, error
+    tokens = lexer.iter_tokens()
     ## Generate AST
     parser = Parser(tokens)
 
     # abstract syntax tree
 
-    ast = parser.parse()
-    if ast.error: return None, ast.error
+    try:
+        ast = parser.parse()
+    except RecursionError:
+        token = parser.current_token
+        ast = ParseResult().failure(InvalidSyntaxError(token.pos_start, token.pos_end, 'Nested too deeply'))
+    # an illegal char anywhere wins over a syntax error , as when the whole file was lexed first
+    if ast.error:
+        for _ in tokens: pass
+    if lexer.error: return None, lexer.error.keep_source()
+    if ast.error: return None, ast.error.keep_source()
+    ast.node.source_file = lexer.source_file
+    return ast.node, None
+
+
+##
+# Python
+##
+
+# operators the Transpiler writes out as python when both operands are Numbers ,
+# they compute what the Number methods compute . / and the rest go through them
+PYTHON_OPERATORS = {
+    TT_PLUS: '{} + {}',
+    TT_MINUS: '{} - {}',
+    TT_MUL: '{} * {}',
+    TT_EE: 'int({} == {})',
+    TT_NEQ: 'int({} != {})',
+    TT_LT: 'int({} < {})',
+    TT_LTE: 'int({} <= {})',
+    TT_GT: 'int({} > {})',
+    TT_GTE: 'int({} >= {})',
+    TT_AND: 'int({} and {})',
+    TT_OR: 'int({} or {})',
+}
+
+# an operator chain with more operators than this is left to the ClosureCompiler :
+# python takes about 0.3 ms to compile each one the Transpiler writes out , a
+# 100000 term chain took half a minute to compile for a single run
+TRANSPILE_CHAIN_LIMIT = 500
+
+
+def load_name(context, name, pos_start, pos_end):
+    # a variable the transpiled code didn't find in its own symbol table
+    symbol_table = context.symbol_table.parent
+    value = None
+    while value is None and symbol_table:
+        value = symbol_table.symbols.get(name)
+        symbol_table = symbol_table.parent
+    if value is None:
+        raise ErrorSignal(RunTimeError(pos_start, pos_end, f'{name} is not defined ', context))
+    return value
+
+
+class Transpiler:
+    # writes a tree out as python source , one python function for the program and
+    # one per FUNC , taking the context like a closure of the ClosureCompiler and
+    # raising the same signals . the values are still jingo Values , positions are
+    # written in as the offsets they are , so errors point at the jingo source .
+    # every value goes into a local t<n> , n being how many values are pending ,
+    # so even a very long operator chain needs only a few of them
+    def __init__(self):
+        self.functions = []
+        self.lines = None
+        self.indent = 0
+        # what the source refers to as NODES[i] : the bodies of the functions it defines
+        # and the operands errors of operators are placed at
+        self.nodes = []
+        # and as NUMBERS[i] : the Numbers of the literals
+        self.numbers = []
+        # and as CLOSURES[i] : the closures of the chains longer than TRANSPILE_CHAIN_LIMIT
+        self.closures = []
+
+    def transpile(self, node):
+        # the source , with a function named program for the whole tree
+        self.function('program', node)
+        return '\n\n'.join('\n'.join(lines) for lines in self.functions) + '\n'
+
+    def function(self, name, node):
+        lines, indent = self.lines, self.indent
+        self.lines, self.indent = [], 0
+        self.write(f'def {name}(context):')
+        self.indent += 1
+        self.write('symbols = context.symbol_table.symbols')
+        self.write(self.emit(node, 0))
+        self.write('return t0')
+        self.functions.append(self.lines)
+        self.lines, self.indent = lines, indent
+
+    def write(self, line):
+        if line: self.lines.append('    ' * self.indent + line)
+
+    def temp(self, depth):
+        return f't{depth}'
+
+    def emit(self, node, depth):
+        # writes the lines putting the value of node in t<depth> , returns a last line or ''
+        method = getattr(self, f'emit_{type(node).__name__}', self.no_emit_method)
+        return method(node, depth)
+
+    def no_emit_method(self, node, depth):
+        raise Exception(f'no emit_{type(node).__name__} method defined')
+
+    def set_pos(self, target, node, with_context=True):
+        # a Number has no position or context to set
+        if with_context:
+            return (f'if type({target}) is not Number: {target}.pos_start, {target}.pos_end, {target}.context = '
+                    f'{node.pos_start!r}, {node.pos_end!r}, context')
+        return f'if type({target}) is not Number: {target}.pos_start, {target}.pos_end = {node.pos_start!r}, {node.pos_end!r}'
+
+    def node_reference(self, node):
+        self.nodes.append(node)
+        return f'NODES[{len(self.nodes) - 1}]'
+
+    def emit_NumberNode(self, node, depth):
+        self.numbers.append(number_of(node.token.value))
+        return f'{self.temp(depth)} = NUMBERS[{len(self.numbers) - 1}]'
+
+    def emit_StringNode(self, node, depth):
+        target = self.temp(depth)
+        self.write(f'{target} = String({node.token.value!r})')
+        return self.set_pos(target, node)
+
+    def emit_VarAccessNode(self, node, depth):
+        target, var_name = self.temp(depth), node.var_name_token.value
+        self.write(f'{target} = symbols.get({var_name!r})')
+        return f'if {target} is None: {target} = load_name(context, {var_name!r}, {node.pos_start!r}, {node.pos_end!r})'
+
+    def emit_VarAssignNode(self, node, depth):
+        self.write(self.emit(node.value_node, depth))
+        return f'symbols[{node.var_name_token.value!r}] = t{depth}'
+
+    def emit_BinaryOpNode(self, node, depth):
+        # the operands in postfix order , as in ClosureCompiler.compile_BinaryOpNode
+        postfix = []
+        operator_count = 0
+        stack = [(node, False)]
+        while stack:
+            operand, operands_done = stack.pop()
+            operand_type = type(operand)
+            if operands_done:
+                postfix.append(operand)
+                operator_count += 1
+            elif operand_type is BinaryOpNode:
+                stack.append((operand, True))
+                stack.append((operand.right_node, False))
+                stack.append((operand.left_node, False))
+            elif operand_type is UnaryOpNode:
+                stack.append((operand, True))
+                stack.append((operand.node, False))
+            else:
+                postfix.append(operand)
+
+        if operator_count > TRANSPILE_CHAIN_LIMIT:
+            self.closures.append(ClosureCompiler().compile(node))
+            return f'{self.temp(depth)} = CLOSURES[{len(self.closures) - 1}](context)'
+
+        top = depth
+        for node in postfix:
+            node_type = type(node)
+            if node_type is BinaryOpNode:
+                top -= 1
+                self.binary_operation(node, f't{top - 1}', f't{top}')
+            elif node_type is UnaryOpNode:
+                self.unary_operation(node, f't{top - 1}')
+            else:
+                self.write(self.emit(node, top))
+                top += 1
+        return ''
+
+    emit_UnaryOpNode = emit_BinaryOpNode
+
+    def binary_operation(self, node, left, right):
+        op_type = node.op_token.type
+        operator = PYTHON_OPERATORS.get(op_type)
+        if operator:
+            self.write(f'if type({left}) is Number and type({right}) is Number:')
+            self.write(f'    {left} = number_of({operator.format(f"{left}.value", f"{right}.value")})')
+            self.write('else:')
+            self.indent += 1
+        self.write(f'{left}, error = {left}.{node.operation}({right})')
+        self.write(f'if error: raise ErrorSignal(placed_error(error, {self.node_reference(node)}, context))')
+        self.write(self.set_pos(left, node))
+        if operator: self.indent -= 1
+
+    def unary_operation(self, node, operand):
+        op_type = node.op_token.type
+        if op_type == TT_MINUS:
+            self.write(f'{operand}, error = {operand}.multed_by(number_of(-1))')
+        elif op_type == TT_NOT:
+            self.write(f'{operand}, error = {operand}.notted()')
+        if op_type == TT_MINUS or op_type == TT_NOT:
+            self.write(f'if error: raise ErrorSignal(placed_error(error, {self.node_reference(node)}, context))')
+        self.write(self.set_pos(operand, node, with_context=False))
+
+    def emit_IfNode(self, node, depth):
+        target = self.temp(depth)
+        indent = self.indent
+        for condition, expr, should_return_null in node.cases:
+            self.write(self.emit(condition, depth))
+            self.write(f'if {target}.is_true():')
+            self.indent += 1
+            self.write(self.emit(expr, depth))
+            if should_return_null: self.write(f'{target} = Number.null')
+            self.indent -= 1
+            self.write('else:')
+            self.indent += 1
+
+        if node.else_case:
+            expr, should_return_null = node.else_case
+            self.write(self.emit(expr, depth))
+            if should_return_null: self.write(f'{target} = Number.null')
+        else:
+            self.write(f'{target} = Number.null')
+        self.indent = indent
+        return ''
+
+    def loop_body(self, node, depth, elements, first_break):
+        # the body of a for / while loop , with the signals of a break or continue
+        # in it , or in a function it calls , turned into the python statements
+        self.write('try:')
+        self.indent += 1
+        self.write(self.emit(node.body_node, depth))
+        self.indent -= 1
+        for signal, statement in (('BreakSignal', 'break'), ('ContinueSignal', 'continue'))[::1 if first_break else -1]:
+            self.write(f'except {signal}: {statement}')
+        if not node.should_return_null: self.write(f'{elements}.append(t{depth})')
+
+    def loop_result(self, node, depth, elements):
+        if node.should_return_null: return f't{depth} = Number.null'
+        return f't{depth} = List({elements}).set_context(context).set_pos({node.pos_start!r}, {node.pos_end!r})'
+
+    def emit_ForNode(self, node, depth):
+        start, end, step, elements, i = (self.temp(depth + offset) for offset in range(5))
+        self.write(self.emit(node.start_value_node, depth))
+        self.write(self.emit(node.end_value_node, depth + 1))
+        if node.step_value_node:
+            self.write(self.emit(node.step_value_node, depth + 2))
+        else:
+            self.write(f'{step} = number_of(1) if {start}.value < {end}.value else number_of(-1)')
+        self.write(f'if {step}.value == 0:')
+        self.write(f"    raise ErrorSignal(RunTimeError({node.pos_start!r}, {node.pos_end!r}, 'STEP value must be none zero', context))")
+        if is_range_loop(node):
+            return (f'{start} = range_loop(context.symbol_table, {node.var_name_token.value!r}, {start}.value, '
+                    f'{end}.value, {step}.value).set_context(context).set_pos({node.pos_start!r}, {node.pos_end!r})')
+
+        self.write(f'{elements} = []')
+        self.write(f'for {i} in loop_range({start}.value, {end}.value, {step}.value):')
+        self.indent += 1
+        self.write(f'symbols[{node.var_name_token.value!r}] = number_of({i})')
+        self.loop_body(node, depth + 5, elements, first_break=False)
+        self.indent -= 1
+        return self.loop_result(node, depth, elements)
+
+    def emit_WhileNode(self, node, depth):
+        elements, value = self.temp(depth + 1), self.temp(depth + 2)
+        self.write(f'{elements} = []')
+        self.write('while True:')
+        self.indent += 1
+        self.write(self.emit(node.condition_node, depth + 2))
+        self.write(f'if not {value}.is_true(): break')
+        self.loop_body(node, depth + 2, elements, first_break=True)
+        self.indent -= 1
+        return self.loop_result(node, depth, elements)
+
+    def emit_FuncDefNode(self, node, depth):
+        target = self.temp(depth)
+        func_name = node.var_name_token.value if node.var_name_token else None
+        arg_names = [arg_name.value for arg_name in node.arg_name_tokens]
+        name = f'function_{len(self.nodes)}'
+        self.nodes.append(node.body_node)
+        self.function(name, node.body_node)
+
+        self.write(f'{target} = ClosureFunction({func_name!r}, NODES[{len(self.nodes) - 1}], {arg_names!r}, '
+                   f'{node.should_auto_return!r}, {name})')
+        self.write(f'{target}.set_context(context).set_pos({node.pos_start!r}, {node.pos_end!r})')
+        if func_name: return f'symbols[{func_name!r}] = {target}'
+        return ''
+
+    def emit_CallNode(self, node, depth):
+        target = self.temp(depth)
+        self.write(self.emit(node.node_to_call, depth))
+        self.write(f'{target} = {target}.copy()')
+        self.write(self.set_pos(target, node))
+        args = []
+        for offset, arg_node in enumerate(node.arg_nodes, 1):
+            self.write(self.emit(arg_node, depth + offset))
+            args.append(f't{depth + offset}')
+        args = f'[{", ".join(args)}]'
+
+        call = f'TailCall({target}, {args})' if node.tail else f'{target}.call({args})'
+        self.write(f'if type({target}) is ClosureFunction: {target} = {call}')
+        return f'else: {target} = call_value({target}, {args}, {self.node_reference(node)}, context)'
+
+    def emit_ListNode(self, node, depth):
+        target = self.temp(depth)
+        elements = []
+        for offset, element_node in enumerate(node.element_nodes, 1):
+            self.write(self.emit(element_node, depth + offset))
+            elements.append(f't{depth + offset}')
+        self.write(f'{target} = List([{", ".join(elements)}])')
+        return f'{target}.set_context(context).set_pos({node.pos_start!r}, {node.pos_end!r})'
+
+    def emit_ReturnNode(self, node, depth):
+        if not node.node_to_return: return 'raise ReturnSignal(Number.null)'
+        self.write(self.emit(node.node_to_return, depth))
+        return f'raise ReturnSignal(t{depth})'
+
+    def emit_ContinueNode(self, node, depth):
+        return 'raise ContinueSignal()'
+
+    def emit_BreakNode(self, node, depth):
+        return 'raise BreakSignal()'
+
+
+# what run() runs a transpiled tree with , by tree , in the same lru as the parsed trees
+code_cache = AstCache()
+
+
+def transpile(node):
+    # the transpiled program as a python function taking the context . a tree python
+    # won't compile ( more than 20 loops in each other , ifs more than 100 levels
+    # deep ) gets the closure of the ClosureCompiler instead , which does the same
+    transpiler = Transpiler()
+    source = transpiler.transpile(node)
+    fn = source_files.position(node.pos_start).fn if node.pos_start is not None else '<program>'
+    try:
+        code = compile(source, f'<python {fn}>', 'exec')
+    except (SyntaxError, RecursionError, MemoryError):
+        return ClosureCompiler().compile(node)
+
+    namespace = {
+        'NODES': transpiler.nodes, 'NUMBERS': transpiler.numbers, 'CLOSURES': transpiler.closures,
+        'Number': Number, 'String': String, 'List': List, 'ClosureFunction': ClosureFunction,
+        'TailCall': TailCall, 'RunTimeError': RunTimeError,
+        'ErrorSignal': ErrorSignal, 'BreakSignal': BreakSignal, 'ContinueSignal': ContinueSignal,
+        'ReturnSignal': ReturnSignal, 'load_name': load_name, 'loop_range': loop_range, 'range_loop': range_loop,
+        'call_value': call_value, 'number_of': number_of, 'placed_error': placed_error,
+    }
+    exec(code, namespace)
+    return namespace['program']
+
+
+def interpret(node, context):
+    return Interpreter().run(node, context)
+
+
+def run_bytecode(node, context, max_call_depth=None):
+    return VirtualMachine(max_call_depth).run(Compiler().compile(node), context)
+
+
+def run_slots(node, context):
+    return ProgramSlotInterpreter().run(Resolver().resolve(node), context)
+
+
+def run_closures(node, context):
+    return run_closure(ClosureCompiler().compile(node), context)
+
+
+def run_python(node, context):
+    program = code_cache.get(node)
+    if program is None:
+        program = transpile(node)
+        code_cache.put(node, program)
+    return run_closure(program, context)
+
+
+# what run() can execute a tree with
+ENGINES = {
+    'tree': interpret,
+    'slots': run_slots,
+    'vm': run_bytecode,
+    'closures': run_closures,
+    'python': run_python,
+}
+
+
+def run(fn, text, engine='tree', max_call_depth=None):
+    # max_call_depth is how deep calls can go on the vm , MAX_CALL_DEPTH by default .
+    # the other engines are bounded by the python stack
+    execute = ENGINES.get(engine)
+    if execute is None: raise Exception(f'no engine named {engine!r}')
+
+    key = ast_cache.key(fn, text)
+    node = ast_cache.get(key)
+    if node is None:
+        # <stdin> , <bench> and the like aren't files , no artifact can be next to them
+        if not fn.startswith('<'): node = load_artifact(fn, text, key[1])
+        if node is None:
+            node, error = parse(fn, text)
+            if error: return None, error
+        ast_cache.put(key, node)
 
     # interpret the ast
-    interpreter = Interpreter()
     context = Context("<program>")
     context.symbol_table = global_symbol_table
-    result = interpreter.visit(ast.node, context)
+    context.engine = engine
+    try:
+        if engine == 'vm': result = run_bytecode(node, context, max_call_depth)
+        else: result = execute(node, context)
+    except RecursionError:
+        # deeper than the python stack goes outside any call , calls report it themselves
+        result = RunTimeResult().failure(RunTimeError(
+            node.pos_start, node.pos_end, 'Maximum recursion depth exceeded', context
+        ))
 
+    if result.error: result.error.keep_source()
     return result.value, result.error
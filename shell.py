@@ -1,6 +1,15 @@
 # first line of `code` towards a goal
+import sys
+
 import jingo
 
+# python shell.py compile script.jingo ... writes script.jgc next to each script
+if len(sys.argv) > 1 and sys.argv[1] == 'compile':
+    for fn in sys.argv[2:]:
+        path, error = jingo.compile_file(fn)
+        print(error.as_string() if error else f'{fn} -> {path}')
+    sys.exit()
+
 while True:
     text = input('jingo >')
     if text.strip() == "" : continue
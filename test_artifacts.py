@@ -0,0 +1,41 @@
+import jingo
+
+
+def write_script(tmp_path, text):
+    path = tmp_path / 'script.jingo'
+    path.write_text(text)
+    return str(path)
+
+
+def test_compile_and_load(tmp_path):
+    text = 'FUNC F(X) -> X * 2\nF(21)'
+    fn = write_script(tmp_path, text)
+    path, error = jingo.compile_file(fn)
+    assert error is None
+    assert path == str(tmp_path / 'script.jgc')
+
+    node = jingo.load_artifact(fn, text)
+    assert type(node) is jingo.ListNode
+    context = jingo.Context('<program>')
+    context.symbol_table = jingo.global_symbol_table
+    assert repr(jingo.interpret(node, context).value.elements[-1]) == '42'
+
+
+def test_stale_artifact_is_not_loaded(tmp_path):
+    fn = write_script(tmp_path, '1 + 2')
+    jingo.compile_file(fn)
+    assert jingo.load_artifact(fn, '1 + 3') is None
+    assert jingo.load_artifact(fn, '1 + 2', jingo.source_hash('1 + 3')) is None
+
+
+def test_missing_artifact(tmp_path):
+    assert jingo.load_artifact(str(tmp_path / 'none.jingo'), '1') is None
+
+
+def test_run_does_not_look_for_artifacts_of_stdin(monkeypatch):
+    def load_artifact(fn, text, digest=None):
+        raise AssertionError(f'looked for an artifact of {fn}')
+    monkeypatch.setattr(jingo, 'load_artifact', load_artifact)
+    value, error = jingo.run('<stdin>', '1 + 41 # not cached yet')
+    assert error is None
+    assert repr(value) == '[42 ]'
@@ -0,0 +1,57 @@
+import pytest
+
+import jingo
+
+
+def test_hits_and_misses():
+    cache = jingo.AstCache(2)
+    key = cache.key('<test>', '1 + 2')
+    assert cache.get(key) is None
+    node, _ = jingo.parse('<test>', '1 + 2')
+    cache.put(key, node)
+    assert cache.get(key) is node
+    assert cache.get(cache.key('<test>', '1 + 3')) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_is_evicted():
+    cache = jingo.AstCache(2)
+    keys = [cache.key('<test>', str(i)) for i in range(3)]
+    cache.put(keys[0], 'zero')
+    cache.put(keys[1], 'one')
+    cache.get(keys[0])
+    cache.put(keys[2], 'two')
+    assert list(cache.trees) == [keys[0], keys[2]]
+
+
+def test_resize_to_zero_turns_the_cache_off():
+    cache = jingo.AstCache(2)
+    key = cache.key('<test>', '1')
+    cache.put(key, 'one')
+    cache.resize(0)
+    assert len(cache.trees) == 0
+    cache.put(key, 'one')
+    assert cache.get(key) is None
+
+
+def test_run_parses_a_source_once():
+    hits = jingo.ast_cache.hits
+    text = 'LET CACHED = 7 # test_run_parses_a_source_once'
+    jingo.run('<test>', text)
+    jingo.run('<test>', text)
+    assert jingo.ast_cache.hits == hits + 1
+
+
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_run_builtin_uses_the_engine_of_the_program(engine, tmp_path, monkeypatch):
+    path = tmp_path / 'inner.jingo'
+    path.write_text('LET INNER = 1')
+    run, engines = jingo.run, []
+
+    def recording_run(fn, text, engine='tree', max_call_depth=None):
+        engines.append(engine)
+        return run(fn, text, engine, max_call_depth)
+    monkeypatch.setattr(jingo, 'run', recording_run)
+    value, error = run('<test>', f'FUNC F() -> RUN("{path}")\nF()', engine)
+    assert error is None
+    assert engines == [engine]
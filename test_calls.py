@@ -0,0 +1,73 @@
+import pytest
+
+import jingo
+
+
+def run(text, engine):
+    jingo.global_symbol_table.symbols.pop('LOOP', None)
+    jingo.global_symbol_table.symbols.pop('EVEN', None)
+    jingo.global_symbol_table.symbols.pop('ODD', None)
+    jingo.global_symbol_table.symbols.pop('DEEP', None)
+    return jingo.run('<test>', text, engine)
+
+
+def context_depth(context):
+    depth = 0
+    while context:
+        depth += 1
+        context = context.parent
+    return depth
+
+
+DEEP = 'FUNC DEEP(N) -> IF N == 0 THEN 0 ELSE 1 + DEEP(N - 1)\n'
+
+MUTUAL = ('FUNC EVEN(N) -> IF N == 0 THEN 1 ELSE ODD(N - 1)\n'
+          'FUNC ODD(N) -> IF N == 0 THEN 0 / 0 ELSE EVEN(N - 1)\n')
+
+
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_tail_recursion_is_not_bounded_by_the_python_stack(engine):
+    text = 'FUNC LOOP(N, ACC) -> IF N == 0 THEN ACC ELSE LOOP(N - 1, ACC + N)\nLOOP(100000, 0)'
+    value, error = run(text, engine)
+    assert error is None
+    assert repr(value.elements[-1]) == '5000050000'
+
+
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_mutual_tail_recursion(engine):
+    value, error = run(MUTUAL + 'EVEN(20000)', engine)
+    assert error is None
+    assert repr(value.elements[-1]) == '1'
+
+
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_mutual_tail_recursion_keeps_the_context_chain_short(engine):
+    # ODD(0) fails after 1001 calls , each took over the frame of the one before
+    value, error = run(MUTUAL + 'EVEN(1001)', engine)
+    assert value is None
+    assert type(error) is jingo.RunTimeError
+    assert context_depth(error.context) == 2
+
+
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_tail_call_sees_the_variables_of_the_caller(engine):
+    # scoping is dynamic , a tail call still sees the names of the call making it
+    text = 'FUNC EVEN(N) -> ODD(N + 1)\nFUNC ODD(M) -> [N, M]\nEVEN(5)'
+    value, error = run(text, engine)
+    assert error is None
+    assert repr(value.elements[-1]) == '[5, 6 ]'
+
+
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_too_deep_recursion_is_a_runtime_error(engine):
+    value, error = run(DEEP + f'DEEP({jingo.MAX_CALL_DEPTH + 1})', engine)
+    assert value is None
+    assert type(error) is jingo.RunTimeError
+    assert 'depth' in error.details
+
+
+def test_deep_recursion_on_the_vm():
+    # each call finds DEEP through the table of the call above , not at the top
+    value, error = run(DEEP + f'DEEP({jingo.MAX_CALL_DEPTH - 1})', 'vm')
+    assert error is None
+    assert repr(value.elements[-1]) == str(jingo.MAX_CALL_DEPTH - 1)
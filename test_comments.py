@@ -0,0 +1,39 @@
+import pytest
+
+import jingo
+
+
+def token_types(text):
+    tokens, error = jingo.Lexer('<test>', text).make_tokens()
+    assert error is None
+    return [token.type for token in tokens]
+
+
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_comment_at_eof_without_newline(engine):
+    value, error = jingo.run('<test>', '1 + 2 # c', engine)
+    assert error is None
+    assert repr(value) == '[3 ]'
+
+
+@pytest.mark.parametrize('text', ['# only a comment', '# a\n# b\n', '#'])
+def test_comment_only_file(text):
+    types = token_types(text)
+    assert types[-1] == jingo.TT_EOF
+    assert set(types) <= {jingo.TT_NEWLINE, jingo.TT_EOF}
+
+
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_comment_before_eof_in_block(engine):
+    text = 'FUNC f()\n  RETURN 4\n  # done\nEND\nf()'
+    value, error = jingo.run('<test>', text, engine)
+    assert error is None
+    assert repr(value.elements[-1]) == '4'
+
+
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_unclosed_block_ending_in_comment(engine):
+    # the comment runs to EOF , the parser still gets there and reports the missing END
+    value, error = jingo.run('<test>', 'FOR i = 0 TO 3 THEN\n  i # c', engine)
+    assert value is None
+    assert type(error) is jingo.InvalidSyntaxError
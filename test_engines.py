@@ -0,0 +1,111 @@
+import pytest
+
+import jingo
+
+# every engine runs the same programs to the same values , and fails them with the
+# same errors and tracebacks as the tree walker
+
+
+PROGRAMS = {
+    'arithmetic': (
+        'LET A = 7\n'
+        '[A + 2 * 3, (A - 10) / 4, 2 ^ 10, -A, 1.5 * 4, 7 / 2, A == 7, A < 3 OR NOT A > 8]',
+        '[13, -0.75, 1024, -7, 6.0, 3.5, 1, 1 ]'
+    ),
+    'strings': (
+        'LET S = "ab"\n'
+        'LET T = S + "cd"\n'
+        '[T, S * 3, T + S + T, IS_STRING(T), IS_STRING(3)]',
+        '[abcd, ababab, abcdababcd, 1, 0 ]'
+    ),
+    'lists': (
+        'LET L = [1, 2, 3]\n'
+        '[L / 2, [1, 2] + 3, [1, 2, 3] - 0, [1] * [2, 3], LEN([4, 5]), RANGE(1, 4), POP([7, 8], 0), L]',
+        '[3, [1, 2, 3 ], [2, 3 ], [1, 2, 3 ], 2, [1, 2, 3 ], 8, [1, 2, 3 ] ]'
+    ),
+    'functions': (
+        'FUNC ADD(A, B) -> A + B\n'
+        'FUNC TWICE(F, X) -> F(F(X, 1), 1)\n'
+        'FUNC FIB(N)\n'
+        '  IF N < 2 THEN RETURN N\n'
+        '  RETURN FIB(N - 1) + FIB(N - 2)\n'
+        'END\n'
+        '[ADD(2, 3), TWICE(ADD, 5), FIB(12), (FUNC (X) -> X * X)(9)]',
+        '[5, 7, 144, 81 ]'
+    ),
+    'dynamic scope': (
+        'LET X = 1\n'
+        'FUNC SHOW() -> X\n'
+        'FUNC INNER(X) -> SHOW()\n'
+        'FUNC SETS()\n'
+        '  LET X = 5\n'
+        '  RETURN SHOW()\n'
+        'END\n'
+        '[SHOW(), INNER(3), SETS(), X]',
+        '[1, 3, 5, 1 ]'
+    ),
+    'break continue return': (
+        'LET OUT = []\n'
+        'FOR I = 0 TO 10 THEN\n'
+        '  IF I == 2 THEN CONTINUE\n'
+        '  IF I == 6 THEN BREAK\n'
+        '  APPEND(OUT, I)\n'
+        'END\n'
+        'LET J = 0\n'
+        'WHILE TRUE THEN\n'
+        '  LET J = J + 1\n'
+        '  IF J > 3 THEN BREAK\n'
+        'END\n'
+        'FUNC FIRST(L)\n'
+        '  FOR I = 0 TO LEN(L) THEN\n'
+        '    IF L / I > 2 THEN RETURN L / I\n'
+        '  END\n'
+        '  RETURN -1\n'
+        'END\n'
+        '[OUT, J, FIRST([1, 5, 7]), FIRST([]), FOR K = 0 TO 3 THEN K * 2]',
+        '[[0, 1, 3, 4, 5 ], 4, 5, -1, [0, 2, 4 ] ]'
+    ),
+}
+
+ERRORS = {
+    'division by zero': 'FUNC F(X) -> X / 0\nF(1)',
+    'undefined name': 'FUNC F() -> NOPE\nFUNC G() -> F() + 1\nG()',
+    'illegal operation': 'LET S = "a"\nS - 1',
+    'illegal operation on a number': 'FUNC F() -> 1\n[2 - F, 3]',
+    'illegal operation on a string': '"a" + 1',
+    'bad index': '[1, 2] / 5',
+    'arg count': 'FUNC F(A) -> A\nF(1, 2)',
+    'error in a builtin': 'FUNC F(L) -> EXTEND(L, 3)\nF([1])',
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_globals():
+    # the programs define functions and variables at the top level
+    symbols = dict(jingo.global_symbol_table.symbols)
+    yield
+    jingo.global_symbol_table.symbols = symbols
+
+
+def run(text, engine):
+    return jingo.run('<test>', text, engine)
+
+
+@pytest.mark.parametrize('name', PROGRAMS)
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_program(engine, name):
+    text, expected = PROGRAMS[name]
+    value, error = run(text, engine)
+    assert error is None
+    assert repr(value.elements[-1]) == expected
+
+
+@pytest.mark.parametrize('name', ERRORS)
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_error_and_traceback(engine, name):
+    _, expected = run(ERRORS[name], 'tree')
+    value, error = run(ERRORS[name], engine)
+    assert value is None
+    assert type(error) is jingo.RunTimeError
+    assert error.as_string() == expected.as_string()
+
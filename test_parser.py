@@ -0,0 +1,33 @@
+import jingo
+
+
+def test_long_operator_chain():
+    node, error = jingo.parse('<test>', ' + '.join(['1'] * 100000))
+    assert error is None
+    value, error = jingo.run('<test>', ' + '.join(['1'] * 100000))
+    assert error is None
+    assert repr(value) == '[100000 ]'
+
+
+def test_deeply_nested_brackets():
+    text = '(' * 100000 + '1' + ')' * 100000
+    node, error = jingo.parse('<test>', text)
+    assert error is None
+    value, error = jingo.run('<test>', text)
+    assert error is None
+    assert repr(value) == '[1 ]'
+
+
+def test_nested_if():
+    value, error = jingo.run('<test>', 'IF 1 THEN ' * 20 + '7')
+    assert error is None
+    assert repr(value) == '[7 ]'
+
+
+def test_too_deeply_nested_if_is_a_syntax_error():
+    # not a RecursionError out of the parser
+    for text in ('IF 1 THEN ' * 5000 + '1', 'IF 1 THEN\n' * 3000 + '1\n' + 'END\n' * 3000):
+        node, error = jingo.parse('<test>', text)
+        assert node is None
+        assert type(error) is jingo.InvalidSyntaxError
+        assert error.details == 'Nested too deeply'
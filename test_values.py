@@ -0,0 +1,104 @@
+import pytest
+
+import jingo
+
+
+def run(text, engine='tree'):
+    value, error = jingo.run('<test>', text, engine)
+    assert error is None
+    return value.elements[-1]
+
+
+def run_error(text, engine='tree'):
+    value, error = jingo.run('<test>', text, engine)
+    assert value is None
+    assert type(error) is jingo.RunTimeError
+    return error.details
+
+
+# Range
+
+def test_range_index_makes_no_list():
+    numbers = jingo.Range(range(0, 1000000))
+    value, error = numbers.dived_by(jingo.number_of(999999))
+    assert error is None
+    assert value.value == 999999
+    assert numbers.made is None
+    assert numbers.length() == 1000000
+
+
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+@pytest.mark.parametrize('make', ['RANGE(0, 3)', '[0, 1, 2]', 'FOR I = 0 TO 3 THEN I'])
+def test_range_aliases_like_a_list(engine, make):
+    # + and * change the list they are on , a Range is no different
+    assert repr(run(f'LET R = {make}\nLET S = R + 9\n[R, S, R / 3, LEN(R)]', engine)) == \
+        '[[0, 1, 2, 9 ], [0, 1, 2, 9 ], 9, 4 ]'
+    assert repr(run(f'LET R = {make}\nLET S = R * [7, 8]\n[R, S, LEN(S)]', engine)) == \
+        '[[0, 1, 2, 7, 8 ], [0, 1, 2, 7, 8 ], 5 ]'
+    assert repr(run(f'LET R = {make}\nAPPEND(R, 5)\n[R / 1, R / 3, LEN(R)]', engine)) == '[1, 5, 4 ]'
+
+
+def test_range_out_of_bounds():
+    assert 'Could not be retrieved' in run_error('RANGE(0, 3) / 3')
+
+
+# String
+
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_strings_made_from_the_same_string(engine):
+    # B and C share the parts of A , neither sees the other
+    text = 'LET A = "ab"\nLET B = A + "c"\nLET C = A + "d"\n[A, B, C, B + C, C * 2, A + ""]'
+    assert repr(run(text, engine)) == '[ab, abc, abd, abcabd, abdabd, ab ]'
+
+
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_string_built_in_a_loop(engine):
+    text = 'LET S = ""\nFOR I = 0 TO 1000 THEN LET S = S + "x"\nLET T = S + "y"\n[S * 2, T]'
+    strings = run(text, engine).elements
+    assert strings[0].value == 'x' * 2000
+    assert strings[1].value == 'x' * 1000 + 'y'
+
+
+def test_string_parts():
+    a = jingo.String('ab')
+    b, _ = a.added_to(jingo.String('c'))
+    c, _ = a.added_to(jingo.String('d'))
+    d, _ = b.added_to(jingo.String('e'))
+    assert [a.value, b.value, c.value, d.value] == ['ab', 'abc', 'abd', 'abce']
+    assert b.length == 3 and d.length == 4
+    times, _ = d.multed_by(jingo.number_of(3))
+    assert times.value == 'abce' * 3
+
+
+def test_string_illegal_operations():
+    assert run_error('"a" + 1') == 'Illegal Operation'
+    assert run_error('"a" * "b"') == 'Illegal Operation'
+
+
+# Vector
+
+@pytest.mark.parametrize('engine', jingo.ENGINES)
+def test_vector_operations(engine):
+    text = 'LET V = VECTOR([1, 2, 3])\n[V + 1, V * V, V == 2, 1 - V, LIST(V / 2)]'
+    assert repr(run(text, engine)) == \
+        '[<vector [2, 3, 4]>, <vector [1, 4, 9]>, <vector [0, 1, 0]>, <vector [ 0, -1, -2]>, [0.5, 1.0, 1.5 ] ]'
+
+
+@pytest.mark.parametrize('text, details', [
+    ('VECTOR([1, 2]) + "a"', 'Illegal Operation'),
+    ('"a" + VECTOR([1, 2])', 'Illegal Operation'),
+    ('VECTOR([1, 2]) + VECTOR([1, 2, 3])', 'Vectors of sizes 2 and 3 do not match'),
+    ('VECTOR([1, 2]) / 0', 'Division By Zero'),
+    ('VECTOR([1, 2]) / VECTOR([1, 0])', 'Division By Zero'),
+    ('VECTOR([4611686018427387904]) * 4', 'Vector elements out of the int64 range'),
+    ('VECTOR(1)', 'Argument must be a list'),
+])
+def test_vector_errors(text, details):
+    assert details in run_error(text)
+
+
+def test_vector_without_numpy(monkeypatch):
+    monkeypatch.setattr(jingo, 'numpy', None)
+    assert run_error('VECTOR([1, 2])') == 'VECTOR needs numpy , which is not installed'
+    # what doesn't use VECTOR runs as before
+    assert repr(run('LEN([1, 2])')) == '2'